@@ -1,15 +1,169 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.lru import LRUCache
+
+
+USER_CACHE_PREFIX = "accounts:auth-user:v3"
+# What requests read off `request.user` (views, permissions, MeSerializer);
+# a cached user has these loaded and any other field loads on access
+CACHED_USER_FIELDS = ("id", "username", "email", "first_name", "last_name", "is_active", "is_staff", "is_superuser")
+VALIDATED_TOKEN_CACHE_SIZE = 4096
+
+# raw token -> (validated token, exp). Tokens are immutable and signed, so a
+# token that validated once stays valid until `exp`; only that is rechecked.
+_validated_tokens = LRUCache(VALIDATED_TOKEN_CACHE_SIZE)
+# Plain SimpleJWT validation, used to fill the memo
+_authenticator = JWTAuthentication()
+
+
+def user_cache_key(user_id) -> str:
+    return f"{USER_CACHE_PREFIX}:{user_id}"
+
+
+def invalidate_cached_user(user_id) -> None:
+    cache.delete(user_cache_key(user_id))
+
+
+def _cache_enabled() -> bool:
+    return getattr(settings, "AUTH_USER_CACHE_ENABLED", False)
+
+
+def _snapshot(user) -> dict:
+    # Plain values, never the User itself (or its password hash)
+    twofactor = getattr(user, "twofactor", None)
+    return {
+        "fields": {f: getattr(user, f) for f in CACHED_USER_FIELDS},
+        "is_2fa_enabled": bool(twofactor and twofactor.is_enabled),
+        "password_fingerprint": get_md5_hash_password(user.password),
+    }
+
+
+def validate_access_token(raw_token):
+    """
+    Signature + claims validation for an access token, memoized per raw
+    token until its `exp`. Raises `InvalidToken` like SimpleJWT does.
+    """
+    key = raw_token.decode() if isinstance(raw_token, bytes) else raw_token
+    hit = _validated_tokens.get(key)
+    if hit is not None:
+        token, exp = hit
+        if time.time() < exp:
+            return token
+
+    token = _authenticator.get_validated_token(raw_token)
+    exp = token.get("exp")
+    if exp is not None:
+        _validated_tokens.set(key, (token, exp))
+    return token
 
 
 class CookieJWTAuthentication(JWTAuthentication):
-    def authenticate(self, request):
+    def get_raw_token_from_request(self, request):
+        """The `Authorization` header token, else the `access_token` cookie."""
         header = self.get_header(request)
         if header is None:
-            raw_token = request.COOKIES.get("access_token")
-            if raw_token is None:
-                return None
-        else:
-            raw_token = self.get_raw_token(header)
-
-        validated_token = self.get_validated_token(raw_token)
-        return self.get_user(validated_token), validated_token
\ No newline at end of file
+            return request.COOKIES.get("access_token")
+        return self.get_raw_token(header)
+
+    def authenticate(self, request):
+        raw_token = self.get_raw_token_from_request(request)
+        if raw_token is None:
+            return None
+
+        validated_token = validate_access_token(raw_token)
+        return self.get_user(validated_token), validated_token
+
+    async def aauthenticate(self, request):
+        """`authenticate` with the user read through the async ORM/cache."""
+        raw_token = self.get_raw_token_from_request(request)
+        if raw_token is None:
+            return None
+
+        validated_token = validate_access_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        """
+        Same checks as SimpleJWT's `get_user`. With `AUTH_USER_CACHE_ENABLED`
+        (a shared cache, see settings) the checked fields are cached for
+        `AUTH_USER_CACHE_TIMEOUT` seconds and a hit returns a user built from
+        `CACHED_USER_FIELDS` plus its 2FA flag, without a query.
+        Entries are dropped on User / TwoFactorConfig save and delete
+        (accounts.signals) and on logout.
+        """
+        user_id = self._user_id(validated_token)
+        if not _cache_enabled():
+            return self._check_user(self._load_user(user_id), validated_token)
+
+        key = user_cache_key(user_id)
+        cached = cache.get(key)
+        if cached is not None:
+            return self._check_user(self._cached_user(cached), validated_token, cached["password_fingerprint"])
+        user = self._load_user(user_id)
+        cache.set(key, _snapshot(user), settings.AUTH_USER_CACHE_TIMEOUT)
+        return self._check_user(user, validated_token)
+
+    async def aget_user(self, validated_token):
+        user_id = self._user_id(validated_token)
+        if not _cache_enabled():
+            return self._check_user(await self._aload_user(user_id), validated_token)
+
+        key = user_cache_key(user_id)
+        cached = await cache.aget(key)
+        if cached is not None:
+            return self._check_user(self._cached_user(cached), validated_token, cached["password_fingerprint"])
+        user = await self._aload_user(user_id)
+        await cache.aset(key, _snapshot(user), settings.AUTH_USER_CACHE_TIMEOUT)
+        return self._check_user(user, validated_token)
+
+    def _load_user(self, user_id):
+        try:
+            return self._user_queryset().get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    async def _aload_user(self, user_id):
+        try:
+            return await self._user_queryset().aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    def _cached_user(self, cached):
+        # A model instance as `.only(*CACHED_USER_FIELDS)` would return it
+        # (from_db wants the values in the model's field order)
+        names = [f.attname for f in self.user_model._meta.concrete_fields if f.attname in cached["fields"]]
+        values = [cached["fields"][name] for name in names]
+        user = self.user_model.from_db(router.db_for_read(self.user_model), names, values)
+        # Read by MeSerializer instead of the `twofactor` relation
+        user.is_2fa_enabled = cached["is_2fa_enabled"]
+        return user
+
+    def _user_queryset(self):
+        return self.user_model.objects.select_related("twofactor")
+
+    def _user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def _check_user(self, user, validated_token, password_fingerprint=None):
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if password_fingerprint is None:
+                password_fingerprint = get_md5_hash_password(user.password)
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_fingerprint:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
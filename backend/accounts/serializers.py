@@ -55,6 +55,9 @@ class MeSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "username", "email", "first_name", "last_name", "is_2fa_enabled"]
 
     def get_is_2fa_enabled(self, obj):
+        # Set on users served from CookieJWTAuthentication's cache
+        if hasattr(obj, "is_2fa_enabled"):
+            return obj.is_2fa_enabled
         cfg = getattr(obj, "twofactor", None)
         return bool(cfg and cfg.is_enabled)
 
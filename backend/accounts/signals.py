@@ -0,0 +1,18 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .auth import invalidate_cached_user
+from .models import TwoFactorConfig
+
+
+@receiver(post_save, sender=User, dispatch_uid="accounts_user_saved")
+@receiver(post_delete, sender=User, dispatch_uid="accounts_user_deleted")
+def drop_cached_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_save, sender=TwoFactorConfig, dispatch_uid="accounts_twofactor_saved")
+@receiver(post_delete, sender=TwoFactorConfig, dispatch_uid="accounts_twofactor_deleted")
+def drop_cached_user_on_twofactor(sender, instance, **kwargs):
+    invalidate_cached_user(instance.user_id)
@@ -1 +1,147 @@
-from django.test import TestCase
\ No newline at end of file
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.testing import QueryBudgetMixin
+from . import auth as auth_module
+from .auth import CookieJWTAuthentication, invalidate_cached_user, user_cache_key
+from .models import TwoFactorConfig
+
+
+@override_settings(AUTH_USER_CACHE_ENABLED=True)
+class CookieJWTUserCacheTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.token = AccessToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.cookies["access_token"] = str(self.token)
+        self.url = reverse("me")
+
+    def test_steady_state_costs_no_queries(self):
+        auth = CookieJWTAuthentication()
+        auth.get_user(self.token)
+
+        with self.assertQueryBudget(0):
+            user = auth.get_user(self.token)
+
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertTrue(user.is_active)
+
+    def test_cache_holds_no_user_object(self):
+        self.client.get(self.url)
+
+        cached = cache.get(user_cache_key(self.user.pk))
+
+        self.assertEqual(cached["password_fingerprint"], get_md5_hash_password(self.user.password))
+        self.assertNotIn(self.user.password, repr(cached))
+        self.assertFalse(cached["is_2fa_enabled"])
+
+    def test_me_from_cache_costs_no_queries(self):
+        TwoFactorConfig.objects.create(user=self.user, is_enabled=True, secret="X" * 32)
+        self.client.get(self.url)
+
+        with self.assertQueryBudget(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.json()["username"], "owner")
+        self.assertTrue(response.json()["is_2fa_enabled"])
+
+    def test_admin_permission_check_from_cache_costs_no_queries(self):
+        staff = User.objects.create_user("staff", password="pass12345", is_staff=True)
+        self.client.cookies["access_token"] = str(AccessToken.for_user(staff))
+        url = reverse("profiling-report")
+        self.client.get(url)
+
+        with self.assertQueryBudget(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.client.cookies["access_token"] = str(self.token)
+        self.client.get(url)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_twofactor_change_invalidates_cache(self):
+        self.client.get(self.url)
+
+        TwoFactorConfig.objects.create(user=self.user, is_enabled=True, secret="X" * 32)
+
+        self.assertTrue(self.client.get(self.url).json()["is_2fa_enabled"])
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(self.url)
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    @mock.patch.object(auth_module.api_settings, "CHECK_REVOKE_TOKEN", True)
+    def test_password_change_revokes_token_from_cache(self):
+        self.token[auth_module.api_settings.REVOKE_TOKEN_CLAIM] = get_md5_hash_password(self.user.password)
+        auth = CookieJWTAuthentication()
+        auth.get_user(self.token)
+
+        # A change the signals didn't see, e.g. a raw update()
+        User.objects.filter(pk=self.user.pk).update(password="changed")
+        self.assertEqual(auth.get_user(self.token).pk, self.user.pk)
+        invalidate_cached_user(self.user.pk)
+
+        with self.assertRaises(AuthenticationFailed):
+            auth.get_user(self.token)
+
+    @override_settings(AUTH_USER_CACHE_ENABLED=False)
+    def test_disabled_cache_reads_the_user_every_time(self):
+        auth = CookieJWTAuthentication()
+        auth.get_user(self.token)
+
+        with self.assertQueryBudget(1):
+            auth.get_user(self.token)
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+
+class TokenFastPathTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.client = APIClient()
+
+    def test_verify_accepts_valid_and_rejects_tampered_tokens(self):
+        token = str(AccessToken.for_user(self.user))
+
+        self.client.cookies["access_token"] = token
+        self.assertEqual(self.client.post(reverse("token_verify")).status_code, 200)
+        # second call is served from the memo
+        self.assertEqual(self.client.post(reverse("token_verify")).status_code, 200)
+
+        self.client.cookies["access_token"] = token[:-2] + ("aa" if not token.endswith("aa") else "bb")
+        self.assertEqual(self.client.post(reverse("token_verify")).status_code, 401)
+
+    def test_expired_token_is_not_served_from_memo(self):
+        from datetime import timedelta
+        from accounts.auth import validate_access_token
+        from rest_framework_simplejwt.exceptions import InvalidToken
+
+        token = AccessToken.for_user(self.user)
+        token.set_exp(lifetime=timedelta(seconds=-1))
+        with self.assertRaises(InvalidToken):
+            validate_access_token(str(token))
+
+    def test_refresh_sets_new_access_cookie(self):
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        self.client.cookies["refresh_token"] = str(RefreshToken.for_user(self.user))
+        response = self.client.post(reverse("token_refresh"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {})
+        self.assertEqual(AccessToken(response.cookies["access_token"].value)["user_id"], self.user.id)
+
+        self.client.cookies["refresh_token"] = "garbage"
+        self.assertEqual(self.client.post(reverse("token_refresh")).status_code, 401)
@@ -0,0 +1,91 @@
+"""
+In-process API benchmark: every case goes through the real URLconf,
+middleware and cookie JWT auth via Django's test client, against a
+freshly seeded world in a throwaway database.
+
+    python -m benchmarks.api [--preset small] [--iterations 200]
+"""
+import argparse
+import statistics
+import time
+
+from .common import percentiles, report, test_database
+from .seed import PRESETS, seed_world
+
+
+def api_cases(world) -> list[tuple[str, str, str, dict | None]]:
+    """`(name, method, path, body)` for every benchmarked endpoint."""
+    from django.urls import reverse
+    from events.models import Event
+
+    character = world.character_ids[0]
+    deep = world.deep_event_ids[0] if world.deep_event_ids else world.event_ids[0]
+    deep_character = Event.objects.values_list("character_id", flat=True).get(pk=deep)
+    story = world.story_ids[0]
+    word = Event.objects.values_list("title", flat=True).get(pk=deep).split()[0]
+
+    return [
+        ("accounts/me", "GET", reverse("me"), None),
+        ("accounts/verify", "POST", reverse("token_verify"), {}),
+        ("characters/list", "GET", reverse("character-list-create"), None),
+        ("characters/list_page", "GET", reverse("character-list-create") + "?page_size=50", None),
+        ("characters/detail", "GET", reverse("character-detail", kwargs={"pk": character}), None),
+        ("events/list", "GET", reverse("event-list", kwargs={"character_id": character}), None),
+        ("events/detail_deep", "GET", reverse("event-detail", kwargs={"character_id": deep_character, "pk": deep}), None),
+        ("events/scenarios_deep", "GET",
+         reverse("event-scenario-list", kwargs={"character_id": deep_character, "event_id": deep}), None),
+        ("events/play_deep", "POST", reverse("event-play", kwargs={"character_id": deep_character, "pk": deep}), {}),
+        ("events/simulate_deep", "GET",
+         reverse("event-simulate", kwargs={"character_id": deep_character, "pk": deep}) + "?runs=10000&seed=1", None),
+        ("stories/list", "GET", reverse("character-story-list-create", kwargs={"character_id": character}), None),
+        ("stories/detail", "GET", reverse("story-detail", kwargs={"pk": story}), None),
+        ("stories/detail_html", "GET", reverse("story-detail", kwargs={"pk": story}) + "?render=html", None),
+        ("search", "GET", reverse("search") + f"?q={word}", None),
+    ]
+
+
+def access_token(world) -> str:
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    return str(RefreshToken.for_user(User.objects.get(pk=world.user_id)).access_token)
+
+
+def run(preset="small", iterations=200):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    world = seed_world(**PRESETS[preset])
+    client = APIClient()
+    client.cookies["access_token"] = access_token(world)
+
+    results = {"world": world.summary()}
+    for name, method, path, body in api_cases(world):
+        call = (lambda: client.get(path)) if method == "GET" else (lambda: client.post(path, body, format="json"))
+        status = call().status_code  # warm caches, check the case works
+
+        samples, queries = [], []
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as ctx:
+                start = time.perf_counter()
+                call()
+                samples.append(time.perf_counter() - start)
+            queries.append(len(ctx.captured_queries))
+
+        results[name] = {
+            "status": status,
+            "requests_per_second": round(iterations / sum(samples), 1),
+            "latency_ms": percentiles(samples),
+            "queries": {"median": statistics.median(queries), "max": max(queries)},
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    with test_database():
+        report("api", run(args.preset, args.iterations))
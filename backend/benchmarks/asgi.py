@@ -0,0 +1,40 @@
+"""
+Sync WSGI workers vs. uvicorn workers with the async read views, on the
+read endpoints, at a concurrency well above the worker count.
+
+    python -m benchmarks.asgi [--workers 2] [--concurrency 64] [--duration 10]
+"""
+import argparse
+
+from .common import report
+from .load import run
+from .seed import PRESETS
+
+READ_CASES = (
+    "characters/list", "characters/detail",
+    "events/list", "events/detail_deep",
+    "stories/list", "stories/detail",
+)
+
+
+def compare(preset="small", workers=2, concurrency=64, duration=10.0):
+    results = run(
+        preset, workers=workers, concurrency=concurrency, duration=duration,
+        modes=("wsgi", "asgi"), profile=False, only=READ_CASES,
+    )
+    results["asgi_speedup"] = {
+        name: round(results["asgi"][name]["requests_per_second"] / results["wsgi"][name]["requests_per_second"], 2)
+        for name in READ_CASES
+        if results["wsgi"][name]["requests_per_second"]
+    }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    report("asgi", compare(args.preset, args.workers, args.concurrency, args.duration))
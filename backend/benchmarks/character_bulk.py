@@ -0,0 +1,55 @@
+"""
+Bulk character import vs. the single-item create path.
+
+    python -m benchmarks.character_bulk [items]
+"""
+import sys
+
+from .common import report, test_database, timed
+
+
+def _payload(i):
+    return {
+        "basic_identity": {"name_given": f"NPC {i}", "name_family": "Bench", "date_of_birth": "2000-01-01"},
+        "location": {"country": "Benchland", "settlement": f"Town {i % 17}"},
+    }
+
+
+def run(items=500):
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    user = User.objects.create_user("bench", password="bench-pass-123")
+    client = APIClient()
+    client.force_authenticate(user)
+    payloads = [_payload(i) for i in range(items)]
+
+    def single():
+        url = reverse("character-list-create")
+        for payload in payloads:
+            client.post(url, payload, format="json")
+
+    def bulk():
+        response = client.post(reverse("character-bulk"), payloads, format="json")
+        assert response.status_code == 201, response.content
+
+    results = {}
+    for name, func in (("single", single), ("bulk", bulk)):
+        with CaptureQueriesContext(connection) as ctx:
+            seconds, _ = timed(func)
+        results[name] = {
+            "items": items,
+            "seconds": round(seconds, 4),
+            "items_per_second": round(items / seconds, 1),
+            "queries": len(ctx.captured_queries),
+        }
+    results["speedup"] = round(results["bulk"]["items_per_second"] / results["single"]["items_per_second"], 2)
+    return results
+
+
+if __name__ == "__main__":
+    with test_database():
+        report("character_bulk", run(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
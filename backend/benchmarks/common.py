@@ -0,0 +1,70 @@
+"""
+Shared plumbing for the benchmark scripts.
+
+Run from `backend/` as modules, e.g. `python -m benchmarks.character_bulk`.
+Every script works against a throwaway database (the test database, or a
+scratch SQLite file for `load`), never db.sqlite3; only `seed` run as a
+script writes to the configured database.
+
+- `seed`: deterministic Faker worlds (`--preset small|medium|large`)
+- `api`: every endpoint through the test client, with query counts
+- `load`: the same endpoints over HTTP against a local gunicorn
+- `startup`: cold-start cost of each startup banner mode
+- `warmup`: first-request latency of a fresh worker, with and without warm-up
+- `db_pool`: connection acquisition per connection strategy (PostgreSQL for the pool)
+"""
+from contextlib import contextmanager
+import json
+import os
+import statistics
+import sys
+import time
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+    django.setup()
+
+
+@contextmanager
+def test_database():
+    """Create the test database(s), yield, then destroy them."""
+    setup_django()
+    from django.test.runner import DiscoverRunner
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    old_config = runner.setup_databases()
+    try:
+        yield
+    finally:
+        runner.teardown_databases(old_config)
+        teardown_test_environment()
+
+
+def timed(func, *args, **kwargs):
+    """Run `func` once, return `(seconds, result)`."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    """Nearest-rank percentiles of `samples` (seconds) in milliseconds."""
+    if not samples:
+        return {f"p{p}": None for p in points}
+    ordered = sorted(samples)
+    out = {}
+    for p in points:
+        rank = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+        out[f"p{p}"] = round(ordered[rank] * 1000, 3)
+    out["mean"] = round(statistics.fmean(ordered) * 1000, 3)
+    return out
+
+
+def report(name, results, stream=sys.stdout):
+    """Emit one JSON document per benchmark run."""
+    json.dump({"benchmark": name, "results": results}, stream, indent=2, default=str)
+    stream.write("\n")
@@ -0,0 +1,122 @@
+"""
+Connection acquisition under concurrent load, per connection strategy.
+
+Each of `--concurrency` threads plays `--requests` requests the way
+Django's request signals do. It runs `close_if_unusable_or_obsolete()`,
+opens a cursor (the timed acquisition: connect, pool checkout or health
+check), runs `SELECT 1`, then runs `close_if_unusable_or_obsolete()`
+again. Strategies:
+
+- per_request: CONN_MAX_AGE=0, a new connection every request
+- persistent:  CONN_MAX_AGE=600 with health checks (one connection per thread)
+- pool:        psycopg 3 pool (PostgreSQL only), `--pool-max` connections
+
+    python -m benchmarks.db_pool --db-url postgres://user@127.0.0.1:5432/db [--concurrency 32]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+
+from .common import percentiles, report, setup_django
+
+
+def _strategies(url, pool_min, pool_max, pool_timeout):
+    from core.databases import database_config, pool_options
+
+    out = {
+        "per_request": database_config(url, conn_max_age=0, health_checks=False),
+        "persistent": database_config(url, conn_max_age=600, health_checks=True),
+    }
+    pooled = database_config(url, health_checks=True, pool=pool_options(pool_min, pool_max, pool_timeout))
+    if "pool" in pooled.get("OPTIONS", {}):
+        out["pool"] = pooled
+    return out
+
+
+def _client(handler, alias, requests):
+    conn = handler[alias]
+    samples, errors = [], 0
+    for _ in range(requests):
+        conn.close_if_unusable_or_obsolete()
+        start = time.perf_counter()
+        try:
+            cursor = conn.cursor()
+        except Exception:
+            errors += 1
+            continue
+        samples.append(time.perf_counter() - start)
+        with cursor:
+            cursor.execute("SELECT 1")
+        conn.close_if_unusable_or_obsolete()
+    conn.close()
+    return samples, errors
+
+
+def _watch_connections(handler, stop, every=0.05):
+    """Peak number of other backends connected to the database until `stop`."""
+    conn = handler["default"]
+    if conn.vendor != "postgresql":
+        return None
+    peak = 0
+    with conn.cursor() as cursor:
+        while not stop.is_set():
+            cursor.execute(
+                "SELECT count(*) FROM pg_stat_activity WHERE datname = current_database() AND pid <> pg_backend_pid()"
+            )
+            peak = max(peak, cursor.fetchone()[0])
+            stop.wait(every)
+    conn.close()
+    return peak
+
+
+def run(db_url, concurrency=32, requests=200, pool_min=4, pool_max=16, pool_timeout=30.0):
+    setup_django()
+    from django.db.utils import ConnectionHandler
+
+    from core.databases import database_config
+
+    watcher_config = database_config(db_url, conn_max_age=0, health_checks=False)
+    results = {}
+    for name, config in _strategies(db_url, pool_min, pool_max, pool_timeout).items():
+        # Own alias per strategy: Django keeps pools per alias, per process
+        alias = f"bench_{name}"
+        # "default" is the watcher's plain connection
+        handler = ConnectionHandler({"default": watcher_config, alias: config})
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=concurrency + 1) as executor:
+            watcher = executor.submit(_watch_connections, handler, stop)
+            started = time.perf_counter()
+            futures = [executor.submit(_client, handler, alias, requests) for _ in range(concurrency)]
+            samples, errors = [], 0
+            for future in futures:
+                s, e = future.result()
+                samples.extend(s)
+                errors += e
+            elapsed = time.perf_counter() - started
+            stop.set()
+        results[name] = {
+            "requests": len(samples),
+            "errors": errors,
+            "requests_per_second": round(len(samples) / elapsed, 1),
+            "acquire_ms": percentiles(samples),
+            "server_connections_peak": watcher.result(),
+        }
+        if name == "pool":
+            handler[alias].close_pool()
+        # Let the closed backends exit before the next strategy is counted
+        time.sleep(1)
+    return {"concurrency": concurrency, "requests_per_thread": requests, "pool_max": pool_max, **results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db-url", default=os.getenv("DJANGO_DB_URL"), required=not os.getenv("DJANGO_DB_URL"))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--pool-min", type=int, default=4)
+    parser.add_argument("--pool-max", type=int, default=16)
+    parser.add_argument("--pool-timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    report("db_pool", run(args.db_url, args.concurrency, args.requests, args.pool_min, args.pool_max, args.pool_timeout))
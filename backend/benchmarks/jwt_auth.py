@@ -0,0 +1,61 @@
+"""
+JWT cookie verification / refresh latency: SimpleJWT's stock views and
+validation vs. the memoized fast path in accounts.auth.
+
+    python -m benchmarks.jwt_auth [iterations]
+"""
+import sys
+import time
+
+from .common import percentiles, report, test_database
+
+
+def _measure(func, iterations):
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def run(iterations=2000):
+    from django.contrib.auth.models import User
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from rest_framework_simplejwt.views import TokenRefreshView, TokenVerifyView
+
+    from accounts.auth import validate_access_token
+    from accounts.views import CookieTokenRefreshView, CookieTokenVerifyView
+
+    user = User.objects.create_user("bench", password="bench-pass-123")
+    refresh = RefreshToken.for_user(user)
+    access = str(refresh.access_token)
+    factory = APIRequestFactory()
+
+    stock_verify = TokenVerifyView.as_view()
+    stock_refresh = TokenRefreshView.as_view()
+    fast_verify = CookieTokenVerifyView.as_view()
+    fast_refresh = CookieTokenRefreshView.as_view()
+    stock_auth = JWTAuthentication()
+
+    def cookie_request(name, value):
+        request = factory.post("/", {}, format="json")
+        request.COOKIES[name] = value
+        return request
+
+    cases = {
+        "validate/stock": lambda: stock_auth.get_validated_token(access),
+        "validate/memoized": lambda: validate_access_token(access),
+        "verify_view/stock": lambda: stock_verify(factory.post("/", {"token": access}, format="json")),
+        "verify_view/fast": lambda: fast_verify(cookie_request("access_token", access)),
+        "refresh_view/stock": lambda: stock_refresh(factory.post("/", {"refresh": str(refresh)}, format="json")),
+        "refresh_view/fast": lambda: fast_refresh(cookie_request("refresh_token", str(refresh))),
+    }
+    return {name: _measure(func, iterations) for name, func in cases.items()}
+
+
+if __name__ == "__main__":
+    with test_database():
+        report("jwt_auth", run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,187 @@
+"""
+HTTP load test against a local gunicorn.
+
+Seeds a world into a scratch SQLite file (or the database in
+`--db-url`), boots gunicorn (gunicorn.conf.py, once per `--modes` entry)
+on a free port and hammers each endpoint from `--concurrency` keep-alive
+client threads for `--duration` seconds. Query counts come from the profiling middleware, which the
+workers run with a dump directory the report is merged from.
+
+    python -m benchmarks.load [--preset small] [--workers 4] [--concurrency 16] [--duration 10] [--modes wsgi asgi]
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import json
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from .common import percentiles, report, setup_django
+from .seed import PRESETS, seed_world
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BENCH_SECRET = "benchmark-secret-key"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port, process, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("gunicorn did not start in time")
+
+
+def _client_loop(port, method, path, body, cookie, deadline):
+    """One client: sequential requests on a reused connection until `deadline`."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    headers = {"Cookie": cookie, "Content-Type": "application/json"}
+    payload = json.dumps(body) if body is not None else None
+    samples, errors = [], 0
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            continue
+        samples.append(time.perf_counter() - start)
+    conn.close()
+    return samples, errors
+
+
+def drive(port, cases, cookie, concurrency, duration):
+    results = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for name, method, path, body in cases:
+            started = time.perf_counter()
+            deadline = time.monotonic() + duration
+            futures = [
+                pool.submit(_client_loop, port, method, path, body, cookie, deadline)
+                for _ in range(concurrency)
+            ]
+            samples, errors = [], 0
+            for future in futures:
+                s, e = future.result()
+                samples.extend(s)
+                errors += e
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                "url_path": path,
+                "requests": len(samples),
+                "errors": errors,
+                "requests_per_second": round(len(samples) / elapsed, 1),
+                "latency_ms": percentiles(samples),
+            }
+    return results
+
+
+def _serve(port, mode, workers, threads, env):
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn",
+         "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--threads", str(threads),
+         "--log-level", "warning"],
+        # gunicorn.conf.py picks the app and worker class from the mode
+        cwd=BACKEND_DIR, env={**env, "DJANGO_SERVER_MODE": mode}, stdout=subprocess.DEVNULL,
+    )
+
+
+def run(preset="small", workers=4, threads=1, concurrency=16, duration=10.0, db_url=None,
+        modes=("wsgi",), profile=True, only=None):
+    """
+    Seed once, then load-test each server mode in turn. `only` limits the
+    run to those case names; `profile=False` leaves the profiling
+    middleware off (no query counts, no sampling overhead).
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        env = {
+            **os.environ,
+            "DJANGO_DB_URL": db_url or f"sqlite:///{Path(scratch) / 'bench.sqlite3'}",
+            "DJANGO_DEBUG": "false",
+            "DJANGO_MODE": "STAGING",
+            "DJANGO_SECRET_KEY": BENCH_SECRET,
+            "DJANGO_PROFILING_SAMPLE_RATE": "1" if profile else "0",
+            "DJANGO_PROFILING_DUMP_INTERVAL": "1",
+        }
+        # Seed in-process with the same settings the workers will load
+        os.environ.update(env)
+        setup_django()
+        from django.core.management import call_command
+        from django.urls import resolve
+        from profiling.recorder import load_dumps, summarize
+        from .api import access_token, api_cases
+
+        call_command("migrate", verbosity=0)
+        world = seed_world(**PRESETS[preset])
+        cases = [case for case in api_cases(world) if only is None or case[0] in only]
+        cookie = f"access_token={access_token(world)}"
+
+        by_mode = {}
+        for mode in modes:
+            dump_dir = str(Path(scratch) / f"profiles-{mode}")
+            port = _free_port()
+            process = _serve(port, mode, workers, threads, {**env, "DJANGO_PROFILING_DUMP_DIR": dump_dir})
+            try:
+                _wait_for_port(port, process)
+                results = drive(port, cases, cookie, concurrency, duration)
+                if profile:
+                    # Give every worker a chance to pass its dump interval once more
+                    time.sleep(1.1)
+                    drive(port, cases[:1], cookie, workers, 0.5)
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+            if profile:
+                by_url = {row["url_name"]: row for row in summarize(load_dumps(dump_dir))}
+                for name, _, path, _ in cases:
+                    row = by_url.get(resolve(path.split("?")[0]).view_name)
+                    if row:
+                        results[name]["queries"] = row["queries"]
+                        results[name]["server_ms"] = {k: row[k] for k in ("wall_ms", "db_ms", "serializer_ms")}
+            by_mode[mode] = results
+
+    return {
+        "world": world.summary(),
+        "gunicorn": {"workers": workers, "threads": threads},
+        "concurrency": concurrency,
+        "duration_s": duration,
+        **(by_mode if len(modes) > 1 else by_mode[modes[0]]),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--db-url", default=None, help="Benchmark against this database instead of a scratch SQLite file.")
+    parser.add_argument("--modes", nargs="+", choices=("wsgi", "asgi"), default=["wsgi"])
+    parser.add_argument("--no-profile", action="store_true", help="Leave the profiling middleware off.")
+    args = parser.parse_args()
+    report("load", run(
+        args.preset, args.workers, args.threads, args.concurrency, args.duration, args.db_url,
+        modes=tuple(args.modes), profile=not args.no_profile,
+    ))
@@ -0,0 +1,69 @@
+"""
+Building a branching event: one POST per scenario vs. one bulk tree upsert.
+
+    python -m benchmarks.scenario_bulk [nodes]
+"""
+import sys
+
+from .common import report, test_database, timed
+
+
+def _tree(nodes, branching=3):
+    """A complete `branching`-ary tree of `nodes` nodes, as (tmp_id, parent_tmp_id) pairs."""
+    return [(f"n{i}", f"n{(i - 1) // branching}" if i else None) for i in range(nodes)]
+
+
+def run(nodes=200):
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from characters.models import Character, Meta
+    from events.models import Event
+
+    user = User.objects.create_user("bench", password="bench-pass-123")
+    character = Character.objects.create(meta=Meta.objects.create(owner=user))
+    client = APIClient()
+    client.force_authenticate(user)
+    pairs = _tree(nodes)
+
+    def new_event():
+        return Event.objects.create(
+            title="Bench", description="", chance_to_trigger=100, character=character, owner=user,
+        )
+
+    def single(event):
+        url = reverse("event-scenario-list", kwargs={"character_id": character.id, "event_id": event.id})
+        ids = {}
+        for tmp_id, parent in pairs:
+            response = client.post(
+                url, {"title": tmp_id, "description": tmp_id, "weight": 1, "parent": ids.get(parent)}, format="json",
+            )
+            ids[tmp_id] = response.json()["id"]
+
+    def bulk(event):
+        url = reverse("event-scenario-bulk", kwargs={"character_id": character.id, "event_id": event.id})
+        creates = [{"tmp_id": t, "parent": p, "title": t, "weight": 1} for t, p in pairs]
+        response = client.post(url, {"create": creates}, format="json")
+        assert response.status_code == 200, response.content
+
+    results = {}
+    for name, func in (("single", single), ("bulk", bulk)):
+        event = new_event()
+        with CaptureQueriesContext(connection) as ctx:
+            seconds, _ = timed(func, event)
+        results[name] = {
+            "nodes": nodes,
+            "seconds": round(seconds, 4),
+            "nodes_per_second": round(nodes / seconds, 1),
+            "queries": len(ctx.captured_queries),
+        }
+    results["speedup"] = round(results["bulk"]["nodes_per_second"] / results["single"]["nodes_per_second"], 2)
+    return results
+
+
+if __name__ == "__main__":
+    with test_database():
+        report("scenario_bulk", run(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
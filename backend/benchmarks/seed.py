@@ -0,0 +1,183 @@
+"""
+Synthetic worlds for the benchmarks.
+
+Rows are generated with Faker from a fixed seed and written with bulk
+inserts, so the same arguments always give the same world. Most events get
+a small two-root tree; `deep_trees` of them get a full `branching`-ary tree
+of `depth` levels for the play/simulate/tree endpoints.
+
+    python -m benchmarks.seed --preset large   # into DJANGO_DB_URL / db.sqlite3
+"""
+from __future__ import annotations
+
+import argparse
+from dataclasses import asdict, dataclass, field
+import itertools
+import random
+
+from .common import report, setup_django, timed
+
+
+PRESETS = {
+    "small": dict(characters=200, events=2_000, deep_trees=10, depth=6, branching=2, stories=400),
+    "medium": dict(characters=2_000, events=20_000, deep_trees=50, depth=7, branching=3, stories=4_000),
+    "large": dict(characters=10_000, events=100_000, deep_trees=200, depth=8, branching=3, stories=20_000),
+}
+TEXT_POOL = 512
+
+
+@dataclass
+class World:
+    username: str
+    password: str
+    user_id: int
+    character_ids: list[int] = field(default_factory=list)
+    event_ids: list[int] = field(default_factory=list)
+    deep_event_ids: list[int] = field(default_factory=list)
+    story_ids: list[int] = field(default_factory=list)
+    scenarios: int = 0
+
+    def summary(self) -> dict:
+        out = asdict(self)
+        out.pop("password")
+        for key, label in (("character_ids", "characters"), ("event_ids", "events"),
+                           ("deep_event_ids", "deep_trees"), ("story_ids", "stories")):
+            out[label] = len(out.pop(key))
+        return out
+
+
+def _texts(fake, factory, size=TEXT_POOL):
+    return [factory(fake) for _ in range(size)]
+
+
+def seed_world(
+    username: str = "bench",
+    password: str = "bench-pass-123",
+    characters: int = 200,
+    events: int = 2_000,
+    deep_trees: int = 10,
+    depth: int = 6,
+    branching: int = 2,
+    stories: int = 400,
+    seed: int = 0,
+    index: bool = True,
+) -> World:
+    from django.contrib.auth.models import User
+    from faker import Faker
+
+    from characters.models import BasicIdentity, Character, Location, Meta
+    from core.bulk import bulk_insert
+    from events.models import Event, Scenario
+    from events.tree import rebuild_paths
+    from search.indexing import rebuild
+    from stories.models import Story
+
+    fake = Faker()
+    Faker.seed(seed)
+    rng = random.Random(seed)
+
+    # Pre-generated pools keep large seeds fast; rng picks from them
+    titles = _texts(fake, lambda f: f.sentence(nb_words=4).rstrip("."))
+    paragraphs = _texts(fake, lambda f: f.paragraph(nb_sentences=3))
+    markdown = _texts(fake, lambda f: "\n\n".join(["# " + f.sentence(), *f.paragraphs(nb=4)]), 64)
+
+    user = User.objects.create_user(username, password=password)
+    world = World(username=username, password=password, user_id=user.id)
+
+    identities = bulk_insert([
+        BasicIdentity(
+            name_given=fake.first_name(),
+            name_family=fake.last_name(),
+            date_of_birth=fake.date_of_birth(minimum_age=16, maximum_age=90),
+        )
+        for _ in range(characters)
+    ])
+    locations = bulk_insert([
+        Location(country=fake.country(), settlement=fake.city(), street=fake.street_name())
+        for _ in range(characters)
+    ])
+    metas = bulk_insert([Meta(owner=user) for _ in range(characters)])
+    world.character_ids = [
+        c.id for c in bulk_insert([
+            Character(basic_identity=i, location=l, meta=m, owner=user)
+            for i, l, m in zip(identities, locations, metas)
+        ])
+    ]
+
+    owners = itertools.cycle(world.character_ids)
+    world.event_ids = [
+        e.id for e in bulk_insert([
+            Event(
+                owner=user,
+                character_id=next(owners),
+                title=rng.choice(titles),
+                description=rng.choice(paragraphs),
+                chance_to_trigger=rng.randint(1, 100),
+            )
+            for _ in range(events)
+        ])
+    ]
+    world.deep_event_ids = world.event_ids[:deep_trees]
+
+    # Shallow trees: two terminal roots per event
+    shallow = [
+        Scenario(event_id=event_id, owner=user, title=rng.choice(titles), description="",
+                 weight=rng.randint(1, 10), is_terminal=True)
+        for event_id in world.event_ids[deep_trees:]
+        for _ in range(2)
+    ]
+    world.scenarios += len(bulk_insert(shallow))
+
+    # Deep trees, inserted level by level so parents have ids
+    for event_id in world.deep_event_ids:
+        level = [None]
+        for d in range(depth):
+            level = bulk_insert([
+                Scenario(
+                    event_id=event_id,
+                    owner=user,
+                    parent=parent,
+                    title=rng.choice(titles),
+                    description=rng.choice(paragraphs),
+                    weight=rng.randint(1, 10),
+                    is_terminal=d == depth - 1,
+                )
+                for parent in level
+                for _ in range(branching)
+            ])
+            world.scenarios += len(level)
+
+    owners = itertools.cycle(world.character_ids)
+    world.story_ids = [
+        s.id for s in bulk_insert([
+            Story(
+                owner=user,
+                character_id=next(owners),
+                title=rng.choice(titles),
+                description=rng.choice(paragraphs),
+                markdown=rng.choice(markdown),
+            )
+            for _ in range(stories)
+        ])
+    ]
+
+    rebuild_paths()
+    if index:
+        rebuild()
+    return world
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--preset", choices=PRESETS, default="small")
+    parser.add_argument("--username", default="bench")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    setup_django()
+    seconds, world = timed(seed_world, username=args.username, seed=args.seed, **PRESETS[args.preset])
+    report("seed", {"preset": args.preset, "seconds": round(seconds, 2), **world.summary()})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Cold start of a Django process per startup banner mode.
+
+Every variant boots a fresh interpreter with `python -X importtime` and
+`django.setup()`. The report has the median wall time, the time spent in
+`django.setup()` (the settings import runs the banner), the import time of
+the banner's modules and whether `rich` got imported. `full` without a build info file is the old
+behaviour of every process; gunicorn workers now run `off`.
+
+    python -m benchmarks.startup [--repeat 7]
+"""
+import argparse
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .common import report
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Prints how long `django.setup()` (settings import and banner included) took
+BOOT = (
+    "import sys, time; start = time.perf_counter(); import django; django.setup(); "
+    "print('setup_s', time.perf_counter() - start, 'rich' in sys.modules, file=sys.stderr)"
+)
+# Top-level imports the banner is responsible for
+BANNER_MODULES = ("core.startup", "rich")
+
+
+def _boot(env):
+    """`(wall seconds, setup seconds, rich imported, {module: cumulative µs})` for one cold start."""
+    start = time.perf_counter()
+    done = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    modules, setup, rich = {}, None, False
+    for line in done.stderr.splitlines():
+        if line.startswith("setup_s "):
+            _, seconds, imported = line.split()
+            setup, rich = float(seconds), imported == "True"
+            continue
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules.setdefault(name.strip(), int(cumulative))
+    return wall, setup, rich, modules
+
+
+def run(repeat=7):
+    base = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "core.settings",
+        # DEV: without build info the full banner shells out to git
+        "DJANGO_MODE": "DEV",
+        "DJANGO_BUILD_INFO": "",
+    }
+    with tempfile.TemporaryDirectory() as scratch:
+        info = Path(scratch) / "build_info.json"
+        subprocess.run([sys.executable, "-m", "core.buildinfo", "--output", str(info)],
+                       cwd=BACKEND_DIR, env=base, capture_output=True, check=True)
+        variants = {
+            "full": {"DJANGO_STARTUP_BANNER": "full", "DJANGO_BUILD_INFO": str(Path(scratch) / "missing.json")},
+            "full+build_info": {"DJANGO_STARTUP_BANNER": "full", "DJANGO_BUILD_INFO": str(info)},
+            "compact": {"DJANGO_STARTUP_BANNER": "compact"},
+            "off": {"DJANGO_STARTUP_BANNER": "off"},
+        }
+
+        results = {}
+        for name, overrides in variants.items():
+            env = {**base, **overrides}
+            _boot(env)  # warm the OS page cache
+            walls, setups, banner_us, rich = [], [], [], False
+            for _ in range(repeat):
+                wall, setup, imported, modules = _boot(env)
+                walls.append(wall)
+                setups.append(setup)
+                banner_us.append(sum(modules.get(m, 0) for m in BANNER_MODULES))
+                rich = rich or imported
+            results[name] = {
+                "wall_ms": round(statistics.median(walls) * 1000, 1),
+                "django_setup_ms": round(statistics.median(setups) * 1000, 1),
+                "banner_imports_ms": round(statistics.median(banner_us) / 1000, 1),
+                "imports_rich": rich,
+            }
+    return {"repeat": repeat, "variants": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+    report("startup", run(args.repeat))
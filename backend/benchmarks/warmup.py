@@ -0,0 +1,91 @@
+"""
+First-request latency of a fresh gunicorn worker, with and without the
+warm-up hook (core.startup.warm_up via gunicorn.conf.py).
+
+One worker serves a small seeded world. After it has booted, each GET
+endpoint is requested `--steady + 1` times on one connection: the first
+request is the cold one, and the median of the rest is steady state.
+
+    python -m benchmarks.warmup [--steady 20] [--settle 3]
+"""
+import argparse
+import http.client
+import os
+from pathlib import Path
+import statistics
+import tempfile
+import time
+
+from .common import report, setup_django
+from .load import BENCH_SECRET, _free_port, _serve, _wait_for_port
+from .seed import seed_world
+
+WORLD = dict(characters=20, events=60, deep_trees=2, depth=4, branching=2, stories=20)
+
+
+def _measure(port, cases, cookie, steady):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    headers = {"Cookie": cookie}
+    out = {}
+    for name, _, path, _ in cases:
+        samples = []
+        for _ in range(steady + 1):
+            start = time.perf_counter()
+            conn.request("GET", path, headers=headers)
+            conn.getresponse().read()
+            samples.append(time.perf_counter() - start)
+        out[name] = {
+            "first_ms": round(samples[0] * 1000, 2),
+            "steady_p50_ms": round(statistics.median(samples[1:]) * 1000, 2),
+        }
+    conn.close()
+    return out
+
+
+def run(steady=20, settle=3.0):
+    with tempfile.TemporaryDirectory() as scratch:
+        env = {
+            **os.environ,
+            "DJANGO_DB_URL": f"sqlite:///{Path(scratch) / 'bench.sqlite3'}",
+            "DJANGO_DEBUG": "false",
+            "DJANGO_MODE": "STAGING",
+            "DJANGO_SECRET_KEY": BENCH_SECRET,
+        }
+        os.environ.update(env)
+        setup_django()
+        from django.core.management import call_command
+        from .api import access_token, api_cases
+
+        call_command("migrate", verbosity=0)
+        world = seed_world(**WORLD)
+        cases = [case for case in api_cases(world) if case[1] == "GET"]
+        cookie = f"access_token={access_token(world)}"
+
+        results = {}
+        for warmup in ("true", "false"):
+            port = _free_port()
+            process = _serve(port, "wsgi", 1, 1, {**env, "DJANGO_WARMUP": warmup})
+            try:
+                _wait_for_port(port, process)
+                # The master listens before the worker has booted (and warmed up)
+                time.sleep(settle)
+                results["warm" if warmup == "true" else "cold"] = _measure(port, cases, cookie, steady)
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+    # The first endpoint pays for everything the worker left lazy
+    first = cases[0][0]
+    return {
+        "world": world.summary(),
+        "first_endpoint": first,
+        **results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steady", type=int, default=20)
+    parser.add_argument("--settle", type=float, default=3.0)
+    args = parser.parse_args()
+    report("warmup", run(args.steady, args.settle))
@@ -0,0 +1,34 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from characters.world import export_world
+
+
+class Command(BaseCommand):
+    help = "Stream a user's characters, events, scenario trees and stories as NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout).")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']!r} does not exist.")
+
+        if options["output"] == "-":
+            out = sys.stdout
+            close = False
+        else:
+            out = open(options["output"], "w", encoding="utf-8")
+            close = True
+
+        try:
+            for line in export_world(user):
+                out.write(line)
+        finally:
+            if close:
+                out.close()
@@ -0,0 +1,36 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from characters.world import IMPORT_BATCH_SIZE, WorldImportError, import_world
+
+
+class Command(BaseCommand):
+    help = "Stream an NDJSON world export back in for the given user."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("path", help="NDJSON file produced by export_world, or - for stdin.")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']!r} does not exist.")
+
+        if options["path"] == "-":
+            counts = self._import(user, sys.stdin, options["batch_size"])
+        else:
+            with open(options["path"], encoding="utf-8") as lines:
+                counts = self._import(user, lines, options["batch_size"])
+
+        summary = ", ".join(f"{kind}={count}" for kind, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Imported for {user.username}: {summary}"))
+
+    def _import(self, user, lines, batch_size):
+        try:
+            return import_world(user, lines, batch_size=batch_size)
+        except WorldImportError as exc:
+            raise CommandError(str(exc))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('characters', '0002_location_zip_code'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meta',
+            index=models.Index(fields=['owner', '-last_modified'], name='meta_owner_modified_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_owner(apps, schema_editor):
+    Character = apps.get_model("characters", "Character")
+    Meta = apps.get_model("characters", "Meta")
+    Character.objects.filter(meta__isnull=False).update(
+        owner=Subquery(Meta.objects.filter(pk=OuterRef("meta_id")).values("owner_id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('characters', '0003_meta_meta_owner_modified_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='character',
+            name='owner',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='characters', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='character',
+            index=models.Index(fields=['owner', 'id'], name='character_owner_id_idx'),
+        ),
+        migrations.RunPython(populate_owner, migrations.RunPython.noop),
+    ]
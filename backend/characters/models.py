@@ -5,6 +5,15 @@ class Character(models.Model):
     basic_identity = models.ForeignKey('BasicIdentity', on_delete=models.SET_NULL, null=True, blank=True)
     location = models.ForeignKey('Location', on_delete=models.SET_NULL, null=True, blank=True)
     meta = models.ForeignKey('Meta', on_delete=models.SET_NULL, null=True, blank=True)
+    # Copy of meta.owner (characters.signals keeps it), so ownership
+    # filters don't join Meta. Indexed through character_owner_id_idx.
+    owner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, editable=False, db_index=False, related_name="characters")
+
+    class Meta:
+        indexes = [
+            # Ownership checks by pk and the export's id-ordered scan
+            models.Index(fields=["owner", "id"], name="character_owner_id_idx"),
+        ]
 
     def __str__(self):
         if self.basic_identity:
@@ -29,4 +38,10 @@ class Location(models.Model):
 class Meta(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
-    last_modified = models.DateTimeField(auto_now=True)
\ No newline at end of file
+    last_modified = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Character list keyset: owner filter + newest-first cursor
+            models.Index(fields=["owner", "-last_modified"], name="meta_owner_modified_idx"),
+        ]
\ No newline at end of file
@@ -1,4 +1,8 @@
+from django.utils import timezone
 from rest_framework import serializers
+
+from core.bulk import BULK_BATCH_SIZE, bulk_insert
+from core.response_cache import invalidate
 from .models import Character, BasicIdentity, Location, Meta
 
 
@@ -27,6 +31,115 @@ class LocationSerializer(serializers.ModelSerializer):
         ]
 
 
+class CharacterBulkSerializer(serializers.ListSerializer):
+    """
+    `many=True` form of CharacterUploadSerializer.
+
+    `instance` is a `{pk: character}` map of the user's characters; items
+    carrying an `id` update that character, the others are created. Every
+    table is written with `bulk_create` / `bulk_update`, so the query count
+    doesn't depend on the number of items.
+    """
+
+    def run_child_validation(self, data):
+        pk = data.get("id") if isinstance(data, dict) else None
+        if pk is None:
+            return self.child.run_validation(data)
+
+        instance = (self.instance or {}).get(pk)
+        if instance is None:
+            raise serializers.ValidationError({"id": ["Not found."]})
+
+        self.child.instance = instance
+        try:
+            validated = self.child.run_validation(data)
+        finally:
+            self.child.instance = None
+        validated["id"] = pk
+        return validated
+
+    def save(self, **kwargs):
+        request = self.context.get("request")
+        owner = request.user if request else None
+
+        results = []
+        creates = []
+        updates = []
+        for attrs in self.validated_data:
+            if "id" in attrs:
+                updates.append((self.instance[attrs["id"]], attrs))
+                results.append(self.instance[attrs["id"]])
+            else:
+                creates.append(attrs)
+                results.append(None)
+
+        created = iter(self._bulk_create(creates, owner))
+        self._bulk_update(updates)
+        # Bulk writes send no post_save
+        if owner is not None:
+            invalidate("characters", [owner.pk])
+
+        self.instance = [obj if obj is not None else next(created) for obj in results]
+        return self.instance
+
+    def _bulk_create(self, items, owner):
+        if not items:
+            return []
+
+        identities = bulk_insert([BasicIdentity(**item["basic_identity"]) for item in items])
+        locations = bulk_insert([Location(**item["location"]) for item in items])
+        metas = bulk_insert([Meta(owner=owner) for _ in items]) if owner else [None] * len(items)
+
+        return bulk_insert([
+            Character(basic_identity=identity, location=location, meta=meta, owner=owner)
+            for identity, location, meta in zip(identities, locations, metas)
+        ])
+
+    def _bulk_update(self, updates):
+        if not updates:
+            return
+
+        changed = {"basic_identity": [], "location": []}
+        missing = {"basic_identity": [], "location": []}
+        for instance, attrs in updates:
+            for rel, model in (("basic_identity", BasicIdentity), ("location", Location)):
+                values = attrs.get(rel)
+                if values is None:
+                    continue
+                obj = getattr(instance, rel)
+                if obj is None:
+                    missing[rel].append((instance, model(**values)))
+                    continue
+                for attr, value in values.items():
+                    setattr(obj, attr, value)
+                changed[rel].append(obj)
+
+        BasicIdentity.objects.bulk_update(
+            changed["basic_identity"], BasicIdentitySerializer.Meta.fields, batch_size=BULK_BATCH_SIZE,
+        )
+        Location.objects.bulk_update(
+            changed["location"], LocationSerializer.Meta.fields, batch_size=BULK_BATCH_SIZE,
+        )
+
+        relinked = []
+        for rel, pairs in missing.items():
+            bulk_insert([obj for _, obj in pairs])
+            for instance, obj in pairs:
+                setattr(instance, rel, obj)
+                relinked.append(instance)
+        if relinked:
+            Character.objects.bulk_update(
+                list({c.pk: c for c in relinked}.values()), ["basic_identity", "location"],
+            )
+
+        # bulk_update skips auto_now, so touch last_modified explicitly
+        now = timezone.now()
+        metas = [instance.meta for instance, _ in updates if instance.meta is not None]
+        for meta in metas:
+            meta.last_modified = now
+        Meta.objects.bulk_update(metas, ["last_modified"], batch_size=BULK_BATCH_SIZE)
+
+
 class CharacterUploadSerializer(serializers.ModelSerializer):
     basic_identity = BasicIdentitySerializer(required=True)
     location = LocationSerializer(required=True)
@@ -38,6 +151,7 @@ class CharacterUploadSerializer(serializers.ModelSerializer):
             "basic_identity",
             "location",
         ]
+        list_serializer_class = CharacterBulkSerializer
 
     def validate(self, attrs):
         if "basic_identity" not in attrs:
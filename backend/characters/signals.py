@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.response_cache import invalidate
+from .models import Character, Meta
+
+
+def _owner_id(character):
+    if character.meta_id is None:
+        return None
+    if Character.meta.is_cached(character):
+        return character.meta.owner_id
+    return Meta.objects.filter(pk=character.meta_id).values_list("owner_id", flat=True).first()
+
+
+# `owner` mirrors meta.owner; bulk inserts set it themselves
+@receiver(pre_save, sender=Character, dispatch_uid="characters_copy_owner")
+def copy_owner(sender, instance, raw=False, **kwargs):
+    if not raw and instance.owner_id is None:
+        instance.owner_id = _owner_id(instance)
+
+
+@receiver(post_save, sender=Character, dispatch_uid="characters_uncache_on_save")
+@receiver(post_delete, sender=Character, dispatch_uid="characters_uncache_on_delete")
+def uncache_character(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate("characters", [instance.owner_id])
+
+
+# Nested identity/location edits always save the meta (`last_modified`)
+@receiver(post_save, sender=Meta, dispatch_uid="characters_uncache_on_meta_save")
+@receiver(post_delete, sender=Meta, dispatch_uid="characters_uncache_on_meta_delete")
+def uncache_meta(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate("characters", [instance.owner_id])
@@ -1,3 +1,583 @@
-from django.test import TestCase
+from datetime import date, datetime, timezone as dt_timezone
+import json
 
-# Create your tests here.
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.db import OperationalError
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import permissions
+from rest_framework.test import APIClient
+from rest_framework.throttling import UserRateThrottle
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from core.async_views import AsyncReadView
+from core.caches import parse_cache_url
+from core.databases import describe
+from core import replicas
+from core.replicas import PIN_COOKIE, ReplicaRouter, ReplicaRoutingMiddleware
+from core.testing import QueryBudgetMixin, QueryPlanMixin
+from .views import CharacterBulkView, CharacterDetailView, CharacterListCreateView
+from .models import Character, BasicIdentity, Location, Meta
+
+
+class CharacterQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _make_characters(self, count):
+        return [
+            Character.objects.create(
+                basic_identity=BasicIdentity.objects.create(
+                    name_given=f"Given {i}", name_family="Family", date_of_birth=date(2000, 1, 1),
+                ),
+                location=Location.objects.create(country="Country"),
+                meta=Meta.objects.create(owner=self.user),
+            )
+            for i in range(count)
+        ]
+
+    def test_list_is_one_joined_query(self):
+        self._make_characters(25)
+
+        # ETag aggregate + one joined list query
+        with self.assertQueryBudget(2):
+            response = self.client.get(reverse("character-list-create"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 25)
+        self.assertEqual(response.json()[0]["location"]["country"], "Country")
+
+    def test_detail_is_one_joined_query(self):
+        character = self._make_characters(1)[0]
+
+        # ETag lookup + one joined detail query
+        with self.assertQueryBudget(2):
+            response = self.client.get(reverse("character-detail", kwargs={"pk": character.pk}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["basic_identity"]["name_given"], "Given 0")
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class CharacterResponseCacheTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.character = Character.objects.create(
+            basic_identity=BasicIdentity.objects.create(name_given="Given", date_of_birth=date(2000, 1, 1)),
+            location=Location.objects.create(country="Country"),
+            meta=Meta.objects.create(owner=self.user),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("character-list-create")
+        self.detail = reverse("character-detail", kwargs={"pk": self.character.pk})
+
+    def test_repeated_reads_skip_the_database(self):
+        first = self.client.get(self.url)
+
+        with self.assertQueryBudget(0):
+            again = self.client.get(self.url)
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(again.json(), first.json())
+        self.assertEqual(again["ETag"], first["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_writes_invalidate_only_the_owner(self):
+        other = User.objects.create_user("other", password="pass12345")
+        other_client = APIClient()
+        other_client.force_authenticate(other)
+        other_client.get(self.url)
+        self.client.get(self.detail)
+
+        payload = {"basic_identity": {"name_given": "Renamed", "date_of_birth": "2000-01-01"}, "location": {}}
+        self.client.put(self.detail, payload, format="json")
+
+        self.assertEqual(self.client.get(self.detail).json()["basic_identity"]["name_given"], "Renamed")
+        with self.assertQueryBudget(0):
+            other_client.get(self.url)
+
+    def test_bulk_writes_invalidate(self):
+        self.client.get(self.url)
+
+        payload = [{"basic_identity": {"name_given": "NPC", "date_of_birth": "2000-01-01"}, "location": {}}]
+        self.client.post(reverse("character-bulk"), payload, format="json")
+
+        self.assertEqual(len(self.client.get(self.url).json()), 2)
+
+    def test_cache_url_selects_backend(self):
+        self.assertEqual(parse_cache_url(None)["BACKEND"], "django.core.cache.backends.locmem.LocMemCache")
+        self.assertEqual(parse_cache_url("file:///tmp/rp")["LOCATION"], "/tmp/rp")
+        self.assertEqual(parse_cache_url("redis://127.0.0.1:6379/1")["LOCATION"], "redis://127.0.0.1:6379/1")
+        with self.assertRaises(ValueError):
+            parse_cache_url("memcached://127.0.0.1")
+
+
+class CharacterPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        for _ in range(5):
+            Character.objects.create(meta=Meta.objects.create(owner=self.user))
+
+    def test_unpaginated_without_cursor_params(self):
+        response = self.client.get(reverse("character-list-create"))
+        self.assertIsInstance(response.json(), list)
+        self.assertEqual(len(response.json()), 5)
+
+    def test_cursor_pages_cover_every_character_once(self):
+        url = reverse("character-list-create") + "?page_size=2"
+        seen = []
+        while url:
+            page = self.client.get(url).json()
+            self.assertLessEqual(len(page["results"]), 2)
+            seen.extend(item["id"] for item in page["results"])
+            url = page["next"]
+
+        expected = list(
+            Character.objects.order_by("-meta__last_modified", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+
+class CharacterBulkTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("character-bulk")
+
+    def _payload(self, name):
+        return {
+            "basic_identity": {"name_given": name, "name_family": "Family", "date_of_birth": "2000-01-01"},
+            "location": {"country": "Country"},
+        }
+
+    def test_bulk_create_writes_every_table_in_batches(self):
+        payload = [self._payload(f"NPC {i}") for i in range(50)]
+
+        with self.assertQueryBudget(10):
+            response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([c["basic_identity"]["name_given"] for c in response.json()], [f"NPC {i}" for i in range(50)])
+        self.assertEqual(Character.objects.filter(meta__owner=self.user).count(), 50)
+        self.assertEqual(Character.objects.filter(owner=self.user).count(), 50)
+
+    def test_bulk_mixes_creates_and_updates(self):
+        existing = self.client.post(self.url, [self._payload("Old")], format="json").json()[0]
+
+        payload = [self._payload("New"), {**self._payload("Renamed"), "id": existing["id"]}]
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()[1]["id"], existing["id"])
+        self.assertEqual(BasicIdentity.objects.get(character__id=existing["id"]).name_given, "Renamed")
+        self.assertEqual(Character.objects.count(), 2)
+
+    def test_bulk_without_creates_answers_200(self):
+        existing = self.client.post(self.url, [self._payload("Old")], format="json").json()[0]
+
+        response = self.client.post(self.url, [{**self._payload("Renamed"), "id": existing["id"]}], format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["basic_identity"]["name_given"], "Renamed")
+        self.assertEqual(self.client.post(self.url, [], format="json").status_code, 200)
+
+    def test_errors_are_reported_per_item_and_nothing_is_written(self):
+        other = User.objects.create_user("other", password="pass12345")
+        foreign = Character.objects.create(meta=Meta.objects.create(owner=other))
+
+        payload = [
+            self._payload("Fine"),
+            {"basic_identity": {"name_given": "Bad date", "date_of_birth": "soon"}, "location": {}},
+            {**self._payload("Foreign"), "id": foreign.id},
+        ]
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["errors"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("basic_identity", errors[1])
+        self.assertEqual(errors[2], {"id": ["Not found."]})
+        self.assertEqual(Character.objects.filter(meta__owner=self.user).count(), 0)
+
+
+class WorldExportImportTests(TestCase):
+    def setUp(self):
+        from events.models import Event, Scenario
+        from stories.models import Story
+
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        character = Character.objects.create(
+            basic_identity=BasicIdentity.objects.create(name_given="Ada", date_of_birth=date(1990, 5, 1)),
+            location=Location.objects.create(country="Country"),
+            meta=Meta.objects.create(owner=self.user),
+        )
+        event = Event.objects.create(
+            title="Storm", description="", chance_to_trigger=40, character=character, owner=self.user,
+        )
+        root = Scenario.objects.create(event=event, title="Root", description="", weight=1)
+        Scenario.objects.create(event=event, parent=root, title="Leaf", description="", weight=2, is_terminal=True)
+        Story.objects.create(character=character, owner=self.user, title="Origins", markdown="# Hi")
+        # auto_now columns, so backdate with update()
+        self.created = datetime(2020, 1, 2, 3, 4, 5, 678000, tzinfo=dt_timezone.utc)
+        self.modified = datetime(2021, 6, 7, 8, 9, 10, tzinfo=dt_timezone.utc)
+        Meta.objects.filter(owner=self.user).update(created_at=self.created, last_modified=self.modified)
+        Event.objects.filter(owner=self.user).update(created_at=self.created, last_modified=self.modified)
+        Story.objects.filter(owner=self.user).update(created=self.created, updated=self.modified)
+
+    def test_export_streams_ndjson_and_round_trips(self):
+        import json
+        from characters.world import import_world
+        from events.models import Event, Scenario
+        from stories.models import Story
+
+        response = self.client.get(reverse("world-export"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = [line for line in b"".join(response.streaming_content).decode().splitlines() if line]
+        self.assertEqual(
+            [json.loads(line)["type"] for line in lines],
+            ["header", "character", "event", "scenario", "scenario", "story"],
+        )
+
+        target = User.objects.create_user("target", password="pass12345")
+        counts = import_world(target, lines, batch_size=1)
+
+        self.assertEqual(counts, {"character": 1, "event": 1, "scenario": 2, "story": 1})
+        imported = Character.objects.get(meta__owner=target)
+        self.assertEqual(imported.basic_identity.name_given, "Ada")
+        leaf = Scenario.objects.get(event__owner=target, title="Leaf")
+        self.assertEqual(leaf.parent.title, "Root")
+        self.assertEqual(leaf.event.character, imported)
+        self.assertEqual(Story.objects.get(owner=target).markdown, "# Hi")
+
+        self.assertEqual((imported.meta.created_at, imported.meta.last_modified), (self.created, self.modified))
+        event = Event.objects.get(owner=target)
+        self.assertEqual((event.created_at, event.last_modified), (self.created, self.modified))
+        story = Story.objects.get(owner=target)
+        self.assertEqual((story.created, story.updated), (self.created, self.modified))
+
+    def test_records_without_timestamps_get_the_import_time(self):
+        from characters.world import import_world
+
+        lines = [
+            json.dumps({"type": "header", "version": 1}),
+            json.dumps({"type": "character", "id": 1, "basic_identity": None, "location": None}),
+        ]
+        target = User.objects.create_user("target", password="pass12345")
+        import_world(target, lines)
+
+        self.assertGreater(Meta.objects.get(owner=target).created_at, self.modified)
+
+    def test_invalid_record_fails_with_its_index(self):
+        from io import StringIO
+        from tempfile import NamedTemporaryFile
+        from django.core.management import CommandError, call_command
+
+        lines = [
+            {"type": "header", "version": 1},
+            {"type": "character", "id": 1, "basic_identity": None, "location": None},
+            {"type": "character", "id": 2, "basic_identity": {"name_given": "Bob"}, "location": None},
+        ]
+        target = User.objects.create_user("target", password="pass12345")
+        with NamedTemporaryFile("w", suffix=".ndjson") as export:
+            export.write("".join(json.dumps(line) + "\n" for line in lines))
+            export.flush()
+
+            with self.assertRaisesMessage(CommandError, "Record 3 (character): date_of_birth:"):
+                call_command("import_world", "target", export.name, stdout=StringIO())
+
+        self.assertFalse(Character.objects.filter(meta__owner=target).exists())
+
+
+class AsyncCharacterReadTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.characters = [
+            Character.objects.create(
+                basic_identity=BasicIdentity.objects.create(
+                    name_given=f"Given {i}", name_family="Family", date_of_birth=date(2000, 1, 1),
+                ),
+                location=Location.objects.create(country="Country"),
+                meta=Meta.objects.create(owner=self.user),
+            )
+            for i in range(3)
+        ]
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.client = APIClient()
+        self.client.cookies["access_token"] = self.token
+        self.factory = AsyncRequestFactory()
+        self.list_view = AsyncReadView.as_view(drf_view=CharacterListCreateView)
+        self.detail_view = AsyncReadView.as_view(drf_view=CharacterDetailView)
+
+    def _request(self, path, token=True, **headers):
+        request = self.factory.get(path, headers=headers)
+        if token:
+            request.COOKIES["access_token"] = self.token
+        return request
+
+    async def test_list_and_detail_match_sync_views(self):
+        url = reverse("character-list-create")
+        response = await self.list_view(self._request(url))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c["id"] for c in json.loads(response.content)], [c.id for c in reversed(self.characters)])
+
+        pk = self.characters[0].id
+        response = await self.detail_view(self._request(reverse("character-detail", kwargs={"pk": pk})), pk=pk)
+        self.assertEqual(json.loads(response.content)["basic_identity"]["name_given"], "Given 0")
+
+    def test_payload_and_etag_equal_sync_view(self):
+        url = reverse("character-list-create")
+        sync_response = self.client.get(url)
+        async_response = async_to_sync(self.list_view)(self._request(url))
+
+        self.assertEqual(json.loads(async_response.content), sync_response.json())
+        self.assertEqual(async_response["ETag"], sync_response["ETag"])
+
+        not_modified = async_to_sync(self.list_view)(self._request(url, If_None_Match=sync_response["ETag"]))
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_anonymous_and_paginated_requests_use_sync_view(self):
+        url = reverse("character-list-create")
+        anonymous = async_to_sync(self.list_view)(self._request(url, token=False))
+        self.assertEqual(anonymous.status_code, 401)
+
+        paged = async_to_sync(self.list_view)(self._request(url + "?page_size=2"))
+        paged.render()
+        self.assertEqual(len(json.loads(paged.content)["results"]), 2)
+
+    def test_view_permissions_and_throttles_apply(self):
+        class StaffOnlyListView(CharacterListCreateView):
+            permission_classes = [permissions.IsAdminUser]
+
+        class OncePerMinute(UserRateThrottle):
+            rate = "1/min"
+
+        class ThrottledListView(CharacterListCreateView):
+            throttle_classes = [OncePerMinute]
+
+        class NoObjectAccess(permissions.BasePermission):
+            def has_object_permission(self, request, view, obj):
+                return False
+
+        class LockedDetailView(CharacterDetailView):
+            permission_classes = [permissions.IsAuthenticated, NoObjectAccess]
+
+        cache.clear()
+        url = reverse("character-list-create")
+        denied = async_to_sync(AsyncReadView.as_view(drf_view=StaffOnlyListView))(self._request(url))
+        self.assertEqual(denied.status_code, 403)
+        self.assertIn("detail", json.loads(denied.content))
+
+        throttled_view = AsyncReadView.as_view(drf_view=ThrottledListView)
+        self.assertEqual(async_to_sync(throttled_view)(self._request(url)).status_code, 200)
+        throttled = async_to_sync(throttled_view)(self._request(url))
+        self.assertEqual(throttled.status_code, 429)
+        self.assertIn("Retry-After", throttled)
+
+        pk = self.characters[0].id
+        locked = async_to_sync(AsyncReadView.as_view(drf_view=LockedDetailView))(
+            self._request(reverse("character-detail", kwargs={"pk": pk})), pk=pk,
+        )
+        self.assertEqual(locked.status_code, 403)
+
+
+class CharacterQueryPlanTests(QueryPlanMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner", password="pass12345")
+        cls.character = Character.objects.create(
+            basic_identity=BasicIdentity.objects.create(name_given="A", date_of_birth=date(2000, 1, 1)),
+            location=Location.objects.create(country="X"),
+            meta=Meta.objects.create(owner=cls.user),
+        )
+
+    def _queryset(self, view_class, **kwargs):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return view_class(request=request, kwargs=kwargs).get_queryset()
+
+    def test_owner_is_copied_from_meta(self):
+        self.assertEqual(self.character.owner_id, self.user.id)
+
+    def test_ownership_lookups_use_indexes(self):
+        self.assertNoFullScan(self._queryset(CharacterListCreateView))
+        self.assertNoFullScan(self._queryset(CharacterDetailView).filter(pk=self.character.pk))
+        self.assertNoFullScan(self._queryset(CharacterBulkView).filter(pk__in=[self.character.pk]))
+        # World export
+        self.assertNoFullScan(Character.objects.filter(owner=self.user).order_by("id"))
+
+    def test_unindexed_filter_fails(self):
+        with self.assertRaises(AssertionError):
+            self.assertNoFullScan(Location.objects.filter(country="X"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1", "replica_2"], DB_REPLICA_PIN_SECONDS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Routing decisions only; the test database has no real replicas."""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+        self.reachable = {"replica_1": True, "replica_2": True}
+        patcher = mock.patch("core.replicas.is_reachable", side_effect=lambda alias: self.reachable[alias])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _serve(self, request, reads=3, write=False):
+        """Runs `request` through the middleware; returns (read aliases, response)."""
+        seen = []
+
+        def view(request):
+            if write:
+                self.router.db_for_write(Character)
+            seen.extend(self.router.db_for_read(Character) for _ in range(reads))
+            return HttpResponse()
+
+        return seen, ReplicaRoutingMiddleware(view)(request)
+
+    def test_safe_gets_use_replicas_round_robin(self):
+        first, response = self._serve(self.factory.get("/api/characters/"))
+        second, _ = self._serve(self.factory.get("/api/characters/"))
+
+        self.assertEqual({first[0], second[0]}, {"replica_1", "replica_2"})
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_one_request_reads_from_a_single_replica(self):
+        from events.models import Event
+        from stories.models import Story
+
+        seen = []
+
+        def view(request):
+            # List query, prefetches and the ConditionalGetMixin aggregate
+            for model in (Character, Event, Character, Story, Event):
+                seen.append(self.router.db_for_read(model))
+            return HttpResponse()
+
+        with mock.patch.dict(replicas._down, clear=True):
+            ReplicaRoutingMiddleware(view)(self.factory.get("/api/events/"))
+
+        self.assertEqual(len(set(seen)), 1)
+        self.assertIn(seen[0], {"replica_1", "replica_2"})
+
+    def test_request_moves_off_its_replica_once_marked_down(self):
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(Character))
+            replicas._down[seen[0]] = float("inf")
+            self.reachable[seen[0]] = False
+            seen.append(self.router.db_for_read(Character))
+            seen.append(self.router.db_for_read(Character))
+            return HttpResponse()
+
+        with mock.patch.dict(replicas._down, clear=True):
+            ReplicaRoutingMiddleware(view)(self.factory.get("/api/characters/"))
+
+        self.assertNotEqual(seen[0], seen[1])
+        self.assertEqual(seen[1], seen[2])
+        self.assertNotEqual(seen[1], "default")
+
+    def test_other_apps_and_code_outside_requests_read_primary(self):
+        self.assertEqual(self.router.db_for_read(Character), "default")
+        seen = []
+
+        def view(request):
+            seen.append(self.router.db_for_read(User))
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(self.factory.get("/api/characters/"))
+        self.assertEqual(seen, ["default"])
+
+    def test_failover_skips_unreachable_replica_then_primary(self):
+        self.reachable["replica_1"] = False
+        seen, _ = self._serve(self.factory.get("/api/characters/"))
+        self.assertEqual(seen, ["replica_2"] * 3)
+
+        self.reachable["replica_2"] = False
+        seen, _ = self._serve(self.factory.get("/api/characters/"))
+        self.assertEqual(seen, ["default"] * 3)
+
+    def test_writes_pin_client_to_primary(self):
+        seen, response = self._serve(self.factory.post("/api/characters/"))
+        self.assertEqual(seen, ["default"] * 3)
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 10)
+
+        # A GET that writes reads its own writes and pins as well
+        seen, response = self._serve(self.factory.get("/api/characters/"), write=True)
+        self.assertEqual(seen, ["default"] * 3)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        pinned = self.factory.get("/api/characters/")
+        pinned.COOKIES[PIN_COOKIE] = "1"
+        seen, _ = self._serve(pinned)
+        self.assertEqual(seen, ["default"] * 3)
+
+    def test_replica_failing_mid_request_is_served_from_primary(self):
+        connections = {
+            "default": mock.Mock(in_atomic_block=False),
+            "replica_1": mock.Mock(errors_occurred=True),
+            "replica_2": mock.Mock(errors_occurred=False),
+        }
+        self.reachable["replica_2"] = False
+        seen = []
+
+        def view(request):
+            alias = self.router.db_for_read(Character)
+            seen.append(alias)
+            if alias != "default":
+                raise OperationalError("server closed the connection unexpectedly")
+            return HttpResponse()
+
+        def handler(request):
+            # What BaseHandler does with a view exception
+            try:
+                return view(request)
+            except OperationalError as exc:
+                return middleware.process_exception(request, exc) or HttpResponse(status=500)
+
+        middleware = ReplicaRoutingMiddleware(handler)
+        with mock.patch.object(replicas, "connections", connections), mock.patch.dict(replicas._down, clear=True):
+            response = middleware(self.factory.get("/api/characters/"))
+            self.assertIn("replica_1", replicas._down)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(seen, ["replica_1", "default"])
+        connections["replica_1"].close.assert_called_once()
+
+    def test_search_backend_lookup_does_not_pin(self):
+        from search.backends import get_backend
+
+        def view(request):
+            get_backend()
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(self.factory.get("/api/search/"))
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+
+class DatabaseDescribeTests(SimpleTestCase):
+    def test_pool_defaults_match_psycopg_pool(self):
+        self.assertEqual(describe({"OPTIONS": {"pool": True}}), "pool 4-4, timeout 30s, no health checks")
+        self.assertEqual(
+            describe({"OPTIONS": {"pool": {"min_size": 2}}, "CONN_HEALTH_CHECKS": True}),
+            "pool 2-2, timeout 30s, health checks",
+        )
+        self.assertEqual(describe({"OPTIONS": {"pool": {"min_size": 2, "max_size": 10}}})[:9], "pool 2-10")
@@ -1,7 +1,10 @@
 from django.urls import path
-from .views import CharacterListCreateView, CharacterDetailView
+from core.async_views import read_view
+from .views import CharacterListCreateView, CharacterDetailView, CharacterBulkView, WorldExportView
 
 urlpatterns = [
-    path("", CharacterListCreateView.as_view(), name="character-list-create"),
-    path("<int:pk>/", CharacterDetailView.as_view(), name="character-detail"),
+    path("", read_view(CharacterListCreateView), name="character-list-create"),
+    path("bulk/", CharacterBulkView.as_view(), name="character-bulk"),
+    path("export/", WorldExportView.as_view(), name="world-export"),
+    path("<int:pk>/", read_view(CharacterDetailView), name="character-detail"),
 ]
\ No newline at end of file
@@ -1,27 +1,46 @@
-from rest_framework import generics, permissions
+from django.db import transaction
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.conditional import ConditionalGetMixin
+from core.pagination import KeysetPagination
+from core.response_cache import CachedResponseMixin
 from .models import Character
 from .serializers import CharacterUploadSerializer
+from .world import export_world
 
 
-class CharacterListCreateView(generics.ListCreateAPIView):
+class CharacterListCreateView(CachedResponseMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET  /characters/      -> list current user's characters
     POST /characters/      -> create new character
     """
     serializer_class = CharacterUploadSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-last_modified", "-id")
+    etag_timestamp_field = "meta__last_modified"
+    response_cache_namespace = "characters"
 
     def get_queryset(self):
-        # Only user's characters, ordered by most recently modified meta
+        # Only user's characters, ordered by most recently modified meta.
+        # Filtering on meta's owner (not the copy on Character) lets the
+        # planner start from meta_owner_modified_idx, which has the cursor order.
+        # `last_modified` is annotated so the cursor can read it off the row.
         return (
             Character.objects
             .filter(meta__owner=self.request.user)
-            .select_related("meta")
-            .order_by("-meta__last_modified")
+            .select_related("basic_identity", "location", "meta")
+            .annotate(last_modified=F("meta__last_modified"))
+            .order_by("-last_modified", "-id")
         )
 
 
-class CharacterDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CharacterDetailView(CachedResponseMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET    /characters/<pk>/ -> retrieve character
     PUT    /characters/<pk>/ -> full update
@@ -30,7 +49,63 @@ class CharacterDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     serializer_class = CharacterUploadSerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_timestamp_field = "meta__last_modified"
+    response_cache_namespace = "characters"
+
+    def get_queryset(self):
+        # Same ownership restriction, on the denormalized owner (no Meta join)
+        return (
+            Character.objects
+            .filter(owner=self.request.user)
+            .select_related("basic_identity", "location", "meta")
+        )
+
+
+class CharacterBulkView(generics.GenericAPIView):
+    """
+    POST /characters/bulk/ -> create and/or update many characters at once
+
+    Body is a list of character payloads; items with an `id` update that
+    character, the rest are created. The whole batch is validated first and
+    written in one transaction; on failure `errors` lines up with the input.
+    Answers 201 if anything was created, 200 for pure updates.
+    """
+    serializer_class = CharacterUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    max_items = 1000
 
     def get_queryset(self):
-        # Same ownership restriction
-        return Character.objects.filter(meta__owner=self.request.user)
\ No newline at end of file
+        return (
+            Character.objects
+            .filter(owner=self.request.user)
+            .select_related("basic_identity", "location", "meta")
+        )
+
+    def post(self, request, *args, **kwargs):
+        items = request.data if isinstance(request.data, list) else []
+        ids = [item["id"] for item in items if isinstance(item, dict) and isinstance(item.get("id"), int)]
+        instances = self.get_queryset().in_bulk(ids) if ids else {}
+
+        serializer = self.get_serializer(instances, data=request.data, many=True, max_length=self.max_items)
+        if not serializer.is_valid():
+            return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            serializer.save()
+
+        created = any("id" not in attrs for attrs in serializer.validated_data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
+class WorldExportView(APIView):
+    """
+    GET /characters/export/ -> stream the user's characters, events,
+                               scenario trees and stories as NDJSON
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        filename = f"world-{request.user.username}-{timezone.now():%Y%m%d-%H%M%S}.ndjson"
+        response = StreamingHttpResponse(export_world(request.user), content_type="application/x-ndjson")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
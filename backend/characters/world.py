@@ -0,0 +1,413 @@
+"""
+NDJSON export / import of a user's whole world.
+
+One JSON object per line, each tagged with `type`:
+
+    header -> character* -> event* -> scenario* -> story*
+
+Rows are read with `.values().iterator(chunk_size=...)` (server-side
+cursors on PostgreSQL) and written as they arrive, and the importer
+consumes lines one at a time, flushing a bounded batch per record type.
+Memory therefore stays flat regardless of account size; the importer only
+keeps old->new primary key maps (plain ints).
+
+Creation and modification times travel with characters, events and
+stories and are written back on import; a record without them is stamped
+with the import time.
+"""
+from __future__ import annotations
+
+import json
+from typing import Iterable, Iterator
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from core.bulk import bulk_insert
+from core.response_cache import invalidate
+from events.models import Event, Scenario
+from events.tree import rebuild_paths
+from search.backends import SearchDocument
+from search.indexing import index_documents, story_document
+from stories.models import Story
+from .models import Character, BasicIdentity, Location, Meta
+from .serializers import BasicIdentitySerializer, LocationSerializer
+
+
+FORMAT_VERSION = 1
+CHUNK_SIZE = 2000
+# Story markdown can be large, fetch fewer rows per round trip
+STORY_CHUNK_SIZE = 200
+IMPORT_BATCH_SIZE = 500
+
+IDENTITY_FIELDS = BasicIdentitySerializer.Meta.fields
+LOCATION_FIELDS = LocationSerializer.Meta.fields
+EVENT_FIELDS = ["title", "description", "chance_to_trigger"]
+SCENARIO_FIELDS = ["title", "description", "weight", "is_terminal"]
+STORY_FIELDS = ["title", "description", "markdown"]
+# auto_now / auto_now_add columns, the character's live on its Meta
+META_TIMESTAMPS = ["created_at", "last_modified"]
+EVENT_TIMESTAMPS = ["created_at", "last_modified"]
+STORY_TIMESTAMPS = ["created", "updated"]
+
+
+class WorldImportError(ValueError):
+    pass
+
+
+def _clean(model, fields, data) -> dict:
+    """
+    `data` reduced to `fields`, converted and validated by the model
+    fields. Only what the column can't store is rejected (the exported rows
+    may predate the API's `blank` rules). A missing field gets the field's
+    default, so it fails like an empty one when that isn't storable.
+    """
+    if not isinstance(data, dict):
+        raise WorldImportError(f"expected an object, got {data!r}")
+    cleaned = {}
+    for name in fields:
+        field = model._meta.get_field(name)
+        try:
+            value = field.to_python(data.get(name, field.get_default()))
+            if value is None and not field.null:
+                raise ValidationError(field.error_messages["null"], code="null")
+            field.run_validators(value)
+            cleaned[name] = value
+        except ValidationError as exc:
+            raise WorldImportError(f"{name}: {' '.join(exc.messages)}") from None
+    return cleaned
+
+
+def _timestamps(model, fields, record: dict) -> dict:
+    """The exported timestamps `record` carries, validated."""
+    return _clean(model, [name for name in fields if record.get(name) is not None], record)
+
+
+def _restore_timestamps(objs, records, fields, batch_size) -> None:
+    """
+    `bulk_create` stamps auto_now / auto_now_add columns with the current
+    time; write the exported values over them (`bulk_update` doesn't stamp).
+    """
+    stamped = []
+    for obj, record in zip(objs, records):
+        if record["timestamps"]:
+            for name, value in record["timestamps"].items():
+                setattr(obj, name, value)
+            stamped.append(obj)
+    if stamped:
+        type(stamped[0]).objects.bulk_update(stamped, fields, batch_size=batch_size)
+
+
+def _ref(record: dict, key: str, nullable: bool = False) -> int | None:
+    """An old primary key the record points at."""
+    value = record.get(key)
+    if value is None and nullable:
+        return None
+    if type(value) is not int:
+        raise WorldImportError(f"{key}: expected an id, got {value!r}")
+    return value
+
+
+def _line(record: dict) -> str:
+    return json.dumps(record, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def _characters(user) -> Iterator[dict]:
+    rows = (
+        Character.objects
+        .filter(owner=user)
+        .order_by("id")
+        .values(
+            "id",
+            "basic_identity_id",
+            "location_id",
+            "meta__created_at",
+            "meta__last_modified",
+            *(f"basic_identity__{f}" for f in IDENTITY_FIELDS),
+            *(f"location__{f}" for f in LOCATION_FIELDS),
+        )
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for row in rows:
+        yield {
+            "type": "character",
+            "id": row["id"],
+            "created_at": row["meta__created_at"],
+            "last_modified": row["meta__last_modified"],
+            "basic_identity": (
+                {f: row[f"basic_identity__{f}"] for f in IDENTITY_FIELDS}
+                if row["basic_identity_id"] else None
+            ),
+            "location": (
+                {f: row[f"location__{f}"] for f in LOCATION_FIELDS}
+                if row["location_id"] else None
+            ),
+        }
+
+
+def _events(user) -> Iterator[dict]:
+    rows = (
+        Event.objects
+        .filter(owner=user, character__owner=user)
+        .order_by("id")
+        .values("id", "character_id", "created_at", "last_modified", *EVENT_FIELDS)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for row in rows:
+        yield {"type": "event", "character": row.pop("character_id"), **row}
+
+
+def _scenarios(user) -> Iterator[dict]:
+    rows = (
+        Scenario.objects
+        .filter(owner=user, event__character__owner=user)
+        .order_by("event_id", "id")
+        .values("id", "event_id", "parent_id", *SCENARIO_FIELDS)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for row in rows:
+        yield {"type": "scenario", "event": row.pop("event_id"), "parent": row.pop("parent_id"), **row}
+
+
+def _stories(user) -> Iterator[dict]:
+    rows = (
+        Story.objects
+        .filter(owner=user, character__owner=user)
+        .order_by("id")
+        .values("id", "character_id", "created", "updated", *STORY_FIELDS)
+        .iterator(chunk_size=STORY_CHUNK_SIZE)
+    )
+    for row in rows:
+        yield {"type": "story", "character": row.pop("character_id"), **row}
+
+
+def export_world(user) -> Iterator[str]:
+    """Yield the user's world as NDJSON lines."""
+    yield _line({
+        "type": "header",
+        "version": FORMAT_VERSION,
+        "user": user.username,
+        "exported_at": timezone.now(),
+    })
+    for records in (_characters(user), _events(user), _scenarios(user), _stories(user)):
+        for record in records:
+            yield _line(record)
+
+
+class WorldImporter:
+    """
+    Streams NDJSON records back into the database for `owner`.
+
+    Each record is validated as it is fed, a bad one raises
+    `WorldImportError` naming its position in the stream. Records are
+    buffered per type and written with bulk inserts once a batch fills up
+    or the record type changes. Scenario parents that point forward in the
+    file are linked in a final `bulk_update`.
+    """
+
+    def __init__(self, owner, batch_size: int = IMPORT_BATCH_SIZE):
+        self.owner = owner
+        self.batch_size = batch_size
+        self.characters: dict[int, int] = {}
+        self.events: dict[int, int] = {}
+        self.scenarios: dict[int, int] = {}
+        # new event id -> new character id, for scenario search documents
+        self.event_characters: dict[int, int] = {}
+        self.pending_parents: list[tuple[int, int]] = []
+        self.counts = {"character": 0, "event": 0, "scenario": 0, "story": 0}
+        self._buffer: list[dict] = []
+        self._buffer_type: str | None = None
+        # records fed so far, for error messages
+        self.position = 0
+        self._writers = {
+            "character": self._write_characters,
+            "event": self._write_events,
+            "scenario": self._write_scenarios,
+            "story": self._write_stories,
+        }
+        # Each returns the record with only validated, model-ready values
+        self._cleaners = {
+            "character": self._clean_character,
+            "event": self._clean_event,
+            "scenario": self._clean_scenario,
+            "story": self._clean_story,
+        }
+
+    def feed(self, record: dict) -> None:
+        """Validate one record and buffer it; raises `WorldImportError`."""
+        self.position += 1
+        if not isinstance(record, dict):
+            raise WorldImportError(f"Record {self.position}: expected a JSON object")
+        kind = record.get("type")
+        if kind == "header":
+            if record.get("version") != FORMAT_VERSION:
+                raise WorldImportError(f"Unsupported export version: {record.get('version')!r}")
+            return
+        if kind not in self._writers:
+            raise WorldImportError(f"Record {self.position}: unknown record type: {kind!r}")
+        try:
+            record = self._cleaners[kind](record)
+        except WorldImportError as exc:
+            raise WorldImportError(f"Record {self.position} ({kind}): {exc}") from None
+
+        if kind != self._buffer_type or len(self._buffer) >= self.batch_size:
+            self.flush()
+            self._buffer_type = kind
+        self._buffer.append(record)
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        self._writers[self._buffer_type](self._buffer)
+        self.counts[self._buffer_type] += len(self._buffer)
+        self._buffer = []
+
+    def finish(self) -> dict:
+        self.flush()
+        if self.pending_parents:
+            updates = []
+            for new_id, old_parent in self.pending_parents:
+                parent = self.scenarios.get(old_parent)
+                if parent is not None:
+                    updates.append(Scenario(id=new_id, parent_id=parent))
+            Scenario.objects.bulk_update(updates, ["parent"], batch_size=self.batch_size)
+            self.pending_parents = []
+        # bulk inserts skip post_save, so materialize the tree paths and
+        # drop the owner's cached responses here
+        rebuild_paths(self.events.values())
+        for namespace in ("characters", "events", "stories"):
+            invalidate(namespace, [self.owner.pk])
+        return dict(self.counts)
+
+    @staticmethod
+    def _clean_character(record):
+        identity, location = record.get("basic_identity"), record.get("location")
+        return {
+            "id": _ref(record, "id"),
+            "basic_identity": _clean(BasicIdentity, IDENTITY_FIELDS, identity) if identity else None,
+            "location": _clean(Location, LOCATION_FIELDS, location) if location else None,
+            "timestamps": _timestamps(Meta, META_TIMESTAMPS, record),
+        }
+
+    @staticmethod
+    def _clean_event(record):
+        return {
+            "id": _ref(record, "id"),
+            "character": _ref(record, "character"),
+            "timestamps": _timestamps(Event, EVENT_TIMESTAMPS, record),
+            **_clean(Event, EVENT_FIELDS, record),
+        }
+
+    @staticmethod
+    def _clean_scenario(record):
+        return {
+            "id": _ref(record, "id"),
+            "event": _ref(record, "event"),
+            "parent": _ref(record, "parent", nullable=True),
+            **_clean(Scenario, SCENARIO_FIELDS, record),
+        }
+
+    @staticmethod
+    def _clean_story(record):
+        return {
+            "id": _ref(record, "id"),
+            "character": _ref(record, "character"),
+            "timestamps": _timestamps(Story, STORY_TIMESTAMPS, record),
+            **_clean(Story, STORY_FIELDS, record),
+        }
+
+    def _write_characters(self, records):
+        identities = iter(bulk_insert([
+            BasicIdentity(**r["basic_identity"]) for r in records if r["basic_identity"]
+        ]))
+        locations = iter(bulk_insert([
+            Location(**r["location"]) for r in records if r["location"]
+        ]))
+        metas = bulk_insert([Meta(owner=self.owner) for _ in records])
+        _restore_timestamps(metas, records, META_TIMESTAMPS, self.batch_size)
+
+        created = bulk_insert([
+            Character(
+                basic_identity=next(identities) if r["basic_identity"] else None,
+                location=next(locations) if r["location"] else None,
+                meta=meta,
+                owner=self.owner,
+            )
+            for r, meta in zip(records, metas)
+        ])
+        for record, character in zip(records, created):
+            self.characters[record["id"]] = character.id
+
+    def _write_events(self, records):
+        kept = [r for r in records if r["character"] in self.characters]
+        created = bulk_insert([
+            Event(
+                owner=self.owner,
+                character_id=self.characters[r["character"]],
+                **{f: r[f] for f in EVENT_FIELDS},
+            )
+            for r in kept
+        ])
+        _restore_timestamps(created, kept, EVENT_TIMESTAMPS, self.batch_size)
+        for record, event in zip(kept, created):
+            self.events[record["id"]] = event.id
+            self.event_characters[event.id] = event.character_id
+        # bulk inserts skip post_save, so index explicitly
+        index_documents(
+            SearchDocument("event", e.id, self.owner.id, e.character_id, e.title, e.description)
+            for e in created
+        )
+
+    def _write_scenarios(self, records):
+        kept = [r for r in records if r["event"] in self.events]
+        objs = []
+        for r in kept:
+            parent = self.scenarios.get(r["parent"]) if r["parent"] is not None else None
+            objs.append(Scenario(
+                event_id=self.events[r["event"]],
+                owner=self.owner,
+                parent_id=parent,
+                **{f: r[f] for f in SCENARIO_FIELDS},
+            ))
+        created = bulk_insert(objs)
+        for record, scenario in zip(kept, created):
+            self.scenarios[record["id"]] = scenario.id
+            if record["parent"] is not None and scenario.parent_id is None:
+                self.pending_parents.append((scenario.id, record["parent"]))
+        index_documents(
+            SearchDocument(
+                "scenario", s.id, self.owner.id, self.event_characters.get(s.event_id), s.title, s.description,
+            )
+            for s in created
+        )
+
+    def _write_stories(self, records):
+        kept = [r for r in records if r["character"] in self.characters]
+        created = bulk_insert([
+            Story(
+                owner=self.owner,
+                character_id=self.characters[r["character"]],
+                **{f: r[f] for f in STORY_FIELDS},
+            )
+            for r in kept
+        ])
+        _restore_timestamps(created, kept, STORY_TIMESTAMPS, self.batch_size)
+        index_documents(story_document(s) for s in created)
+
+
+def import_world(owner, lines: Iterable[str | bytes], batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+    """Import NDJSON lines for `owner` in one transaction; returns per-type counts."""
+    importer = WorldImporter(owner, batch_size=batch_size)
+    with transaction.atomic():
+        for number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                raise WorldImportError(f"Line {number}: invalid JSON ({exc})") from exc
+            importer.feed(record)
+        return importer.finish()
@@ -0,0 +1,138 @@
+"""
+Async GET for the read-heavy DRF generic views.
+
+`read_view(SomeDRFView)` returns `SomeDRFView.as_view()` unless
+`settings.ASYNC_READ_VIEWS` is on (the ASGI deployment mode, see
+gunicorn.conf.py). When it is on, `read_view` returns an `AsyncReadView` for
+the same route. That view reuses the DRF view's `get_queryset()`,
+serializer and ETag validators, but evaluates them on the async ORM. A
+worker can then keep many slow clients in flight without a thread per
+request.
+
+Only authenticated, unpaginated GETs take the async path. Anything else
+(writes, anonymous requests, bad tokens, `cursor`/`page_size`, per-view
+`sync_params`) is handed to the regular DRF view on a worker thread, so
+status codes and error bodies stay exactly the same. The async path still
+runs the view's own `check_permissions`, `check_throttles` and
+`check_object_permissions`, and answers a denial with the body DRF's
+exception handler builds for it.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from accounts.auth import CookieJWTAuthentication
+from core.response_cache import CachedResponseMixin, aentry_key, entry_response, is_enabled, make_entry
+
+
+PAGINATION_PARAMS = ("cursor", "page_size")
+
+_authenticator = CookieJWTAuthentication()
+
+
+@sync_to_async
+def _denied(view, request, obj=None):
+    """Run DRF's permission/throttle checks; the error response if one fails."""
+    try:
+        if obj is None:
+            view.check_permissions(request)
+            view.check_throttles(request)
+        else:
+            view.check_object_permissions(request, obj)
+    except APIException as exc:
+        drf_response = view.handle_exception(exc)
+        response = JsonResponse(drf_response.data, status=drf_response.status_code)
+        for header, value in drf_response.items():
+            if header.lower() != "content-type":
+                response[header] = value
+        return response
+    return None
+
+
+class AsyncReadView(View):
+    drf_view = None
+    sync_view = None
+    # Query params that need the sync view (e.g. server-side rendering)
+    sync_params = ()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        drf_view = initkwargs["drf_view"]
+        initkwargs.setdefault("sync_view", drf_view.as_view())
+        # DRF enforces CSRF itself for session auth
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def fallback(self, request, *args, **kwargs):
+        return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+    post = put = patch = delete = options = fallback
+
+    async def get(self, request, *args, **kwargs):
+        if any(param in request.GET for param in (*PAGINATION_PARAMS, *self.sync_params)):
+            return await self.fallback(request, *args, **kwargs)
+        try:
+            auth = await _authenticator.aauthenticate(request)
+        except (InvalidToken, AuthenticationFailed):
+            auth = None
+        if auth is None:
+            return await self.fallback(request, *args, **kwargs)
+
+        drf_request = Request(request)
+        drf_request.user, drf_request.auth = auth
+        view = self.drf_view(request=drf_request, args=args, kwargs=kwargs, format_kwarg=None)
+        denied = await _denied(view, drf_request)
+        if denied is not None:
+            return denied
+
+        cache_key = None
+        if isinstance(view, CachedResponseMixin) and view.response_cache_namespace and is_enabled():
+            cache_key = await aentry_key(view.response_cache_namespace, drf_request.user.pk, request.get_full_path())
+            entry = await cache.aget(cache_key)
+            if entry is not None:
+                return entry_response(request, entry)
+
+        etag = last_modified = None
+        if getattr(view, "etag_timestamp_field", None):
+            etag, last_modified = await view.aget_validators(drf_request, *args, **kwargs)
+            if etag is not None:
+                not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                if not_modified is not None:
+                    return not_modified
+
+        queryset = view.filter_queryset(view.get_queryset())
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        if lookup_url_kwarg in kwargs:
+            obj = await queryset.filter(**{view.lookup_field: kwargs[lookup_url_kwarg]}).afirst()
+            if obj is None:
+                # Let DRF build its usual 404
+                return await self.fallback(request, *args, **kwargs)
+            denied = await _denied(view, drf_request, obj)
+            if denied is not None:
+                return denied
+            data = view.get_serializer(obj).data
+        else:
+            data = view.get_serializer([obj async for obj in queryset], many=True).data
+
+        response = JsonResponse(data, safe=False)
+        if etag is not None:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        if cache_key is not None:
+            await cache.aset(cache_key, make_entry(response), settings.RESPONSE_CACHE_TIMEOUT)
+        return response
+
+
+def read_view(drf_view, **initkwargs):
+    """The URLconf entry for `drf_view`: async GET in ASGI mode, else plain DRF."""
+    if getattr(settings, "ASYNC_READ_VIEWS", False):
+        return AsyncReadView.as_view(drf_view=drf_view, **initkwargs)
+    return drf_view.as_view()
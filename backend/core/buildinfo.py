@@ -0,0 +1,106 @@
+"""
+Build-time facts for the startup banner: git branch/commit and package
+versions. Collecting them takes three `git` subprocesses and a metadata
+scan, so the build writes them once:
+
+    python -m core.buildinfo [--output build_info.json]
+
+On Heroku, `bin/post_compile` (run by the Python buildpack after installing
+the requirements) does this, so the file ships in the slug. Other builds
+(Docker images, ...) should run the same command after `pip install`. The
+file is generated, not committed (it's in .gitignore).
+
+Running processes only read that file (`DJANGO_BUILD_INFO`, default
+`build_info.json` next to manage.py). On Heroku there is no `.git` at build
+time, so the commit comes from `SOURCE_VERSION` instead. Without the file
+the banner shows no versions or commit outside DEV.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_PATH = BASE_DIR / "build_info.json"
+PACKAGES = ("Django", "djangorestframework", "djangorestframework-simplejwt", "gunicorn", "uvicorn")
+
+_loaded: dict | None = None
+
+
+def info_path() -> Path:
+    return Path(os.getenv("DJANGO_BUILD_INFO") or DEFAULT_PATH)
+
+
+def git_info(base_dir) -> str | None:
+    """Return 'branch@shortsha ✓/⚠' if git available; else None."""
+    # Imported here: processes that only `load()` never need them
+    import shutil
+    import subprocess
+
+    if not shutil.which("git"):
+        source_version = os.getenv("SOURCE_VERSION")
+        return source_version[:7] if source_version else None
+    try:
+        commit = subprocess.check_output(
+            ["git", "-C", str(base_dir), "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+        branch = subprocess.check_output(
+            ["git", "-C", str(base_dir), "rev-parse", "--abbrev-ref", "HEAD"],
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+        dirty = subprocess.call(
+            ["git", "-C", str(base_dir), "diff", "--quiet", "--ignore-submodules"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        mark = "⚠" if dirty else "✓"
+        return f"{branch}@{commit} {mark}"
+    except Exception:
+        return None
+
+
+def collect(base_dir=BASE_DIR) -> dict:
+    from datetime import datetime, timezone
+    from importlib import metadata
+    import platform
+
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            pass
+    return {
+        "git": git_info(base_dir),
+        "python": platform.python_version(),
+        "versions": versions,
+        "built": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def write(path=None) -> dict:
+    info = collect()
+    Path(path or info_path()).write_text(json.dumps(info, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return info
+
+
+def load() -> dict:
+    """The build info file's contents, read once per process; {} without one."""
+    global _loaded
+    if _loaded is None:
+        try:
+            _loaded = json.loads(info_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _loaded = {}
+    return _loaded
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=None, help="Defaults to DJANGO_BUILD_INFO or build_info.json.")
+    args = parser.parse_args()
+    print(json.dumps(write(args.output), indent=2, ensure_ascii=False))
@@ -0,0 +1,20 @@
+from django.db import connections, router
+
+
+BULK_BATCH_SIZE = 500
+
+
+def bulk_insert(objs):
+    """
+    `bulk_create` when the backend hands primary keys back (SQLite,
+    PostgreSQL); otherwise (MySQL) save one by one so the FKs can be wired.
+    """
+    if not objs:
+        return objs
+    model = type(objs[0])
+    db = router.db_for_write(model)
+    if connections[db].features.can_return_rows_from_bulk_insert:
+        return model.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+    for obj in objs:
+        obj.save()
+    return objs
@@ -0,0 +1,45 @@
+"""
+`CACHES` from a single URL, the way `DJANGO_DB_URL` configures the database.
+
+    locmem://              per-process memory (default)
+    file:///var/tmp/rp     files under that directory, shared by the workers on one host
+    redis://host:6379/0    Redis or a compatible server (Valkey, KeyDB, ...), shared
+    dummy://               no caching
+
+Throttling, the auth user cache, rendered stories and the per-user response
+cache all go through this cache. Only a shared backend keeps the workers
+in agreement about what has been invalidated.
+"""
+from urllib.parse import urlsplit
+
+
+BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "rediss": "django.core.cache.backends.redis.RedisCache",
+    "dummy": "django.core.cache.backends.dummy.DummyCache",
+}
+SHARED_SCHEMES = {"file", "redis", "rediss"}
+KEY_PREFIX = "rp"
+
+
+def parse_cache_url(url: str | None) -> dict:
+    """One `CACHES` entry for `url`; raises `ValueError` for unknown schemes."""
+    parts = urlsplit(url or "locmem://")
+    if parts.scheme not in BACKENDS:
+        raise ValueError(f"Unsupported cache URL scheme: {parts.scheme!r}")
+
+    config = {"BACKEND": BACKENDS[parts.scheme], "KEY_PREFIX": KEY_PREFIX}
+    if parts.scheme == "file":
+        config["LOCATION"] = parts.path or "/var/tmp/rp-characters-cache"
+    elif parts.scheme in ("redis", "rediss"):
+        config["LOCATION"] = url
+    elif parts.scheme == "locmem":
+        config["LOCATION"] = parts.netloc or "default"
+    return config
+
+
+def is_shared(url: str | None) -> bool:
+    """Whether every worker process sees the same entries."""
+    return urlsplit(url or "locmem://").scheme in SHARED_SCHEMES
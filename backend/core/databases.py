@@ -0,0 +1,83 @@
+"""
+Connection handling for `DATABASES["default"]` and its read replicas.
+
+Without pooling every worker thread keeps its own connection for
+`CONN_MAX_AGE` seconds. With `CONN_HEALTH_CHECKS` a reused connection is
+pinged before a request uses it, so a restarted or failed-over server
+costs one reconnect, not one failed request.
+
+PostgreSQL can use psycopg 3's connection pool instead, through Django's
+native support (`OPTIONS["pool"]`). Connections are then borrowed per
+request and handed back at the end. The pool replaces persistent
+connections (Django requires `CONN_MAX_AGE = 0` with it). MySQL and
+SQLite have no pool, so they keep persistent connections.
+"""
+from __future__ import annotations
+
+import dj_database_url
+
+
+def pool_options(min_size: int, max_size: int, timeout: float) -> dict:
+    """`OPTIONS["pool"]` for psycopg_pool.ConnectionPool."""
+    return {"min_size": min_size, "max_size": max_size, "timeout": timeout}
+
+
+def database_config(url: str, conn_max_age: int = 600, health_checks: bool = True, pool: dict | None = None) -> dict:
+    """
+    One `DATABASES` entry for `url`. `pool` (see `pool_options`) is applied
+    to PostgreSQL only; other engines ignore it.
+    """
+    config = dj_database_url.parse(url, conn_max_age=conn_max_age, conn_health_checks=health_checks)
+    if pool and config["ENGINE"] == "django.db.backends.postgresql":
+        config["CONN_MAX_AGE"] = 0
+        config.setdefault("OPTIONS", {})["pool"] = pool
+    return config
+
+
+def replica_databases(urls, **options) -> dict:
+    """
+    `DATABASES` entries `replica_1`, `replica_2`, ... for `urls` (see
+    core/replicas.py). Tests mirror `default`, they only have one database.
+    """
+    replicas = {}
+    for index, url in enumerate(urls, start=1):
+        config = database_config(url.strip(), **options)
+        config["TEST"] = {"MIRROR": "default"}
+        replicas[f"replica_{index}"] = config
+    return replicas
+
+
+def describe(config: dict) -> str:
+    """Connection handling of a `DATABASES` entry, for the startup banner."""
+    pool = config.get("OPTIONS", {}).get("pool")
+    checks = "health checks" if config.get("CONN_HEALTH_CHECKS") else "no health checks"
+    if pool:
+        pool = pool if isinstance(pool, dict) else {}
+        # psycopg_pool's defaults: min_size 4, max_size = min_size
+        min_size = pool.get("min_size", 4)
+        max_size = pool.get("max_size") or min_size
+        return (
+            f"pool {min_size}-{max_size}, "
+            f"timeout {pool.get('timeout', 30)}s, {checks}"
+        )
+    max_age = config.get("CONN_MAX_AGE", 0)
+    if max_age is None:
+        return f"persistent, {checks}"
+    if max_age:
+        return f"persistent {max_age}s, {checks}"
+    return "per request"
+
+
+def pool_stats(alias: str = "default") -> dict | None:
+    """
+    psycopg_pool counters for `alias` if its pool is open in this process,
+    without creating one.
+    """
+    from django.db import connections
+
+    pools = getattr(type(connections[alias]), "_connection_pools", None) or {}
+    pool = pools.get(alias)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    return {key: stats.get(key, 0) for key in ("pool_min", "pool_max", "pool_size", "pool_available", "requests_waiting")}
@@ -0,0 +1,31 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination: every page is a `WHERE key > position`
+    range scan, so page N costs the same as page 1.
+
+    Views declare their key with `cursor_ordering`; the first column is the
+    cursor position, the rest only break ties.
+
+    Opt-in per request: without `?cursor=` or `?page_size=` the endpoint
+    keeps returning a plain list, so existing clients are unaffected.
+    """
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", None)
+        if ordering is None:
+            return super().get_ordering(request, queryset, view)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
@@ -0,0 +1,197 @@
+"""
+Read replicas for the owner-scoped read endpoints.
+
+`DB_REPLICA_URLS` adds `replica_1`, `replica_2`, ... to `DATABASES` (see
+settings). `ReplicaRouter` sends reads of `REPLICA_APPS` models to them, but
+only inside a safe (GET/HEAD/OPTIONS) request that `ReplicaRoutingMiddleware`
+let through. Everything else reads from `default`: writes, other apps (auth,
+search, ...), management commands, signals, and open transactions.
+
+Each request picks one replica, round-robin, and sends all its reads
+there: replicas lag by different amounts, so a list query, its prefetches
+and the ETag aggregate must see the same snapshot. One that can't be
+connected to is skipped for `DB_REPLICA_RETRY_SECONDS`; with none left,
+reads fall back to the primary. A replica that dies while its connection is open fails the query
+instead; the middleware then marks it down and serves the request again
+from the primary.
+
+Read-your-writes: a request that writes (or isn't safe) gets a short-lived
+`db_pin` cookie, and that client's requests read from the primary until it
+expires (`DB_REPLICA_PIN_SECONDS`), i.e. until the replicas have caught up.
+"""
+from __future__ import annotations
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import itertools
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, InterfaceError, OperationalError, connections
+from django.http import HttpResponse
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = "db_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+REPLICA_APPS = frozenset({"characters", "events", "stories"})
+
+
+@dataclass
+class RoutingState:
+    use_replicas: bool
+    wrote: bool = False
+    # The replica this request reads from, picked on its first read
+    replica: str | None = None
+    # Replicas this request read from, and whether one of them failed
+    used: set[str] = field(default_factory=set)
+    replica_failed: bool = False
+
+
+routing_state: ContextVar[RoutingState | None] = ContextVar("replica_routing_state", default=None)
+
+_counter = itertools.count()
+# alias -> time.monotonic() before which the replica isn't tried again
+_down: dict[str, float] = {}
+
+
+def replica_aliases() -> list[str]:
+    return list(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+def mark_down(alias: str, exc: Exception) -> None:
+    logger.warning("Replica %s unreachable, reading from the primary: %s", alias, exc)
+    _down[alias] = time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+    try:
+        connections[alias].close()
+    except Exception:
+        pass
+
+
+def is_down(alias: str) -> bool:
+    retry_at = _down.get(alias)
+    return retry_at is not None and time.monotonic() < retry_at
+
+
+def is_reachable(alias: str) -> bool:
+    """
+    Connects to `alias` if needed; a failure marks it down for a while. A
+    no-op while the connection is open, a broken open connection is
+    caught by `ReplicaRoutingMiddleware.process_exception`.
+    """
+    if is_down(alias):
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except Exception as exc:
+        mark_down(alias, exc)
+        return False
+    _down.pop(alias, None)
+    return True
+
+
+def pick_replica() -> str | None:
+    """Next reachable replica in round-robin order, or None."""
+    aliases = replica_aliases()
+    if not aliases:
+        return None
+    start = next(_counter)
+    for offset in range(len(aliases)):
+        alias = aliases[(start + offset) % len(aliases)]
+        if is_reachable(alias):
+            return alias
+    return None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = routing_state.get()
+        if (
+            state is None
+            or not state.use_replicas
+            or state.wrote
+            or model._meta.app_label not in REPLICA_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        # Stay on the request's replica unless it has been marked down since
+        if state.replica is None or is_down(state.replica):
+            state.replica = pick_replica()
+            if state.replica is None:
+                return DEFAULT_DB_ALIAS
+            state.used.add(state.replica)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = routing_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary
+        if db in replica_aliases():
+            return False
+        return None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Marks the request for `ReplicaRouter`, serves it again from the primary
+    when a replica fails mid-request, and sets the pin cookie after writes.
+    Dropped at startup without replicas.
+    """
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.pin_seconds = settings.DB_REPLICA_PIN_SECONDS
+
+    def __call__(self, request):
+        safe = request.method in SAFE_METHODS
+        state = RoutingState(use_replicas=safe and PIN_COOKIE not in request.COOKIES)
+        response = self._serve(request, state)
+        if state.replica_failed:
+            # Only safe requests read from replicas, so running it again is fine
+            state = RoutingState(use_replicas=False)
+            response = self._serve(request, state)
+        if (state.wrote or not safe) and self.pin_seconds:
+            response.set_cookie(
+                PIN_COOKIE, "1",
+                max_age=self.pin_seconds,
+                httponly=True,
+                secure=settings.SESSION_COOKIE_SECURE,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
+
+    def _serve(self, request, state):
+        token = routing_state.set(state)
+        try:
+            return self.get_response(request)
+        finally:
+            routing_state.reset(token)
+
+    def process_exception(self, request, exception):
+        # Django turns view exceptions into a 500 before `__call__` sees them
+        state = routing_state.get()
+        if state is None or not isinstance(exception, (OperationalError, InterfaceError)):
+            return None
+        # Django flags the connection whose query or connect failed
+        failed = [alias for alias in state.used if connections[alias].errors_occurred]
+        if not failed:
+            return None
+        for alias in failed:
+            mark_down(alias, exception)
+        state.replica_failed = True
+        # Handled: `__call__` drops this and serves the request again
+        return HttpResponse(status=503)
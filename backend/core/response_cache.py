@@ -0,0 +1,139 @@
+"""
+Per-user caching of rendered GET responses.
+
+Entries are keyed by `(namespace, user, generation, full path)`. Every user
+has one generation token per namespace (`characters`, `events`,
+`stories`). A write signal for a row replaces the token of its owner's
+namespace. All of that user's entries in that namespace then stop being
+addressable and age out, and other users' entries are untouched.
+A hit is served from the cache alone: no queryset, no serializer and no
+validator query. The ETag/Last-Modified stored with the entry still
+answer conditional requests with 304.
+
+`QuerySet.update()` and bulk writes send no signals, so those code paths
+call `invalidate()` themselves.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+
+KEY_PREFIX = "core:resp"
+
+
+def _generation_key(namespace: str, user_id) -> str:
+    return f"{KEY_PREFIX}:gen:{namespace}:{user_id}"
+
+
+def _new_generation() -> str:
+    # Time-based, so a generation evicted from the cache is never reissued
+    return str(time.time_ns())
+
+
+def _entry_key(namespace: str, user_id, generation: str, path: str) -> str:
+    digest = hashlib.md5(path.encode(), usedforsecurity=False).hexdigest()
+    return f"{KEY_PREFIX}:{namespace}:{user_id}:{generation}:{digest}"
+
+
+def _bump(namespace: str, user_ids) -> None:
+    cache.set_many({_generation_key(namespace, uid): _new_generation() for uid in user_ids}, None)
+
+
+def invalidate(namespace: str, user_ids) -> None:
+    """
+    Drop the cached `namespace` responses of `user_ids`. Inside a
+    transaction this happens again on commit, so a read that re-cached the
+    old rows before the commit doesn't survive it.
+    """
+    user_ids = {uid for uid in user_ids if uid is not None}
+    if not user_ids:
+        return
+    _bump(namespace, user_ids)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(namespace, user_ids))
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "RESPONSE_CACHE_ENABLED", False)
+
+
+def entry_key(namespace: str, user_id, path: str) -> str:
+    generation = cache.get(_generation_key(namespace, user_id))
+    if generation is None:
+        cache.add(_generation_key(namespace, user_id), _new_generation(), None)
+        generation = cache.get(_generation_key(namespace, user_id))
+    return _entry_key(namespace, user_id, generation, path)
+
+
+async def aentry_key(namespace: str, user_id, path: str) -> str:
+    generation = await cache.aget(_generation_key(namespace, user_id))
+    if generation is None:
+        await cache.aadd(_generation_key(namespace, user_id), _new_generation(), None)
+        generation = await cache.aget(_generation_key(namespace, user_id))
+    return _entry_key(namespace, user_id, generation, path)
+
+
+def make_entry(response) -> dict:
+    """What is stored for a rendered 200 response."""
+    return {
+        "content": response.content,
+        "content_type": response["Content-Type"],
+        "etag": response.get("ETag"),
+        "last_modified": response.get("Last-Modified"),
+    }
+
+
+def entry_response(request, entry: dict):
+    """The cached response, or a 304 if the client already has it."""
+    if entry["etag"]:
+        not_modified = get_conditional_response(request, etag=entry["etag"])
+        if not_modified is not None:
+            return not_modified
+    response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    if entry["etag"]:
+        response["ETag"] = entry["etag"]
+    if entry["last_modified"]:
+        response["Last-Modified"] = entry["last_modified"]
+    return response
+
+
+class CachedResponseMixin:
+    """
+    Serve authenticated JSON GETs of a DRF view from the response cache.
+    Goes before `ConditionalGetMixin` in the bases, so hits skip its
+    validator query too. Set `response_cache_namespace`.
+    """
+    response_cache_namespace = None
+    _response_cache_key = None
+
+    def get_response_cache_key(self, request):
+        if not (is_enabled() and self.response_cache_namespace and request.user.is_authenticated):
+            return None
+        # The browsable API embeds per-request tokens
+        if request.accepted_renderer.format != "json":
+            return None
+        return entry_key(self.response_cache_namespace, request.user.pk, request.get_full_path())
+
+    def get(self, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        if key is not None:
+            entry = cache.get(key)
+            if entry is not None:
+                return entry_response(request, entry)
+            self._response_cache_key = key
+        return super().get(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self._response_cache_key is not None and response.status_code == 200:
+            response.render()
+            cache.set(self._response_cache_key, make_entry(response), settings.RESPONSE_CACHE_TIMEOUT)
+        return response
+
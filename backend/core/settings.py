@@ -3,7 +3,9 @@ import sys
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import timedelta
-import dj_database_url
+
+from core.caches import is_shared, parse_cache_url
+from core.databases import database_config, pool_options, replica_databases
 
 # ========== INITS ==========
 load_dotenv()
@@ -47,9 +49,13 @@ INSTALLED_APPS = [
     'characters',
     'stories',
     'events',
+    'search',
+    'profiling',
 ]
 
 MIDDLEWARE = [
+    'profiling.middleware.ProfilingMiddleware',
+    'core.replicas.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -84,11 +90,24 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 
 # ========== DATABASE ==========
+# Persistent connections and pre-request pings, see core/databases.py
+DB_CONN_MAX_AGE = int(os.getenv("DJANGO_DB_CONN_MAX_AGE", "600"))
+DB_HEALTH_CHECKS = os.getenv("DJANGO_DB_HEALTH_CHECKS", "true").lower() == "true"
+# PostgreSQL only: psycopg 3 pool instead of persistent connections
+DB_POOL = os.getenv("DJANGO_DB_POOL", "false").lower() == "true"
+DB_POOL_OPTIONS = pool_options(
+    min_size=int(os.getenv("DJANGO_DB_POOL_MIN_SIZE", "2")),
+    max_size=int(os.getenv("DJANGO_DB_POOL_MAX_SIZE", "10")),
+    timeout=float(os.getenv("DJANGO_DB_POOL_TIMEOUT", "30")),
+)
+
 if DB_URL:
     DATABASES = {
-        "default": dj_database_url.parse(
+        "default": database_config(
             DB_URL,
-            conn_max_age=600,
+            conn_max_age=DB_CONN_MAX_AGE,
+            health_checks=DB_HEALTH_CHECKS,
+            pool=DB_POOL_OPTIONS if DB_POOL else None,
         )
     }
 else:
@@ -98,8 +117,52 @@ else:
             "NAME": BASE_DIR / "db.sqlite3",
         }
     }
+
+# Optional read replicas (comma-separated URLs) for the safe GETs of
+# characters, events and stories, see core/replicas.py
+DB_REPLICA_URLS = [url for url in os.getenv("DJANGO_DB_REPLICA_URLS", "").split(",") if url.strip()]
+DB_REPLICAS = replica_databases(
+    DB_REPLICA_URLS,
+    conn_max_age=DB_CONN_MAX_AGE,
+    health_checks=DB_HEALTH_CHECKS,
+    pool=DB_POOL_OPTIONS if DB_POOL else None,
+)
+DATABASES.update(DB_REPLICAS)
+DATABASE_REPLICAS = list(DB_REPLICAS)
+DATABASE_ROUTERS = ["core.replicas.ReplicaRouter"]
+# Seconds a client reads from the primary after a write (read-your-writes)
+DB_REPLICA_PIN_SECONDS = int(os.getenv("DJANGO_DB_REPLICA_PIN_SECONDS", "10"))
+# Seconds an unreachable replica is skipped before it's tried again
+DB_REPLICA_RETRY_SECONDS = float(os.getenv("DJANGO_DB_REPLICA_RETRY_SECONDS", "30"))
 # ==============================
 
+# ========== CACHE ==========
+# locmem:// (default), file:///path or redis://host:6379/0, see core/caches.py
+CACHE_URL = os.getenv("DJANGO_CACHE_URL")
+CACHES = {"default": parse_cache_url(CACHE_URL)}
+# Per-user GET response cache (core/response_cache.py). On by default only
+# with a shared backend, a per-process cache can't see other workers' invalidations.
+RESPONSE_CACHE_ENABLED = os.getenv(
+    "DJANGO_RESPONSE_CACHE", "true" if is_shared(CACHE_URL) else "false"
+).lower() == "true"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("DJANGO_RESPONSE_CACHE_TIMEOUT", "300"))
+# ===========================
+
+# ========== ASYNC ==========
+# Serve read-heavy GETs from async views (core.async_views); gunicorn.conf.py
+# turns this on for the ASGI/uvicorn worker mode
+ASYNC_READ_VIEWS = os.getenv("DJANGO_ASYNC_VIEWS", "false").lower() == "true"
+# ===========================
+
+# ========== PROFILING ==========
+# Fraction of requests to profile (0 disables the middleware entirely)
+PROFILING_SAMPLE_RATE = float(os.getenv("DJANGO_PROFILING_SAMPLE_RATE", "0"))
+PROFILING_BUFFER_SIZE = int(os.getenv("DJANGO_PROFILING_BUFFER_SIZE", "10000"))
+# Per-worker dumps for `manage.py profiling_report`; unset = in-process only
+PROFILING_DUMP_DIR = os.getenv("DJANGO_PROFILING_DUMP_DIR") or None
+PROFILING_DUMP_INTERVAL = float(os.getenv("DJANGO_PROFILING_DUMP_INTERVAL", "30"))
+# ===============================
+
 # ========== AUTH ==========
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -134,6 +197,14 @@ REST_FRAMEWORK = {
     "DATE_FORMAT": "%d.%m.%Y",
 }
 
+# CookieJWTAuthentication caches each user's id, is_active and password
+# fingerprint for AUTH_USER_CACHE_TIMEOUT seconds. On by default only with a
+# shared backend, a per-process cache can't see other workers' invalidations.
+AUTH_USER_CACHE_ENABLED = os.getenv(
+    "DJANGO_AUTH_USER_CACHE", "true" if is_shared(CACHE_URL) else "false"
+).lower() == "true"
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv("DJANGO_AUTH_USER_CACHE_TIMEOUT", "60"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=15),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
@@ -1,23 +1,41 @@
+"""
+Startup banner.
+
+`core.settings` calls `print_startup_banner` on import, i.e. in every
+process that loads Django. What it prints depends on `banner_mode()`:
+
+- full:    the rich panels (runserver, and the gunicorn master via
+           gunicorn.conf.py's `when_ready`)
+- compact: one plain line (management commands, tests)
+- off:     nothing (gunicorn workers)
+
+Only `full` imports `rich`. Git and package versions come from the build
+info file (core/buildinfo.py); without one, only DEV runs `git` live.
+
+`warm_up` primes a fresh gunicorn worker (URL resolver, serializer fields,
+DB connection, JWT backend, markdown renderer, one internal request) before it accepts
+traffic and the worker logs how long that took; see gunicorn.conf.py. The
+banner can't show it: the master prints it before any worker has booted.
+DJANGO_WARMUP=false turns it off.
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 import os
 import sys
 import platform
-import subprocess
-import shutil
+import time
 from typing import Any, Iterable
 
-try:
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.table import Table
-    from rich.columns import Columns
-    from rich.text import Text
-    from rich import box
-except Exception:  # Rich not installed or terminal not supporting it
-    Console = None
+from core import buildinfo
+
+
+BANNER_MODES = ("full", "compact", "off")
+
+
+def warmup_enabled() -> bool:
+    return _coerce_bool(os.getenv("DJANGO_WARMUP"), default=True)
 
 
 # ---------- Environment detection (authoritative; updates settings) ----------
@@ -77,29 +95,6 @@ class BannerColors:
     value: str = "white"
 
 
-def _git_info(base_dir: str) -> str | None:
-    """Return 'branch@shortsha ✓/⚠' if git available; else None."""
-    if not shutil.which("git"):
-        return None
-    try:
-        commit = subprocess.check_output(
-            ["git", "-C", base_dir, "rev-parse", "--short", "HEAD"],
-            stderr=subprocess.DEVNULL,
-        ).decode().strip()
-        branch = subprocess.check_output(
-            ["git", "-C", base_dir, "rev-parse", "--abbrev-ref", "HEAD"],
-            stderr=subprocess.DEVNULL,
-        ).decode().strip()
-        dirty = subprocess.call(
-            ["git", "-C", base_dir, "diff", "--quiet", "--ignore-submodules"],
-            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-        )
-        mark = "⚠" if dirty else "✓"
-        return f"{branch}@{commit} {mark}"
-    except Exception:
-        return None
-
-
 def _mask(v: Any, keep_last: int = 6) -> str:
     s = str(v or "")
     if not s or s.lower() in {"none", "dev-secret"}:
@@ -126,6 +121,19 @@ def _db_name(settings) -> str:
         return "unknown"
 
 
+def _db_connections(settings) -> str:
+    try:
+        from core.databases import describe
+
+        text = describe(settings.DATABASES["default"])
+        replicas = getattr(settings, "DATABASE_REPLICAS", ())
+        if replicas:
+            text += f", {len(replicas)} read replica{'s' if len(replicas) > 1 else ''}"
+        return text
+    except Exception:
+        return "unknown"
+
+
 def _server_kind() -> str:
     argv = " ".join(sys.argv).lower()
     if "uvicorn" in argv:
@@ -137,12 +145,29 @@ def _server_kind() -> str:
     return "unknown"
 
 
-def _safe_import_version(pkg: str) -> str:
-    try:
-        mod = __import__(pkg)
-        return getattr(mod, "__version__", "unknown")
-    except Exception:
-        return "unknown"
+def _django_version() -> str:
+    version = buildinfo.load().get("versions", {}).get("Django")
+    if version:
+        return version
+    import django
+    return django.get_version()
+
+
+def _git(settings) -> str | None:
+    info = buildinfo.load()
+    if "git" in info:
+        return info["git"]
+    # No build info: only pay for the git subprocesses in local development
+    if getattr(settings, "MODE", None) == "DEV":
+        return buildinfo.git_info(getattr(settings, "BASE_DIR", "."))
+    return None
+
+
+def banner_mode() -> str:
+    mode = (os.getenv("DJANGO_STARTUP_BANNER") or "").lower()
+    if mode in BANNER_MODES:
+        return mode
+    return "full" if _server_kind() != "unknown" else "compact"
 
 
 def _color_from_settings_mode(settings) -> str:
@@ -161,24 +186,42 @@ def _color_from_settings_mode(settings) -> str:
     return "green"
 
 
-def print_startup_banner(settings) -> None:
-    """Pretty startup banner. Safe to call multiple times (prints once)."""
-    if getattr(print_startup_banner, "_printed", False):
-        return
-    setattr(print_startup_banner, "_printed", True)
+def _print_compact(settings) -> None:
+    ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    print(
+        f"[{ts}] {getattr(settings, 'PROJECT_NAME', 'Project')} "
+        f"starting in {getattr(settings, 'MODE', 'DEV')} "
+        f"(debug={getattr(settings, 'DEBUG', False)})",
+        file=sys.stderr,
+    )
+
 
+def print_startup_banner(settings, mode: str | None = None) -> None:
+    """
+    Startup banner in `mode` (default `banner_mode()`). Safe to call
+    multiple times (prints once).
+    """
     # Ensure MODE/DEBUG/color exist (may override defaults from settings)
     _apply_env_detection(settings)
 
-    # If Rich is unavailable, print a compact fallback and exit.
-    if Console is None:
-        ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(
-            f"[{ts}] {getattr(settings, 'PROJECT_NAME', 'Project')} "
-            f"starting in {getattr(settings, 'MODE', 'DEV')} "
-            f"(debug={getattr(settings, 'DEBUG', False)})",
-            file=sys.stderr,
-        )
+    mode = mode or banner_mode()
+    if mode == "off" or getattr(print_startup_banner, "_printed", False):
+        return
+    setattr(print_startup_banner, "_printed", True)
+
+    if mode == "compact":
+        _print_compact(settings)
+        return
+
+    try:
+        from rich.console import Console
+        from rich.panel import Panel
+        from rich.table import Table
+        from rich.columns import Columns
+        from rich.text import Text
+        from rich import box
+    except Exception:  # Rich not installed or terminal not supporting it
+        _print_compact(settings)
         return
 
     console = Console()
@@ -200,11 +243,11 @@ def print_startup_banner(settings) -> None:
     default_auto = getattr(settings, "DEFAULT_AUTO_FIELD", "—")
     apps_count = len(getattr(settings, "INSTALLED_APPS", []))
     middleware_count = len(getattr(settings, "MIDDLEWARE", []))
-    dj_version = _safe_import_version("django")
+    dj_version = _django_version()
     py_version = platform.python_version()
     os_name = f"{platform.system()} {platform.release()}"
     proc_id = os.getpid()
-    git = _git_info(base_dir)
+    git = _git(settings)
     port = os.environ.get("PORT") or os.environ.get("DJANGO_PORT") or "8000"
     server = _server_kind()
     color = _color_from_settings_mode(settings)
@@ -238,6 +281,7 @@ def print_startup_banner(settings) -> None:
     p_store.add_column(style="bold white", justify="right", no_wrap=True)
     p_store.add_column(style="white")
     p_store.add_row("Database", dj_db)
+    p_store.add_row("Connections", _db_connections(settings))
     p_store.add_row("Secret", f"[dim]{secret}[/]")
     p_store.add_row("Static URL", static_url or "—")
     p_store.add_row("Static Root", str(static_root) if static_root else "—")
@@ -273,4 +317,166 @@ def print_startup_banner(settings) -> None:
         )
     )
     console.print(Panel(p_sys, title="System", box=box.MINIMAL, border_style=color))
-    console.rule(characters="=", style=color)
\ No newline at end of file
+    console.rule(characters="=", style=color)
+
+# ---------- Warm-up (gunicorn post_worker_init) ----------
+WARMUP_SERIALIZERS = (
+    "characters.serializers.CharacterUploadSerializer",
+    "events.serializers.EventSerializer",
+    "events.serializers.ScenarioSerializer",
+    "stories.serializers.StorySerializer",
+)
+# Anonymous GET through the full middleware/auth/renderer stack (a 401)
+WARMUP_URL_NAME = "character-list-create"
+
+
+@dataclass
+class WarmupReport:
+    seconds: float = 0.0
+    steps: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def _warm_urls():
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    # Compiles every pattern's regex and imports every view module
+    resolver.reverse_dict
+    for prefix in ("/api/characters/", "/api/events/characters/1/", "/api/stories/1/"):
+        resolver.resolve(prefix)
+
+
+def _touch_fields(serializer):
+    # `fields` is built lazily, nested serializers included
+    for nested in serializer.fields.values():
+        nested = getattr(nested, "child", nested)
+        if hasattr(nested, "fields"):
+            _touch_fields(nested)
+
+
+def _warm_serializers():
+    from django.utils.module_loading import import_string
+
+    for path in WARMUP_SERIALIZERS:
+        _touch_fields(import_string(path)())
+
+
+def _warm_database():
+    from django.db import connections
+    from core.replicas import is_reachable, replica_aliases
+
+    replicas = replica_aliases()
+    for conn in connections.all():
+        if conn.alias in replicas and not is_reachable(conn.alias):
+            # Marked down: reads fall back to the primary until it's back
+            continue
+        conn.ensure_connection()
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if conn.settings_dict.get("OPTIONS", {}).get("pool"):
+            # Hand the connection back and let the pool fill to min_size
+            conn.close()
+            conn.pool.wait()
+
+
+def _warm_jwt():
+    from rest_framework_simplejwt.tokens import AccessToken
+    from accounts.auth import _authenticator
+
+    # Loads the signing key and PyJWT algorithms on both sides
+    _authenticator.get_validated_token(str(AccessToken()).encode())
+
+
+def _warm_markdown():
+    from stories.rendering import render_markdown
+
+    # Compiles the extensions' patterns (per thread; sync workers serve on this one)
+    render_markdown("# Warm-up\n\n- item")
+
+
+def _warm_request(wsgi_app):
+    from io import BytesIO
+    import logging
+    from django.urls import reverse
+
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": reverse(WARMUP_URL_NAME),
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "HTTP_HOST": "localhost",
+        "HTTP_ACCEPT": "application/json",
+        "wsgi.input": BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "http",
+    }
+    # The expected 401 isn't worth a "django.request" warning
+    logger = logging.getLogger("django.request")
+    level = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        response = wsgi_app(environ, lambda status, headers, exc_info=None: None)
+        for _ in response:
+            pass
+        if hasattr(response, "close"):
+            response.close()
+    finally:
+        logger.setLevel(level)
+
+
+def warm_up(wsgi_app=None) -> WarmupReport:
+    """
+    Prime what the first request of a fresh worker would otherwise pay
+    for. `wsgi_app` (a WSGI callable) also gets one internal request.
+    Failures are recorded, never raised: a cold worker still serves.
+    """
+    steps = [
+        ("urls", _warm_urls),
+        ("serializers", _warm_serializers),
+        ("database", _warm_database),
+        ("jwt", _warm_jwt),
+        ("markdown", _warm_markdown),
+    ]
+    if wsgi_app is not None:
+        steps.append(("request", lambda: _warm_request(wsgi_app)))
+
+    report = WarmupReport()
+    started = time.perf_counter()
+    for name, step in steps:
+        t0 = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:
+            report.errors[name] = f"{type(exc).__name__}: {exc}"
+        report.steps[name] = time.perf_counter() - t0
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _pool_stats() -> dict | None:
+    try:
+        from core.databases import pool_stats
+
+        return pool_stats()
+    except Exception:
+        return None
+
+
+def warmup_line(settings, report: WarmupReport) -> str:
+    """One line per worker, logged from gunicorn's `post_worker_init`."""
+    steps = ", ".join(f"{name} {seconds * 1000:.1f}" for name, seconds in report.steps.items())
+    line = (
+        f"{getattr(settings, 'PROJECT_NAME', 'Project')} worker {os.getpid()} "
+        f"warmed up in {report.seconds * 1000:.1f} ms ({steps})"
+    )
+    stats = _pool_stats()
+    if stats:
+        line += (
+            f" pool {stats['pool_size']}/{stats['pool_max']} open,"
+            f" {stats['pool_available']} idle, {stats['requests_waiting']} waiting"
+        )
+    if report.errors:
+        line += " errors: " + "; ".join(f"{k}: {v}" for k, v in report.errors.items())
+    return line
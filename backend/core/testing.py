@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for query-count budgets.
+
+        with self.assertQueryBudget(2):
+            self.client.get(url)
+
+    Unlike `assertNumQueries` the budget is an upper bound, and a failure
+    lists every captured statement.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, budget, using=DEFAULT_DB_ALIAS):
+        with CaptureQueriesContext(connections[using]) as ctx:
+            yield ctx
+        executed = len(ctx.captured_queries)
+        if executed > budget:
+            statements = "\n".join(
+                f"{i}. {q['sql']}" for i, q in enumerate(ctx.captured_queries, start=1)
+            )
+            self.fail(f"{executed} queries executed, budget is {budget}:\n{statements}")
+
+    def count_queries(self, func, *args, using=DEFAULT_DB_ALIAS, **kwargs):
+        """Run `func` and return `(query_count, result)`."""
+        with CaptureQueriesContext(connections[using]) as ctx:
+            result = func(*args, **kwargs)
+        return len(ctx.captured_queries), result
+
+
+class QueryPlanMixin:
+    """
+    TestCase mixin that EXPLAINs a queryset and fails on full table scans.
+
+        self.assertNoFullScan(Event.objects.filter(owner=user, character_id=1))
+
+    Test tables hold a handful of rows, so PostgreSQL would pick sequential
+    scans regardless; `enable_seqscan` is off while explaining, and a Seq
+    Scan that's left means no index serves the query. SQLite plans a full
+    scan as `SCAN <table>`. Other backends skip the test.
+    """
+
+    FULL_SCAN = {
+        "postgresql": re.compile(r"Seq Scan on (\w+)"),
+        "sqlite": re.compile(r"\bSCAN (\w+)(?! CONSTANT)"),
+    }
+
+    def explain(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return queryset.explain()
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+            try:
+                return queryset.explain()
+            finally:
+                cursor.execute("RESET enable_seqscan")
+
+    def assertNoFullScan(self, queryset):
+        pattern = self.FULL_SCAN.get(connections[queryset.db].vendor)
+        if pattern is None:
+            self.skipTest(f"no plan check for {connections[queryset.db].vendor}")
+        plan = self.explain(queryset)
+        scanned = pattern.findall(plan)
+        if scanned:
+            self.fail(f"full scan of {', '.join(scanned)}:\n{plan}\n\n{queryset.query}")
+        return plan
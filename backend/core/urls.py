@@ -10,4 +10,6 @@ urlpatterns = [
     path("api/characters/", include("characters.urls")),
     path("api/stories/", include('stories.urls')),
     path("api/events/", include("events.urls")),
+    path("api/search/", include("search.urls")),
+    path("api/profiling/", include("profiling.urls")),
 ]
@@ -0,0 +1,223 @@
+"""
+Server-side scenario-tree engine.
+
+An Event's Scenario rows are compiled once into flat, index-addressed arrays
+(CSR layout: every node owns a contiguous slice of "child slots"), and every
+slice carries a Walker alias table. Picking a weighted child is then O(1):
+one uniform draw selects a slot, a second one decides between the slot's
+own child and its alias.
+
+A virtual root (index ``tree.root``) owns the scenarios without a parent, so
+the walk from the event into the tree uses the exact same code path.
+
+``ScenarioTree.for_event`` keeps compiled trees in a per-process LRU keyed
+by ``(event id, last_modified)``; every scenario write touches the event's
+``last_modified``, so an edited tree is simply compiled again.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import random
+from typing import Iterable, Sequence
+
+from core.lru import LRUCache
+from .models import Event, Scenario
+
+
+SCENARIO_TREE_FIELDS = ("id", "parent_id", "weight", "is_terminal")
+TREE_CACHE_SIZE = 256
+
+_trees = LRUCache(TREE_CACHE_SIZE)
+
+
+def build_alias_table(weights: Sequence[int]) -> tuple[list[float], list[int]]:
+    """
+    Vose's alias method. Returns (prob, alias) for the given weights, both
+    indexed relative to the start of the slice.
+    """
+    n = len(weights)
+    if n == 0:
+        return [], []
+
+    total = float(sum(weights))
+    if total <= 0:
+        # Degenerate siblings (all weight 0): fall back to a uniform pick.
+        return [1.0] * n, list(range(n))
+
+    scaled = [w * n / total for w in weights]
+    prob = [0.0] * n
+    alias = list(range(n))
+
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+    while small and large:
+        s = small.pop()
+        l = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = (scaled[l] + scaled[s]) - 1.0
+        (small if scaled[l] < 1.0 else large).append(l)
+
+    # Whatever is left is 1.0 up to floating point error.
+    for i in large:
+        prob[i] = 1.0
+    for i in small:
+        prob[i] = 1.0
+
+    return prob, alias
+
+
+@dataclass
+class ScenarioTree:
+    """
+    Flat, array-backed representation of an Event's scenario tree.
+
+    Nodes ``0 .. n-1`` are scenarios (in ``ids`` order), node ``n`` is the
+    virtual root. For node ``k`` its children live in the slot range
+    ``child_start[k] : child_start[k] + child_count[k]`` of ``child_node``,
+    ``child_weight``, ``alias_prob`` and ``alias_slot``.
+    """
+    ids: list[int]
+    is_terminal: list[bool]
+    child_start: list[int]
+    child_count: list[int]
+    child_node: list[int]
+    child_weight: list[int]
+    alias_prob: list[float]
+    alias_slot: list[int]
+    index: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def root(self) -> int:
+        return len(self.ids)
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, int | None, int, bool]]) -> "ScenarioTree":
+        """
+        Compile ``(id, parent_id, weight, is_terminal)`` rows into a tree.
+        Parents that are not part of the same row set are treated as roots.
+        """
+        rows = sorted(rows, key=lambda r: r[0])
+        ids = [r[0] for r in rows]
+        index = {pk: i for i, pk in enumerate(ids)}
+        n = len(ids)
+        root = n
+
+        buckets: list[list[int]] = [[] for _ in range(n + 1)]
+        for i, (_, parent_id, _, _) in enumerate(rows):
+            parent = index.get(parent_id, root) if parent_id is not None else root
+            buckets[parent].append(i)
+
+        child_start: list[int] = []
+        child_count: list[int] = []
+        child_node: list[int] = []
+        child_weight: list[int] = []
+        alias_prob: list[float] = []
+        alias_slot: list[int] = []
+
+        for children in buckets:
+            start = len(child_node)
+            weights = [rows[c][2] for c in children]
+            prob, alias = build_alias_table(weights)
+            child_start.append(start)
+            child_count.append(len(children))
+            child_node.extend(children)
+            child_weight.extend(weights)
+            alias_prob.extend(prob)
+            alias_slot.extend(start + a for a in alias)
+
+        return cls(
+            ids=ids,
+            is_terminal=[bool(r[3]) for r in rows],
+            child_start=child_start,
+            child_count=child_count,
+            child_node=child_node,
+            child_weight=child_weight,
+            alias_prob=alias_prob,
+            alias_slot=alias_slot,
+            index=index,
+        )
+
+    @classmethod
+    def from_event(cls, event: Event) -> "ScenarioTree":
+        rows = Scenario.objects.filter(event=event).values_list(*SCENARIO_TREE_FIELDS)
+        return cls.from_rows(rows)
+
+    @classmethod
+    def for_event(cls, event: Event) -> "ScenarioTree":
+        """The compiled tree of ``event``, compiled once per ``last_modified``."""
+        key = (event.pk, event.last_modified)
+        tree = _trees.get(key)
+        if tree is None:
+            tree = cls.from_event(event)
+            _trees.set(key, tree)
+        return tree
+
+    def pick_child(self, node: int, rng: random.Random) -> int | None:
+        """O(1) weighted pick among the children of ``node``."""
+        count = self.child_count[node]
+        if not count:
+            return None
+        slot = self.child_start[node] + int(rng.random() * count)
+        if rng.random() >= self.alias_prob[slot]:
+            slot = self.alias_slot[slot]
+        return self.child_node[slot]
+
+    def walk(self, rng: random.Random) -> list[int]:
+        """
+        Walk from the virtual root until a terminal scenario or a leaf is
+        reached. Returns node indices. The walk is bounded by the number of
+        nodes, so a malformed (cyclic) tree cannot hang the worker.
+        """
+        path: list[int] = []
+        node = self.pick_child(self.root, rng)
+        while node is not None and len(path) < self.size:
+            path.append(node)
+            if self.is_terminal[node]:
+                break
+            node = self.pick_child(node, rng)
+        return path
+
+
+@dataclass
+class PlayResult:
+    triggered: bool
+    roll: float
+    chance: int
+    reason: str
+    path: list[int]
+
+
+def play_event(event: Event, tree: ScenarioTree | None = None, rng: random.Random | None = None) -> PlayResult:
+    """
+    Roll the event's trigger chance and, on success, walk the scenario tree.
+    Mirrors the semantics of the play page: ``roll`` is uniform in [0, 100)
+    and the event triggers when ``roll < chance_to_trigger``.
+    """
+    rng = rng or random.Random()
+    chance = event.chance_to_trigger
+    roll = rng.random() * 100
+
+    if roll >= chance:
+        return PlayResult(
+            triggered=False,
+            roll=roll,
+            chance=chance,
+            reason=f"Event did not trigger (rolled {roll:.1f} vs chance {chance}%).",
+            path=[],
+        )
+
+    tree = tree if tree is not None else ScenarioTree.for_event(event)
+    path = [tree.ids[i] for i in tree.walk(rng)]
+
+    if not path:
+        reason = "Event triggered, but there are no root scenarios configured."
+    else:
+        reason = "Event triggered successfully."
+
+    return PlayResult(triggered=True, roll=roll, chance=chance, reason=reason, path=path)
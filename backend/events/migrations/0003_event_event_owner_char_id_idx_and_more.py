@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('characters', '0003_meta_meta_owner_modified_idx'),
+        ('events', '0002_event_character_event_created_at_event_last_modified_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['owner', 'character', 'id'], name='event_owner_char_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scenario',
+            index=models.Index(fields=['event', 'id'], name='scenario_event_id_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:59
+
+from django.db import migrations, models
+from django.db.models import CharField, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Cast, Concat
+
+
+def populate_paths(apps, schema_editor):
+    # A frozen copy of the backfill, independent of events.tree: roots
+    # first, then one UPDATE per level. Rows in a parent cycle keep "".
+    Scenario = apps.get_model("events", "Scenario")
+    Scenario.objects.filter(parent__isnull=True).update(
+        path=Concat(Value("/"), Cast("id", CharField()), Value("/"), output_field=TextField()),
+        depth=0,
+    )
+    parent_path = Subquery(Scenario.objects.filter(pk=OuterRef("parent_id")).values("path")[:1])
+    depth = 0
+    while True:
+        depth += 1
+        updated = (
+            Scenario.objects.filter(path="", parent__isnull=False)
+            .exclude(parent__path="")
+            .update(
+                path=Concat(parent_path, Cast("id", CharField()), Value("/"), output_field=TextField()),
+                depth=depth,
+            )
+        )
+        if not updated:
+            return
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_event_owner_char_id_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scenario',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='Roots are 0.'),
+        ),
+        migrations.AddField(
+            model_name='scenario',
+            name='path',
+            field=models.TextField(blank=True, default='', editable=False, help_text='Ids from the root down to this scenario, e.g. /3/17/42/.'),
+        ),
+        migrations.RunPython(populate_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_owner(apps, schema_editor):
+    Scenario = apps.get_model("events", "Scenario")
+    Event = apps.get_model("events", "Event")
+    Scenario.objects.update(
+        owner=Subquery(Event.objects.filter(pk=OuterRef("event_id")).values("owner_id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_scenario_path'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scenario',
+            name='owner',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scenarios', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='scenario',
+            index=models.Index(fields=['owner', 'event', 'id'], name='scenario_owner_event_id_idx'),
+        ),
+        migrations.RunPython(populate_owner, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def create_path_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        # Serves `path LIKE '<prefix>%'` whatever the collation
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS scenario_path_idx ON events_scenario (path text_pattern_ops)"
+        )
+
+
+def drop_path_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS scenario_path_idx")
+
+
+class Migration(migrations.Migration):
+    """
+    PostgreSQL-only prefix index on `Scenario.path`. MySQL can't index a
+    TEXT column without a prefix length, and SQLite's LIKE wouldn't use it.
+    """
+
+    dependencies = [
+        ('events', '0005_scenario_owner_scenario_scenario_owner_event_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_path_index, drop_path_index),
+    ]
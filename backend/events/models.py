@@ -13,6 +13,12 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     last_modified = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Event list keyset: owner + character filter, cursor on id
+            models.Index(fields=["owner", "character", "id"], name="event_owner_char_id_idx"),
+        ]
+
     def __str__(self):
         return self.title
     
@@ -23,6 +29,21 @@ class Scenario(models.Model):
     description = models.TextField()
     weight = models.PositiveIntegerField(validators=[MinValueValidator(1)], help_text="Relative chance among siblings. Higher = more likely.")
     is_terminal = models.BooleanField(default=False, help_text="If true, branch stops here.")
+    # Materialized tree position, maintained by events.tree. Indexed for
+    # `LIKE '<prefix>%'` on PostgreSQL only, by migration 0006.
+    path = models.TextField(blank=True, default="", editable=False, help_text="Ids from the root down to this scenario, e.g. /3/17/42/.")
+    depth = models.PositiveSmallIntegerField(default=0, editable=False, help_text="Roots are 0.")
+    # Copy of event.owner (events.signals keeps it), so ownership filters
+    # don't join Event. Indexed through scenario_owner_event_id_idx.
+    owner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, editable=False, db_index=False, related_name="scenarios")
+
+    class Meta:
+        indexes = [
+            # Scenario list keyset: event filter, cursor on id
+            models.Index(fields=["event", "id"], name="scenario_event_id_idx"),
+            # Ownership-scoped lists, detail checks and the export's (event, id) order
+            models.Index(fields=["owner", "event", "id"], name="scenario_owner_event_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.event.title} → {self.title}"
\ No newline at end of file
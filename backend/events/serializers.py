@@ -1,5 +1,37 @@
+from collections import defaultdict
+
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import serializers
 from .models import Event, Scenario
+from .simulation import MAX_RUNS
+from .tree import parent_error
+from .upsert import flatten_tree
+
+
+# Events from `event_tree_queryset` come with their scenarios in `scenario_list`
+SCENARIOS_PREFETCH = Prefetch("scenarios", queryset=Scenario.objects.order_by("id"), to_attr="scenario_list")
+
+
+def prefetch_scenario_tree(events):
+    """
+    Give every event a `scenario_list` and each of its scenarios a
+    `child_list`, what `EventSerializer` reads. Events without one get
+    their scenarios in one query; children are assembled in memory from
+    `parent_id`.
+    """
+    events = list(events)
+    missing = [e for e in events if not hasattr(e, "scenario_list")]
+    if missing:
+        prefetch_related_objects(missing, SCENARIOS_PREFETCH)
+
+    for event in events:
+        by_parent = defaultdict(list)
+        for scenario in event.scenario_list:
+            by_parent[scenario.parent_id].append(scenario)
+        for scenario in event.scenario_list:
+            if not hasattr(scenario, "child_list"):
+                scenario.child_list = by_parent[scenario.id]
+    return events
 
 
 class ChildScenarioSerializer(serializers.ModelSerializer):
@@ -9,7 +41,8 @@ class ChildScenarioSerializer(serializers.ModelSerializer):
 
 
 class ScenarioSerializer(serializers.ModelSerializer):
-    children = ChildScenarioSerializer(many=True, read_only=True)
+    # Filled by prefetch_scenario_tree or a `to_attr` Prefetch, else read here
+    children = ChildScenarioSerializer(source="child_list", many=True, read_only=True)
 
     class Meta:
         model = Scenario
@@ -27,9 +60,25 @@ class ScenarioSerializer(serializers.ModelSerializer):
             "event": {"read_only": True},
         }
 
+    def to_representation(self, instance):
+        if not hasattr(instance, "child_list"):
+            instance.child_list = list(instance.children.all())
+        return super().to_representation(instance)
+
+    def validate(self, attrs):
+        if "parent" in attrs:
+            if self.instance is not None:
+                pk, event_id = self.instance.pk, self.instance.event_id
+            else:
+                pk, event_id = None, self.context.get("event_id")
+            error = parent_error(pk, event_id, attrs["parent"])
+            if error:
+                raise serializers.ValidationError({"parent": error})
+        return attrs
+
 
 class EventSerializer(serializers.ModelSerializer):
-    scenarios = ScenarioSerializer(many=True, read_only=True)
+    scenarios = ScenarioSerializer(source="scenario_list", many=True, read_only=True)
     owner = serializers.ReadOnlyField(source="owner.username")
     character = serializers.PrimaryKeyRelatedField(read_only=True)
 
@@ -51,4 +100,156 @@ class EventSerializer(serializers.ModelSerializer):
             "character",
             "created_at",
             "last_modified",
-        ]
\ No newline at end of file
+        ]
+
+    def to_representation(self, instance):
+        prefetch_scenario_tree([instance])
+        return super().to_representation(instance)
+
+
+class PlayStepSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Scenario
+        fields = ["id", "parent", "title", "description", "weight", "is_terminal"]
+        read_only_fields = fields
+
+
+class PlayResultSerializer(serializers.Serializer):
+    triggered = serializers.BooleanField(read_only=True)
+    roll = serializers.FloatField(read_only=True)
+    chance = serializers.IntegerField(read_only=True)
+    reason = serializers.CharField(read_only=True)
+    steps = PlayStepSerializer(many=True, read_only=True)
+
+
+class SimulationQuerySerializer(serializers.Serializer):
+    runs = serializers.IntegerField(min_value=1, max_value=MAX_RUNS, default=100_000)
+    seed = serializers.IntegerField(min_value=0, required=False)
+
+
+class ParentRefField(serializers.Field):
+    """An existing scenario id, a `tmp_id` from the same request, or null (root)."""
+    default_error_messages = {"invalid": "Expected a scenario id, a tmp_id string or null."}
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("allow_null", True)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool) or not isinstance(data, (int, str)) or data == "":
+            self.fail("invalid")
+        return data
+
+    def to_representation(self, value):
+        return value
+
+
+class ScenarioCreateSerializer(serializers.Serializer):
+    tmp_id = serializers.CharField(max_length=64)
+    parent = ParentRefField(required=False, default=None)
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField(allow_blank=True, default="")
+    weight = serializers.IntegerField(min_value=1)
+    is_terminal = serializers.BooleanField(default=False)
+
+
+class ScenarioUpdateSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    parent = ParentRefField(required=False)
+    title = serializers.CharField(max_length=255, required=False)
+    description = serializers.CharField(allow_blank=True, required=False)
+    weight = serializers.IntegerField(min_value=1, required=False)
+    is_terminal = serializers.BooleanField(required=False)
+
+
+class ScenarioNodeSerializer(serializers.Serializer):
+    """One node of a nested tree; `id` updates that scenario, otherwise it's created."""
+    id = serializers.IntegerField(required=False)
+    tmp_id = serializers.CharField(max_length=64, required=False)
+    title = serializers.CharField(max_length=255, required=False)
+    description = serializers.CharField(allow_blank=True, required=False)
+    weight = serializers.IntegerField(min_value=1, required=False)
+    is_terminal = serializers.BooleanField(required=False)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields["children"] = ScenarioNodeSerializer(many=True, required=False)
+        return fields
+
+    def validate(self, attrs):
+        if "id" not in attrs:
+            missing = {f: ["This field is required."] for f in ("title", "weight") if f not in attrs}
+            if missing:
+                raise serializers.ValidationError(missing)
+            attrs.setdefault("description", "")
+            attrs.setdefault("is_terminal", False)
+        return attrs
+
+
+class ScenarioTreeUpsertSerializer(serializers.Serializer):
+    """
+    Either a nested `tree` (with `replace`, scenarios left out are deleted)
+    or a `create` / `update` / `delete` diff. Validates to the flat diff form.
+    """
+    max_items = 2000
+
+    tree = ScenarioNodeSerializer(many=True, required=False)
+    replace = serializers.BooleanField(default=False)
+    create = ScenarioCreateSerializer(many=True, required=False)
+    update = ScenarioUpdateSerializer(many=True, required=False)
+    delete = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate(self, attrs):
+        is_diff = any(key in attrs for key in ("create", "update", "delete"))
+        if ("tree" in attrs) == is_diff:
+            raise serializers.ValidationError("Send either `tree` or `create` / `update` / `delete`.")
+        if attrs["replace"] and is_diff:
+            raise serializers.ValidationError({"replace": ["Only valid with `tree`."]})
+
+        if "tree" in attrs:
+            creates, updates = flatten_tree(attrs["tree"])
+            deletes = []
+        else:
+            creates, updates, deletes = attrs.get("create", []), attrs.get("update", []), attrs.get("delete", [])
+
+        if len(creates) + len(updates) + len(deletes) > self.max_items:
+            raise serializers.ValidationError(f"At most {self.max_items} scenarios per request.")
+        return {"create": creates, "update": updates, "delete": deletes, "replace": attrs["replace"]}
+
+
+class TreeQuerySerializer(serializers.Serializer):
+    root = serializers.IntegerField(min_value=1, required=False)
+
+
+class ZeroWeightGroupSerializer(serializers.Serializer):
+    parent = serializers.IntegerField(read_only=True, allow_null=True)
+    scenarios = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+    all_zero = serializers.BooleanField(read_only=True)
+
+
+class TreeReportSerializer(serializers.Serializer):
+    valid = serializers.BooleanField(read_only=True)
+    scenarios = serializers.IntegerField(read_only=True)
+    orphans = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+    cycles = serializers.ListField(child=serializers.ListField(child=serializers.IntegerField()), read_only=True)
+    zero_weight = ZeroWeightGroupSerializer(many=True, read_only=True)
+    non_terminal_leaves = serializers.ListField(child=serializers.IntegerField(), read_only=True)
+
+
+class OutcomeSerializer(serializers.Serializer):
+    scenario = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    exact = serializers.FloatField(read_only=True)
+    sampled = serializers.FloatField(read_only=True)
+
+
+class OutcomeDistributionSerializer(serializers.Serializer):
+    runs = serializers.IntegerField(read_only=True)
+    chance = serializers.IntegerField(read_only=True)
+    trigger_rate = serializers.FloatField(read_only=True)
+    exact_trigger_rate = serializers.FloatField(read_only=True)
+    expected_depth = serializers.FloatField(read_only=True)
+    exact_expected_depth = serializers.FloatField(read_only=True)
+    empty_rate = serializers.FloatField(read_only=True)
+    exact_empty_rate = serializers.FloatField(read_only=True)
+    outcomes = OutcomeSerializer(many=True, read_only=True)
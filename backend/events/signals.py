@@ -0,0 +1,87 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.response_cache import invalidate
+from .models import Event, Scenario
+from .tree import sync_path
+
+
+# Event ids collected by an enclosing `batched_touches()`
+_pending_touches: ContextVar[set | None] = ContextVar("events_pending_touches", default=None)
+
+
+def touch_events(event_ids):
+    """
+    Scenarios are served nested inside their event, so any scenario change
+    must move `Event.last_modified` (the event's ETag / Last-Modified) and
+    drop the owners' cached event responses.
+    """
+    pending = _pending_touches.get()
+    if pending is not None:
+        pending.update(event_ids)
+        return
+    events = Event.objects.filter(pk__in=set(event_ids))
+    invalidate("events", events.values_list("owner_id", flat=True).distinct())
+    events.update(last_modified=timezone.now())
+
+
+@contextmanager
+def batched_touches():
+    """
+    Defer the `touch_events` calls made in the block (e.g. one per scenario
+    by `post_delete` on a queryset delete) and touch their events once at
+    the end. Nested blocks flush with the outermost one.
+    """
+    if _pending_touches.get() is not None:
+        yield
+        return
+    event_ids = set()
+    token = _pending_touches.set(event_ids)
+    try:
+        yield
+    finally:
+        _pending_touches.reset(token)
+    if event_ids:
+        touch_events(event_ids)
+
+
+@receiver(post_save, sender=Event, dispatch_uid="events_uncache_on_save")
+@receiver(post_delete, sender=Event, dispatch_uid="events_uncache_on_delete")
+def uncache_event(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate("events", [instance.owner_id])
+
+
+# `owner` mirrors event.owner; bulk inserts set it themselves
+@receiver(pre_save, sender=Scenario, dispatch_uid="events_copy_scenario_owner")
+def copy_scenario_owner(sender, instance, raw=False, **kwargs):
+    if raw or instance.owner_id is not None or instance.event_id is None:
+        return
+    if Scenario.event.is_cached(instance):
+        instance.owner_id = instance.event.owner_id
+    else:
+        instance.owner_id = Event.objects.filter(pk=instance.event_id).values_list("owner_id", flat=True).first()
+
+
+@receiver(post_save, sender=Scenario, dispatch_uid="events_sync_scenario_path")
+def sync_scenario_path(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_path(instance)
+
+
+@receiver(post_save, sender=Scenario, dispatch_uid="events_touch_on_scenario_save")
+def touch_event_on_scenario_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_events([instance.event_id])
+
+
+@receiver(post_delete, sender=Scenario, dispatch_uid="events_touch_on_scenario_delete")
+def touch_event_on_scenario_delete(sender, instance, origin=None, **kwargs):
+    # Cascade of an event delete: the event is gone, its own signal uncached it
+    if isinstance(origin, Event):
+        return
+    touch_events([instance.event_id])
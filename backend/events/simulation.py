@@ -0,0 +1,158 @@
+"""
+Outcome-distribution analysis for events.
+
+Builds on the compiled ``ScenarioTree`` from ``events.engine``: its CSR
+arrays are lifted into NumPy so a whole batch of plays walks the tree one
+level at a time, and the same structure gives the exact (analytic)
+probabilities in a single pass from the root.
+
+Plays run in batches of ``BATCH_SIZE`` so a request's memory stays bounded
+whatever ``runs`` is; the API additionally caps ``runs`` at ``MAX_RUNS``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .engine import ScenarioTree
+
+
+MAX_RUNS = 1_000_000
+# Plays walked together; peak memory is a few arrays of this length
+BATCH_SIZE = 16_384
+
+@dataclass
+class OutcomeDistribution:
+    runs: int
+    chance: int
+    trigger_rate: float
+    exact_trigger_rate: float
+    expected_depth: float
+    exact_expected_depth: float
+    # Scenario id -> probability per play (trigger roll included)
+    sampled: dict[int, float]
+    exact: dict[int, float]
+    # Triggered plays that ended without any scenario (no roots configured)
+    empty_rate: float
+    exact_empty_rate: float
+
+
+def _arrays(tree: ScenarioTree) -> dict[str, np.ndarray]:
+    return {
+        "is_terminal": np.asarray(tree.is_terminal + [False], dtype=bool),
+        "child_start": np.asarray(tree.child_start, dtype=np.int64),
+        "child_count": np.asarray(tree.child_count, dtype=np.int64),
+        "child_node": np.asarray(tree.child_node, dtype=np.int64),
+        "alias_prob": np.asarray(tree.alias_prob, dtype=np.float64),
+        "alias_slot": np.asarray(tree.alias_slot, dtype=np.int64),
+    }
+
+
+def exact_distribution(tree: ScenarioTree) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return ``(end, depth)``: the probability of a triggered play ending on
+    each node (the virtual root included, meaning "no scenario") and each
+    node's depth. Only nodes reachable from the root are visited, so a
+    malformed tree cannot loop.
+    """
+    n = tree.size
+    reach = np.zeros(n + 1, dtype=np.float64)
+    end = np.zeros(n + 1, dtype=np.float64)
+    depth = np.zeros(n + 1, dtype=np.int64)
+    reach[tree.root] = 1.0
+
+    frontier = [tree.root]
+    while frontier:
+        nxt = []
+        for node in frontier:
+            count = tree.child_count[node]
+            stop = node != tree.root and tree.is_terminal[node]
+            if stop or not count:
+                end[node] += reach[node]
+                continue
+            start = tree.child_start[node]
+            weights = tree.child_weight[start:start + count]
+            total = sum(weights)
+            for offset, w in enumerate(weights):
+                child = tree.child_node[start + offset]
+                p = w / total if total > 0 else 1.0 / count
+                reach[child] += reach[node] * p
+                depth[child] = depth[node] + 1
+                nxt.append(child)
+        frontier = nxt
+
+    return end, depth
+
+
+def _play_batch(tree: ScenarioTree, arr: dict[str, np.ndarray], chance: int, runs: int,
+                rng: np.random.Generator) -> tuple[np.ndarray, int, int]:
+    """``(end node counts, triggered plays, summed steps)`` for ``runs`` plays."""
+    root = tree.root
+    triggered = rng.random(runs) * 100 < chance
+    n_triggered = int(triggered.sum())
+
+    # Only triggered plays walk the tree; the active set is compacted
+    # every level so total work is proportional to the summed path length.
+    node = np.full(n_triggered, root, dtype=np.int64)
+    steps = np.zeros(n_triggered, dtype=np.int64)
+    active = np.arange(n_triggered)
+
+    for _ in range(tree.size + 1):
+        if not active.size:
+            break
+        cur = node[active]
+        count = arr["child_count"][cur]
+        stop = (count == 0) | (arr["is_terminal"][cur] & (cur != root))
+        active = active[~stop]
+        if not active.size:
+            break
+        cur = cur[~stop]
+        count = count[~stop]
+
+        slot = arr["child_start"][cur] + (rng.random(active.size) * count).astype(np.int64)
+        use_alias = rng.random(active.size) >= arr["alias_prob"][slot]
+        slot = np.where(use_alias, arr["alias_slot"][slot], slot)
+
+        node[active] = arr["child_node"][slot]
+        steps[active] += 1
+
+    return np.bincount(node, minlength=tree.size + 1), n_triggered, int(steps.sum())
+
+
+def simulate(tree: ScenarioTree, chance: int, runs: int, seed: int | None = None) -> OutcomeDistribution:
+    """
+    Run ``runs`` plays in vectorized batches and pair the sampled
+    frequencies with the exact ones.
+    """
+    rng = np.random.default_rng(seed)
+    arr = _arrays(tree)
+    root = tree.root
+
+    counts = np.zeros(tree.size + 1, dtype=np.int64)
+    n_triggered = total_steps = 0
+    for start in range(0, runs, BATCH_SIZE):
+        batch_counts, batch_triggered, batch_steps = _play_batch(tree, arr, chance, min(BATCH_SIZE, runs - start), rng)
+        counts += batch_counts
+        n_triggered += batch_triggered
+        total_steps += batch_steps
+
+    end, depth = exact_distribution(tree)
+    rate = chance / 100
+
+    exact_depth = float((end * depth).sum())
+    sampled_depth = total_steps / n_triggered if n_triggered else 0.0
+
+    outcomes = np.flatnonzero((end[:root] > 0) | (counts[:root] > 0))
+    return OutcomeDistribution(
+        runs=runs,
+        chance=chance,
+        trigger_rate=n_triggered / runs,
+        exact_trigger_rate=rate,
+        expected_depth=sampled_depth,
+        exact_expected_depth=exact_depth,
+        sampled={tree.ids[i]: float(counts[i] / runs) for i in outcomes},
+        exact={tree.ids[i]: float(end[i]) * rate for i in outcomes},
+        empty_rate=float(counts[root] / runs),
+        exact_empty_rate=float(end[root]) * rate,
+    )
@@ -1,3 +1,623 @@
-from django.test import TestCase
+import json
+import random
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from characters.models import Character, Meta
+from core.async_views import AsyncReadView
+from core.testing import QueryBudgetMixin, QueryPlanMixin
+from .engine import ScenarioTree, _trees, build_alias_table, play_event
+from .models import Event, Scenario
+from .simulation import BATCH_SIZE, MAX_RUNS, exact_distribution, simulate
+from .tree import TreePathError, ancestors, leaves, rebuild_paths, subtree
+from .views import EventListCreateView, ScenarioDetailView, ScenarioListCreateView
+
+
+class EventListQueryCountTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.character = Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _make_events(self, events, scenarios_per_level):
+        for i in range(events):
+            event = Event.objects.create(
+                title=f"Event {i}",
+                description="",
+                chance_to_trigger=50,
+                character=self.character,
+                owner=self.user,
+            )
+            roots = [
+                Scenario.objects.create(event=event, title=f"R{j}", description="", weight=1)
+                for j in range(scenarios_per_level)
+            ]
+            for root in roots:
+                for j in range(scenarios_per_level):
+                    Scenario.objects.create(
+                        event=event, parent=root, title=f"C{j}", description="", weight=1, is_terminal=True,
+                    )
+
+    def _count_list_queries(self):
+        url = reverse("event-list", kwargs={"character_id": self.character.id})
+        count, response = self.count_queries(self.client.get, url)
+        self.assertEqual(response.status_code, 200)
+        return count, response
+
+    def test_list_query_count_is_constant(self):
+        self._make_events(events=1, scenarios_per_level=1)
+        small, _ = self._count_list_queries()
+
+        self._make_events(events=5, scenarios_per_level=4)
+        large, response = self._count_list_queries()
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.json()), 6)
+
+    def test_list_query_budget(self):
+        self._make_events(events=3, scenarios_per_level=3)
+        url = reverse("event-list", kwargs={"character_id": self.character.id})
+
+        # ETag aggregate, events + owner join, scenarios
+        with self.assertQueryBudget(3):
+            self.client.get(url)
+
+    def test_children_are_assembled_from_parent_ids(self):
+        self._make_events(events=1, scenarios_per_level=2)
+        _, response = self._count_list_queries()
+
+        scenarios = response.json()[0]["scenarios"]
+        by_id = {s["id"]: s for s in scenarios}
+        for scenario in scenarios:
+            child_ids = [c["id"] for c in scenario["children"]]
+            self.assertEqual(child_ids, sorted(s["id"] for s in scenarios if s["parent"] == scenario["id"]))
+            for child_id in child_ids:
+                self.assertEqual(by_id[child_id]["parent"], scenario["id"])
+
+
+class EventConditionalGetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.character = Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.event = Event.objects.create(
+            title="Event", description="", chance_to_trigger=50, character=self.character, owner=self.user,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("event-list", kwargs={"character_id": self.character.id})
+
+    def test_matching_etag_returns_304_after_one_query(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertQueryBudget(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_scenario_change_invalidates_event_etag(self):
+        detail = reverse("event-detail", kwargs={"character_id": self.character.id, "pk": self.event.id})
+        list_etag = self.client.get(self.url)["ETag"]
+        detail_etag = self.client.get(detail)["ETag"]
+
+        Scenario.objects.create(event=self.event, title="New", description="", weight=1)
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+        self.assertEqual(self.client.get(detail, HTTP_IF_NONE_MATCH=detail_etag).status_code, 200)
+
+
+    @override_settings(RESPONSE_CACHE_ENABLED=True)
+    def test_scenario_change_invalidates_cached_response(self):
+        cache.clear()
+        detail = reverse("event-detail", kwargs={"character_id": self.character.id, "pk": self.event.id})
+        self.client.get(detail)
+        with self.assertQueryBudget(0):
+            self.client.get(detail)
+
+        Scenario.objects.create(event=self.event, title="New", description="", weight=1)
+
+        self.assertEqual([s["title"] for s in self.client.get(detail).json()["scenarios"]], ["New"])
+
+
+class ScenarioTreePathTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.character = Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.event = Event.objects.create(
+            title="Event", description="", chance_to_trigger=50, character=self.character, owner=self.user,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # root -> a -> a1, root -> b (terminal)
+        self.root = self._add("root")
+        self.a = self._add("a", self.root)
+        self.a1 = self._add("a1", self.a)
+        self.b = self._add("b", self.root, is_terminal=True)
+
+    def _add(self, title, parent=None, is_terminal=False):
+        return Scenario.objects.create(
+            event=self.event, parent=parent, title=title, description="", weight=1, is_terminal=is_terminal,
+        )
+
+    def _fresh(self, scenario):
+        return Scenario.objects.get(pk=scenario.pk)
+
+    def test_paths_follow_parents(self):
+        a1 = self._fresh(self.a1)
+        self.assertEqual(a1.path, f"/{self.root.id}/{self.a.id}/{self.a1.id}/")
+        self.assertEqual(a1.depth, 2)
+
+    def test_subtree_ancestors_and_leaves_are_single_queries(self):
+        with self.assertNumQueries(1):
+            self.assertEqual({s.id for s in subtree(self.a)}, {self.a.id, self.a1.id})
+        with self.assertNumQueries(1):
+            self.assertEqual([s.id for s in ancestors(self.a1)], [self.root.id, self.a.id])
+        with self.assertNumQueries(1):
+            self.assertEqual({s.id for s in leaves(self.event.id)}, {self.a1.id, self.b.id})
+
+    def test_moving_a_branch_rewrites_descendants(self):
+        self.a.parent = self.b
+        self.a.save()
+
+        a1 = self._fresh(self.a1)
+        self.assertEqual(a1.path, f"/{self.root.id}/{self.b.id}/{self.a.id}/{self.a1.id}/")
+        self.assertEqual(a1.depth, 3)
+        self.assertEqual({s.id for s in subtree(self._fresh(self.b))}, {self.b.id, self.a.id, self.a1.id})
+
+    def test_rebuild_matches_incremental_paths(self):
+        expected = dict(Scenario.objects.values_list("id", "path"))
+        Scenario.objects.update(path="", depth=0)
+
+        self.assertEqual(rebuild_paths([self.event.id]), 4)
+        self.assertEqual(dict(Scenario.objects.values_list("id", "path")), expected)
+
+    def test_deep_chain_paths_are_stored_whole(self):
+        from .upsert import upsert_tree
+
+        creates = [
+            {"tmp_id": f"n{i}", "parent": f"n{i - 1}" if i else self.a1.id, "title": "n", "description": "", "weight": 1}
+            for i in range(300)
+        ]
+        created = upsert_tree(self.event, creates, [], []).created
+        deepest = self._fresh(Scenario(pk=created["n299"]))
+
+        self.assertGreater(len(deepest.path), 1024)
+        self.assertEqual(len(ancestors(deepest)), 302)
+
+        # Moving the chain rewrites every descendant's long path
+        top = self._fresh(Scenario(pk=created["n0"]))
+        top.parent = self.b
+        top.save()
+        deepest = self._fresh(deepest)
+        self.assertTrue(deepest.path.startswith(f"/{self.root.id}/{self.b.id}/{top.id}/"))
+        self.assertEqual(deepest.depth, 301)
+
+    def test_child_of_pathless_parent_rebuilds_the_tree(self):
+        # Bulk inserts skip post_save, so the parent has no path yet
+        [parent] = Scenario.objects.bulk_create([
+            Scenario(event=self.event, parent=self.b, title="bulk", description="", weight=1),
+        ])
+        child = self._add("child", parent)
+
+        self.assertEqual(child.path, f"/{self.root.id}/{self.b.id}/{parent.id}/{child.id}/")
+        self.assertEqual(self._fresh(parent).path, f"/{self.root.id}/{self.b.id}/{parent.id}/")
+        self.assertEqual(child.depth, 3)
+
+    def test_child_of_parent_cycle_raises(self):
+        Scenario.objects.filter(pk=self.root.id).update(parent=self.a1)
+        Scenario.objects.update(path="", depth=0)
+
+        with self.assertRaises(TreePathError):
+            self._add("child", self._fresh(self.a))
+
+    def test_tree_endpoint_returns_nested_tree(self):
+        url = reverse("event-tree", kwargs={"character_id": self.character.id, "pk": self.event.id})
+        # ETag, event, scenarios
+        with self.assertQueryBudget(3):
+            response = self.client.get(url)
+
+        [root] = response.json()["tree"]
+        self.assertEqual(root["id"], self.root.id)
+        self.assertEqual([c["title"] for c in root["children"]], ["a", "b"])
+        self.assertEqual(root["children"][0]["children"][0]["id"], self.a1.id)
+
+    def test_tree_endpoint_subtree_with_ancestors(self):
+        url = reverse("event-tree", kwargs={"character_id": self.character.id, "pk": self.event.id})
+        body = self.client.get(url, {"root": self.a.id}).json()
+
+        self.assertEqual([a["id"] for a in body["ancestors"]], [self.root.id])
+        [a] = body["tree"]
+        self.assertEqual(a["id"], self.a.id)
+        self.assertEqual([c["id"] for c in a["children"]], [self.a1.id])
+
+
+class ScenarioTreeValidationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.character = Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.event = self._event()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.root = self._add("root")
+        self.child = self._add("child", self.root)
+        self.leaf = self._add("leaf", self.child, is_terminal=True)
+
+    def _event(self):
+        return Event.objects.create(
+            title="Event", description="", chance_to_trigger=50, character=self.character, owner=self.user,
+        )
+
+    def _add(self, title, parent=None, is_terminal=False, event=None):
+        return Scenario.objects.create(
+            event=event or self.event, parent=parent, title=title, description="", weight=1, is_terminal=is_terminal,
+        )
+
+    def _reparent(self, scenario, parent):
+        url = reverse("scenario-detail", kwargs={"pk": scenario.id})
+        return self.client.patch(url, {"parent": parent.id}, format="json")
+
+    def test_rejects_self_parent(self):
+        response = self._reparent(self.child, self.child)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("parent", response.json())
+
+    def test_rejects_descendant_parent(self):
+        response = self._reparent(self.root, self.leaf)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Scenario.objects.get(pk=self.root.id).parent_id, None)
+
+    def test_rejects_parent_from_other_event(self):
+        other = self._add("other", event=self._event())
+        self.assertEqual(self._reparent(self.child, other).status_code, 400)
+
+        url = reverse("event-scenario-list", kwargs={"character_id": self.character.id, "event_id": self.event.id})
+        response = self.client.post(url, {"title": "x", "description": "", "weight": 1, "parent": other.id}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_allows_moving_to_a_sibling_branch(self):
+        sibling = self._add("sibling", self.root)
+        self.assertEqual(self._reparent(self.leaf, sibling).status_code, 200)
+
+    def test_validate_tree_reports_damage(self):
+        url = reverse("event-validate-tree", kwargs={"character_id": self.character.id, "pk": self.event.id})
+        self.assertTrue(self.client.get(url).json()["valid"])
+
+        # Damage the tree behind the serializer's back
+        a, b = self._add("a"), self._add("b")
+        Scenario.objects.filter(pk=a.id).update(parent=b)
+        Scenario.objects.filter(pk=b.id).update(parent=a)
+        orphan = self._add("orphan", self._add("elsewhere", event=self._event()), is_terminal=True)
+        Scenario.objects.filter(pk=orphan.id).update(event=self.event)
+        Scenario.objects.filter(pk=self.leaf.id).update(weight=0, is_terminal=False)
+
+        with self.assertNumQueries(2):
+            body = self.client.get(url).json()
+
+        self.assertFalse(body["valid"])
+        self.assertEqual(body["orphans"], [orphan.id])
+        self.assertEqual(sorted(body["cycles"][0]), [a.id, b.id])
+        self.assertEqual(body["zero_weight"], [{"parent": self.child.id, "scenarios": [self.leaf.id], "all_zero": True}])
+        self.assertEqual(body["non_terminal_leaves"], [self.leaf.id])
+
+
+class ScenarioTreeBulkTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.character = Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.event = Event.objects.create(
+            title="Event", description="", chance_to_trigger=50, character=self.character, owner=self.user,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse(
+            "event-scenario-bulk", kwargs={"character_id": self.character.id, "event_id": self.event.id},
+        )
+
+    def _node(self, tmp_id, children=(), **extra):
+        return {"tmp_id": tmp_id, "title": tmp_id, "weight": 1, "children": list(children), **extra}
+
+    def _tree(self, width):
+        return [self._node(f"r{i}", [self._node(f"r{i}c{j}", is_terminal=True) for j in range(width)]) for i in range(width)]
+
+    def test_nested_tree_is_inserted_level_by_level(self):
+        small = self.count_queries(self.client.post, self.url, {"tree": self._tree(1)}, format="json")[0]
+        count, response = self.count_queries(self.client.post, self.url, {"tree": self._tree(6)}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(count, small)
+        created = response.json()["created"]
+        self.assertEqual(len(created), 6 + 36)
+
+        child = Scenario.objects.get(pk=created["r2c3"])
+        self.assertEqual(child.parent_id, created["r2"])
+        self.assertEqual(child.path, f"/{created['r2']}/{child.id}/")
+        self.assertEqual(child.depth, 1)
+
+    def test_diff_updates_creates_and_deletes(self):
+        created = self.client.post(self.url, {"tree": self._tree(2)}, format="json").json()["created"]
+        before = Event.objects.get(pk=self.event.id).last_modified
+
+        response = self.client.post(self.url, {
+            "create": [{"tmp_id": "new", "parent": created["r0"], "title": "new", "weight": 2}],
+            "update": [{"id": created["r1c0"], "parent": "new", "title": "moved"}],
+            "delete": [created["r1"]],
+        }, format="json")
+
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual(body["deleted"], sorted([created["r1"], created["r1c1"]]))
+        moved = Scenario.objects.get(pk=created["r1c0"])
+        self.assertEqual((moved.parent_id, moved.title, moved.depth), (body["created"]["new"], "moved", 2))
+        self.assertGreater(Event.objects.get(pk=self.event.id).last_modified, before)
+
+        hits = self.client.get(reverse("search"), {"q": "moved"}).json()["results"]
+        self.assertEqual([h["id"] for h in hits], [moved.id])
+
+    def test_replace_deletes_scenarios_left_out(self):
+        created = self.client.post(self.url, {"tree": self._tree(2)}, format="json").json()["created"]
+        tree = [{"id": created["r0"], "title": "kept", "children": [self._node("fresh")]}]
+
+        response = self.client.post(self.url, {"tree": tree, "replace": True}, format="json")
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            set(Scenario.objects.filter(event=self.event).values_list("id", flat=True)),
+            {created["r0"], response.json()["created"]["fresh"]},
+        )
+
+    def test_replace_deleting_many_scenarios_costs_constant_queries(self):
+        def replace_with_nothing(width):
+            self.client.post(self.url, {"tree": self._tree(width)}, format="json")
+            return self.count_queries(self.client.post, self.url, {"tree": [], "replace": True}, format="json")
+
+        small = replace_with_nothing(1)[0]
+        before = Event.objects.get(pk=self.event.id).last_modified
+        count, response = replace_with_nothing(6)
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.json()["deleted"]), 6 + 36)
+        self.assertEqual(count, small)
+        self.assertFalse(Scenario.objects.filter(event=self.event).exists())
+        self.assertGreater(Event.objects.get(pk=self.event.id).last_modified, before)
+        self.assertEqual(self.client.get(reverse("search"), {"q": "r5c5"}).json()["results"], [])
+
+    def test_invalid_change_sets_write_nothing(self):
+        created = self.client.post(self.url, {"tree": self._tree(1)}, format="json").json()["created"]
+        cases = [
+            {"create": [{"tmp_id": "a", "parent": "missing", "title": "a", "weight": 1}]},
+            {"update": [{"id": created["r0"], "parent": created["r0c0"]}]},
+            {"update": [{"id": created["r0c0"], "title": "x"}], "delete": [created["r0"]]},
+            {"create": [{"tmp_id": "a", "title": "a", "weight": 1}, {"tmp_id": "a", "title": "b", "weight": 1}]},
+        ]
+        for payload in cases:
+            with self.subTest(payload=payload):
+                response = self.client.post(self.url, payload, format="json")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("errors", response.json())
+        self.assertEqual(Scenario.objects.filter(event=self.event).count(), 2)
+
+    def test_tree_and_diff_are_exclusive(self):
+        response = self.client.post(self.url, {"tree": [], "delete": []}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class EventEngineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner", password="pass12345")
+        cls.other = User.objects.create_user("other", password="pass12345")
+        cls.character = Character.objects.create(meta=Meta.objects.create(owner=cls.user))
+        cls.event = Event.objects.create(
+            title="E", description="", chance_to_trigger=100, character=cls.character, owner=cls.user,
+        )
+        cls.root = Scenario.objects.create(event=cls.event, title="root", description="", weight=1, is_terminal=True)
+        # Never reached: the walk stops at the terminal root
+        Scenario.objects.create(event=cls.event, parent=cls.root, title="after", description="", weight=1)
+
+    def setUp(self):
+        _trees.clear()
+
+    def _effective(self, prob, alias):
+        """Probability of each slot under the alias table."""
+        n = len(prob)
+        out = [p / n for p in prob]
+        for slot, target in enumerate(alias):
+            out[target] += (1 - prob[slot]) / n
+        return out
+
+    def test_alias_table_matches_weights(self):
+        for weights in ([1], [1, 2, 3, 4], [5, 0, 5], [7, 1, 1, 1, 1, 1]):
+            total = sum(weights)
+            effective = self._effective(*build_alias_table(weights))
+            for got, weight in zip(effective, weights):
+                self.assertAlmostEqual(got, weight / total)
+
+        # All-zero siblings fall back to uniform
+        self.assertEqual(self._effective(*build_alias_table([0, 0])), [0.5, 0.5])
+
+    def test_seeded_picks_follow_weights(self):
+        tree = ScenarioTree.from_rows([(1, None, 1, True), (2, None, 3, True)])
+        rng = random.Random(11)
+        picks = [tree.ids[tree.pick_child(tree.root, rng)] for _ in range(20000)]
+        self.assertAlmostEqual(picks.count(2) / len(picks), 0.75, delta=0.01)
+
+    def test_walk_stops_at_terminal_scenario(self):
+        tree = ScenarioTree.for_event(self.event)
+        rng = random.Random(0)
+        for _ in range(50):
+            self.assertEqual([tree.ids[i] for i in tree.walk(rng)], [self.root.id])
+
+    def test_walk_is_bounded_on_cyclic_arrays(self):
+        # Hand-built arrays: root -> 0 -> 1 -> 0 -> ...
+        tree = ScenarioTree(
+            ids=[10, 20], is_terminal=[False, False],
+            child_start=[0, 1, 2], child_count=[1, 1, 1], child_node=[1, 0, 0],
+            child_weight=[1, 1, 1], alias_prob=[1.0, 1.0, 1.0], alias_slot=[0, 1, 2],
+        )
+        self.assertEqual(tree.walk(random.Random(0)), [0, 1])
+
+    def test_play_event_rolls_trigger_chance(self):
+        self.event.chance_to_trigger = 0
+        result = play_event(self.event, rng=random.Random(1))
+        self.assertFalse(result.triggered)
+        self.assertEqual(result.path, [])
+
+        self.event.chance_to_trigger = 100
+        result = play_event(self.event, rng=random.Random(1))
+        self.assertTrue(result.triggered)
+        self.assertEqual(result.path, [self.root.id])
+
+    def test_compiled_tree_is_reused_until_the_event_changes(self):
+        tree = ScenarioTree.for_event(self.event)
+        with self.assertNumQueries(0):
+            self.assertIs(ScenarioTree.for_event(self.event), tree)
+
+        # Scenario writes touch Event.last_modified
+        Scenario.objects.create(event=self.event, title="new root", description="", weight=1, is_terminal=True)
+        self.event.refresh_from_db()
+        self.assertEqual(ScenarioTree.for_event(self.event).size, tree.size + 1)
+
+    def test_play_endpoint(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse("event-play", kwargs={"character_id": self.character.id, "pk": self.event.id})
+
+        response = client.post(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()["triggered"])
+        self.assertEqual([step["id"] for step in response.json()["steps"]], [self.root.id])
+
+        client.force_authenticate(self.other)
+        self.assertEqual(client.post(url).status_code, 404)
+
+
+class EventSimulationTests(TestCase):
+    # root a (w=3) -> a1 (w=1, terminal) | a2 (w=3); root b (w=1, terminal)
+    ROWS = [(1, None, 3, False), (2, 1, 1, True), (3, 1, 3, False), (4, None, 1, True)]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner", password="pass12345")
+        cls.other = User.objects.create_user("other", password="pass12345")
+        cls.character = Character.objects.create(meta=Meta.objects.create(owner=cls.user))
+        cls.event = Event.objects.create(
+            title="E", description="", chance_to_trigger=40, character=cls.character, owner=cls.user,
+        )
+        root = Scenario.objects.create(event=cls.event, title="a", description="", weight=3)
+        Scenario.objects.create(event=cls.event, parent=root, title="a1", description="", weight=1, is_terminal=True)
+        Scenario.objects.create(event=cls.event, title="b", description="", weight=1, is_terminal=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("event-simulate", kwargs={"character_id": self.character.id, "pk": self.event.id})
+
+    def test_exact_distribution(self):
+        tree = ScenarioTree.from_rows(self.ROWS)
+        end, depth = exact_distribution(tree)
+        by_id = dict(zip(tree.ids, end))
+
+        self.assertAlmostEqual(by_id[2], 0.75 * 0.25)
+        self.assertAlmostEqual(by_id[3], 0.75 * 0.75)
+        self.assertAlmostEqual(by_id[4], 0.25)
+        self.assertAlmostEqual(end.sum(), 1.0)
+        self.assertEqual(list(depth[:4]), [1, 2, 2, 1])
+
+    def test_sampled_distribution_converges_to_exact(self):
+        tree = ScenarioTree.from_rows(self.ROWS)
+        # Several batches, the last one partial
+        runs = 3 * BATCH_SIZE + 123
+        dist = simulate(tree, chance=60, runs=runs, seed=7)
+
+        self.assertEqual(dist.runs, runs)
+        self.assertAlmostEqual(dist.trigger_rate, 0.6, delta=0.01)
+        for pk, p in dist.exact.items():
+            self.assertAlmostEqual(dist.sampled[pk], p, delta=0.01)
+        self.assertAlmostEqual(dist.expected_depth, dist.exact_expected_depth, delta=0.02)
+        self.assertAlmostEqual(sum(dist.sampled.values()) + dist.empty_rate, dist.trigger_rate)
+
+        self.assertEqual(simulate(tree, chance=60, runs=1000, seed=7), simulate(tree, chance=60, runs=1000, seed=7))
+
+    def test_endpoint_is_seeded_and_validates_runs(self):
+        first = self.client.get(self.url, {"runs": 5000, "seed": 3})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json(), self.client.get(self.url, {"runs": 5000, "seed": 3}).json())
+        self.assertEqual(first.json()["runs"], 5000)
+
+        self.assertEqual(self.client.get(self.url, {"runs": MAX_RUNS, "seed": 3}).json()["runs"], MAX_RUNS)
+        for runs in (0, MAX_RUNS + 1, "many"):
+            self.assertEqual(self.client.get(self.url, {"runs": runs}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"seed": -1}).status_code, 400)
+
+    def test_endpoint_requires_owner(self):
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+        self.client.force_authenticate(None)
+        self.assertIn(self.client.get(self.url).status_code, (401, 403))
+
+
+class EventQueryPlanTests(QueryPlanMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("owner", password="pass12345")
+        cls.character = Character.objects.create(meta=Meta.objects.create(owner=cls.user))
+        cls.event = Event.objects.create(
+            title="E", description="", chance_to_trigger=50, character=cls.character, owner=cls.user,
+        )
+        cls.root = Scenario.objects.create(event=cls.event, title="Root", description="", weight=1)
+
+    def _queryset(self, view_class, **kwargs):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        return view_class(request=request, kwargs=kwargs).get_queryset()
+
+    def test_scenario_owner_is_copied_from_event(self):
+        self.assertEqual(self.root.owner_id, self.user.id)
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        url = reverse("event-scenario-bulk", kwargs={"character_id": self.character.id, "event_id": self.event.id})
+        response = client.post(url, {"create": [{"tmp_id": "a", "title": "New", "weight": 1}]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Scenario.objects.get(pk=response.json()["created"]["a"]).owner_id, self.user.id)
+
+    def test_ownership_lookups_use_indexes(self):
+        kwargs = {"character_id": self.character.id}
+        self.assertNoFullScan(self._queryset(EventListCreateView, **kwargs))
+        self.assertNoFullScan(self._queryset(ScenarioListCreateView, event_id=self.event.id, **kwargs))
+        self.assertNoFullScan(self._queryset(ScenarioDetailView).filter(pk=self.root.pk))
+        # World export
+        self.assertNoFullScan(
+            Scenario.objects.filter(owner=self.user, event__character__owner=self.user).order_by("event_id", "id")
+        )
+
+
+class AsyncEventReadTests(TestCase):
+    def test_async_list_serializes_prefetched_tree(self):
+        user = User.objects.create_user("owner", password="pass12345")
+        character = Character.objects.create(meta=Meta.objects.create(owner=user))
+        event = Event.objects.create(
+            title="Event", description="", chance_to_trigger=50, character=character, owner=user,
+        )
+        root = Scenario.objects.create(event=event, title="root", description="", weight=1)
+        Scenario.objects.create(event=event, parent=root, title="leaf", description="", weight=1, is_terminal=True)
+
+        token = str(RefreshToken.for_user(user).access_token)
+        url = reverse("event-list", kwargs={"character_id": character.id})
+        client = APIClient()
+        client.cookies["access_token"] = token
+        request = AsyncRequestFactory().get(url)
+        request.COOKIES["access_token"] = token
+
+        view = AsyncReadView.as_view(drf_view=EventListCreateView)
+        response = async_to_sync(view)(request, character_id=character.id)
+
+        self.assertEqual(json.loads(response.content), client.get(url).json())
@@ -0,0 +1,255 @@
+"""
+Materialized paths for scenario trees.
+
+Every scenario stores `path`, the ids from its root down to itself
+(`/3/17/42/`), and its `depth` (roots are 0). The usual tree questions
+then become single indexed queries instead of per-level walks:
+
+- subtree:   `path LIKE '/3/17/%'`
+- ancestors: the ids are already in the path
+- leaves:    subtree rows that are terminal or have no children
+
+`sync_path` keeps a saved scenario (and, when it moves, its descendants)
+current from `post_save`. Bulk writers skip signals and call
+`rebuild_paths` for the events they touched instead.
+
+`path` is a text column, so no tree is too deep for it. Subtree lookups
+are indexed on PostgreSQL only (`text_pattern_ops`, migration 0006).
+SQLite's case-insensitive `LIKE` can't use a plain index, and MySQL can't
+key a TEXT column whole.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.db.models import CharField, Exists, F, OuterRef, Q, QuerySet, Subquery, TextField, Value
+from django.db.models.functions import Cast, Concat, Substr
+
+from .models import Scenario
+
+
+SEPARATOR = "/"
+# Events per rebuild pass, keeps `event_id IN (...)` under SQLite's variable limit
+REBUILD_CHUNK = 500
+CHECK_FIELDS = ("id", "parent_id", "weight", "is_terminal")
+NODE_FIELDS = ["id", "parent_id", "title", "description", "weight", "is_terminal", "depth"]
+
+
+class TreePathError(ValueError):
+    pass
+
+
+def path_ids(path: str) -> list[int]:
+    return [int(part) for part in path.split(SEPARATOR) if part]
+
+
+def child_path(parent_path: str, pk: int) -> str:
+    return f"{parent_path or SEPARATOR}{pk}{SEPARATOR}"
+
+
+def _parent_position(scenario: Scenario) -> tuple[str, int] | None:
+    """
+    `(path, depth)` of the scenario's parent, or the virtual root's. None
+    if the parent has no path yet (bulk-inserted, fixture or cycle rows).
+    """
+    if scenario.parent_id is None:
+        return SEPARATOR, -1
+    if Scenario.parent.is_cached(scenario) and scenario.parent.path:
+        return scenario.parent.path, scenario.parent.depth
+    row = Scenario.objects.filter(pk=scenario.parent_id).values_list("path", "depth").first()
+    return row if row and row[0] else None
+
+
+def sync_path(scenario: Scenario) -> None:
+    """
+    Bring `scenario.path`/`depth` up to date after it was saved. A parent
+    without a path gets its event's tree rebuilt from `parent_id`; raises
+    `TreePathError` if the scenario still has none (a parent cycle).
+    """
+    position = _parent_position(scenario)
+    if position is None:
+        rebuild_paths([scenario.event_id])
+        scenario.path, scenario.depth = Scenario.objects.values_list("path", "depth").get(pk=scenario.pk)
+        if not scenario.path:
+            raise TreePathError(f"Scenario {scenario.pk} has no path to a root; its parents form a cycle.")
+        return
+
+    parent_path, parent_depth = position
+    path = child_path(parent_path, scenario.pk)
+    depth = parent_depth + 1
+    if path == scenario.path and depth == scenario.depth:
+        return
+
+    old_path, old_depth = scenario.path, scenario.depth
+    Scenario.objects.filter(pk=scenario.pk).update(path=path, depth=depth)
+    if old_path:
+        # Moved: swap the prefix of every descendant in one UPDATE
+        Scenario.objects.filter(path__startswith=old_path).exclude(pk=scenario.pk).update(
+            path=Concat(Value(path), Substr("path", len(old_path) + 1), output_field=TextField()),
+            depth=F("depth") + (depth - old_depth),
+        )
+    scenario.path, scenario.depth = path, depth
+
+
+def rebuild_paths(event_ids=None) -> int:
+    """
+    Recompute paths from `parent_id` for the given events (all when None),
+    one UPDATE per tree level. Rows caught in a parent cycle are left with
+    an empty path. Returns the number of rows that got a path.
+    """
+    if event_ids is None:
+        return _rebuild(Scenario.objects.all())
+    event_ids = list(event_ids)
+    return sum(
+        _rebuild(Scenario.objects.filter(event_id__in=event_ids[i:i + REBUILD_CHUNK]))
+        for i in range(0, len(event_ids), REBUILD_CHUNK)
+    )
+
+
+def _rebuild(rows) -> int:
+    rows.update(path="", depth=0)
+    total = rows.filter(parent__isnull=True).update(
+        path=Concat(Value(SEPARATOR), Cast("id", CharField()), Value(SEPARATOR), output_field=TextField()),
+    )
+    parent_path = Subquery(Scenario.objects.filter(pk=OuterRef("parent_id")).values("path")[:1])
+    depth = 0
+    while True:
+        depth += 1
+        updated = (
+            rows.filter(path="", parent__isnull=False)
+            .exclude(parent__path="")
+            .update(
+                path=Concat(parent_path, Cast("id", CharField()), Value(SEPARATOR), output_field=TextField()),
+                depth=depth,
+            )
+        )
+        if not updated:
+            return total
+        total += updated
+
+
+def subtree(scenario: Scenario, include_self: bool = True) -> QuerySet:
+    rows = Scenario.objects.filter(event_id=scenario.event_id, path__startswith=scenario.path)
+    return rows if include_self else rows.exclude(pk=scenario.pk)
+
+
+def ancestors(scenario: Scenario) -> QuerySet:
+    """Root first, the scenario itself excluded."""
+    return Scenario.objects.filter(pk__in=path_ids(scenario.path)[:-1]).order_by("depth")
+
+
+def leaves(event_id: int, root: Scenario | None = None) -> QuerySet:
+    """Scenarios where a play ends: terminal, or without children."""
+    rows = subtree(root) if root is not None else Scenario.objects.filter(event_id=event_id)
+    has_children = Exists(Scenario.objects.filter(parent_id=OuterRef("pk")))
+    return rows.filter(Q(is_terminal=True) | ~has_children)
+
+
+def nest(rows) -> list[dict]:
+    """
+    Turn flat node dicts (`NODE_FIELDS`, parents before children) into
+    nested `children` lists. Nodes whose parent isn't in `rows` are roots.
+    """
+    nodes = {}
+    roots = []
+    for row in rows:
+        node = {**row, "children": []}
+        parent_id = node.pop("parent_id")
+        nodes[node["id"]] = node
+        parent = nodes.get(parent_id)
+        (parent["children"] if parent is not None else roots).append(node)
+    return roots
+
+
+# ---------- validation ----------
+
+
+def _ancestor_ids(parent: Scenario) -> list[int]:
+    """Ids from the root down to `parent`, from its path when materialized."""
+    if parent.path:
+        return path_ids(parent.path)
+    # Path not materialized yet (e.g. raw fixture rows): walk parent_id
+    chain, seen, pk = [], set(), parent.pk
+    while pk is not None and pk not in seen:
+        seen.add(pk)
+        chain.append(pk)
+        pk = Scenario.objects.filter(pk=pk).values_list("parent_id", flat=True).first()
+    return chain[::-1]
+
+
+def parent_error(pk: int | None, event_id: int | None, parent: Scenario | None) -> str | None:
+    """
+    Why `parent` can't be the parent of scenario `pk` in `event_id`, or
+    None if it can. O(depth): the ancestor ids come from the parent's path.
+    """
+    if parent is None:
+        return None
+    if pk is not None and parent.pk == pk:
+        return "A scenario cannot be its own parent."
+    if event_id is not None and parent.event_id != event_id:
+        return "Parent must belong to the same event."
+    if pk is not None and pk in _ancestor_ids(parent):
+        return "Parent cannot be a descendant of this scenario."
+    return None
+
+
+@dataclass
+class TreeReport:
+    scenarios: int = 0
+    # Scenarios whose parent is not in the event
+    orphans: list[int] = field(default_factory=list)
+    # Each cycle as its member ids, in parent order
+    cycles: list[list[int]] = field(default_factory=list)
+    # Sibling groups (by parent, None = roots) with zero-weight members
+    zero_weight: list[dict] = field(default_factory=list)
+    # Childless scenarios not marked terminal
+    non_terminal_leaves: list[int] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return not (self.orphans or self.cycles or self.zero_weight)
+
+
+def check_tree(rows) -> TreeReport:
+    """
+    One linear pass over `(id, parent_id, weight, is_terminal)` rows of a
+    single event. Works from `parent_id` alone, so it also catches damage
+    the materialized paths can't represent.
+    """
+    rows = list(rows)
+    parent_of = {pk: parent_id for pk, parent_id, _, _ in rows}
+    report = TreeReport(scenarios=len(rows))
+
+    siblings = defaultdict(list)
+    for pk, parent_id, weight, is_terminal in rows:
+        if parent_id is not None and parent_id not in parent_of:
+            report.orphans.append(pk)
+        siblings[parent_id].append((pk, weight))
+
+    for parent_id, group in siblings.items():
+        zero = [pk for pk, weight in group if weight <= 0]
+        if zero:
+            report.zero_weight.append({
+                "parent": parent_id,
+                "scenarios": zero,
+                "all_zero": len(zero) == len(group),
+            })
+
+    for pk, _, _, is_terminal in rows:
+        if not is_terminal and pk not in siblings:
+            report.non_terminal_leaves.append(pk)
+
+    # Parent pointers form a functional graph: walk each chain once,
+    # a node met again on the current walk closes a cycle.
+    state = {}  # pk -> walk number that visited it
+    for walk, start in enumerate(parent_of):
+        pk, chain = start, []
+        while pk in parent_of and pk not in state:
+            state[pk] = walk
+            chain.append(pk)
+            pk = parent_of[pk]
+        if state.get(pk) == walk:
+            report.cycles.append(chain[chain.index(pk):])
+
+    return report
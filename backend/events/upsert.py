@@ -0,0 +1,217 @@
+"""
+Bulk create / update / delete for one event's scenario tree.
+
+Parents are referenced either by the id of an existing scenario (int) or by
+the `tmp_id` of a scenario created in the same request (str). The whole
+change set is checked against the event's current tree before anything is
+written. Then, in one transaction:
+
+1. new scenarios are inserted level by level with `bulk_create`, each level
+   resolving its `tmp_id` parents from the ids of the previous one;
+2. existing scenarios are written with one `bulk_update`;
+3. deletions run last, so they cascade over the final tree.
+
+Bulk writes skip `post_save`, so paths, search documents and the event's
+`last_modified` are refreshed here explicitly.
+"""
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from core.bulk import bulk_insert
+from search.backends import SearchDocument
+from search.indexing import batched_removals, index_documents
+from .models import Event, Scenario
+from .signals import batched_touches, touch_events
+from .tree import check_tree, rebuild_paths
+
+
+WRITABLE_FIELDS = ["title", "description", "weight", "is_terminal"]
+
+
+class TreeUpsertError(ValueError):
+    def __init__(self, errors: list[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+@dataclass
+class UpsertResult:
+    # tmp_id -> new scenario id
+    created: dict[str, int] = field(default_factory=dict)
+    updated: list[int] = field(default_factory=list)
+    # Requested deletions plus everything they cascaded over
+    deleted: list[int] = field(default_factory=list)
+
+
+def _plan(existing: dict[int, int | None], creates, updates, deletes) -> tuple[list[list[dict]], set[int]]:
+    """
+    Validate the change set. Returns the creates grouped by tree level and
+    the set of existing ids that will be deleted.
+    """
+    errors = []
+    tmp_ids = Counter(c["tmp_id"] for c in creates)
+    duplicates = sorted(t for t, n in tmp_ids.items() if n > 1)
+    if duplicates:
+        errors.append(f"Duplicate tmp_id: {', '.join(duplicates)}.")
+    known_tmp = set(tmp_ids)
+
+    for pk in [u["id"] for u in updates] + list(deletes):
+        if pk not in existing:
+            errors.append(f"Scenario {pk} does not belong to this event.")
+
+    def check_ref(ref, owner):
+        if isinstance(ref, str) and ref not in known_tmp:
+            errors.append(f"{owner}: unknown parent tmp_id {ref!r}.")
+        elif isinstance(ref, int) and ref not in existing:
+            errors.append(f"{owner}: parent {ref} does not belong to this event.")
+
+    for c in creates:
+        check_ref(c.get("parent"), f"tmp_id {c['tmp_id']!r}")
+    for u in updates:
+        if "parent" in u:
+            check_ref(u["parent"], f"Scenario {u['id']}")
+    if errors:
+        raise TreeUpsertError(errors)
+
+    # The tree as it will be after the change set
+    final = dict(existing)
+    for u in updates:
+        if "parent" in u:
+            final[u["id"]] = u["parent"]
+    for c in creates:
+        final[c["tmp_id"]] = c.get("parent")
+
+    children = defaultdict(list)
+    for node, parent in final.items():
+        children[parent].append(node)
+    doomed, stack = set(), list(deletes)
+    while stack:
+        node = stack.pop()
+        if node not in doomed:
+            doomed.add(node)
+            stack.extend(children[node])
+
+    for u in updates:
+        if u["id"] in doomed:
+            errors.append(f"Scenario {u['id']} is updated but deleted by the same change set.")
+    for c in creates:
+        if c["tmp_id"] in doomed:
+            errors.append(f"tmp_id {c['tmp_id']!r} would be deleted with its parent.")
+
+    report = check_tree((node, parent, 1, True) for node, parent in final.items() if node not in doomed)
+    for cycle in report.cycles:
+        errors.append(f"Parent cycle: {' -> '.join(map(str, cycle))}.")
+    if errors:
+        raise TreeUpsertError(errors)
+
+    # Cycles are excluded above, so every tmp chain ends at a real parent
+    level_of: dict[str, int] = {}
+
+    def level(tmp_id):
+        chain, node = [], tmp_id
+        while isinstance(node, str) and node not in level_of:
+            chain.append(node)
+            node = final[node]
+        depth = level_of[node] if isinstance(node, str) else -1
+        for t in reversed(chain):
+            depth += 1
+            level_of[t] = depth
+        return level_of[tmp_id]
+
+    levels = defaultdict(list)
+    for c in creates:
+        levels[level(c["tmp_id"])].append(c)
+    return [levels[d] for d in sorted(levels)], {pk for pk in doomed if isinstance(pk, int)}
+
+
+def flatten_tree(nodes: list[dict]) -> tuple[list[dict], list[dict]]:
+    """
+    Nested nodes (`children` lists) -> `(creates, updates)` with parent refs.
+    Nodes with an `id` update that scenario; new nodes without a `tmp_id`
+    get a generated one.
+    """
+    creates, updates = [], []
+    generated = 0
+    stack = [(node, None) for node in reversed(nodes)]
+    while stack:
+        node, parent = stack.pop()
+        attrs = {f: node[f] for f in WRITABLE_FIELDS if f in node}
+        if "id" in node:
+            ref = node["id"]
+            updates.append({"id": ref, "parent": parent, **attrs})
+        else:
+            ref = node.get("tmp_id")
+            if ref is None:
+                ref, generated = f"auto:{generated}", generated + 1
+            creates.append({"tmp_id": ref, "parent": parent, **attrs})
+        stack.extend((child, ref) for child in reversed(node.get("children", [])))
+    return creates, updates
+
+
+def upsert_tree(
+    event: Event,
+    creates: list[dict],
+    updates: list[dict],
+    deletes: list[int],
+    replace: bool = False,
+) -> UpsertResult:
+    """
+    Apply a scenario change set to `event`; raises `TreeUpsertError`. With
+    `replace`, every existing scenario not listed in `updates` is deleted.
+    """
+    result = UpsertResult()
+
+    def parent_id(ref):
+        return result.created[ref] if isinstance(ref, str) else ref
+
+    # One touch for the event, however many scenarios the delete cascades to
+    with transaction.atomic(), batched_touches():
+        existing = dict(Scenario.objects.filter(event=event).values_list("id", "parent_id"))
+        if replace:
+            kept = {u["id"] for u in updates}
+            deletes = [pk for pk in existing if pk not in kept]
+        levels, doomed = _plan(existing, creates, updates, deletes)
+        result.deleted = sorted(doomed)
+
+        written = []
+        for level in levels:
+            created = bulk_insert([
+                Scenario(event=event, owner_id=event.owner_id, parent_id=parent_id(c.get("parent")), **{f: c[f] for f in WRITABLE_FIELDS if f in c})
+                for c in level
+            ])
+            for c, scenario in zip(level, created):
+                result.created[c["tmp_id"]] = scenario.id
+            written.extend(created)
+
+        if updates:
+            objs = Scenario.objects.in_bulk([u["id"] for u in updates])
+            for u in updates:
+                scenario = objs[u["id"]]
+                for f in WRITABLE_FIELDS:
+                    if f in u:
+                        setattr(scenario, f, u[f])
+                if "parent" in u:
+                    scenario.parent_id = parent_id(u["parent"])
+            Scenario.objects.bulk_update(objs.values(), ["parent", *WRITABLE_FIELDS], batch_size=500)
+            result.updated = sorted(objs)
+            written.extend(objs.values())
+
+        if deletes:
+            # Regular delete for the cascade; its per-row post_delete unindex
+            # is collected into one query
+            with batched_removals():
+                Scenario.objects.filter(event=event, pk__in=deletes).delete()
+
+        # Bulk writes skip post_save: paths, search and ETag by hand
+        rebuild_paths([event.id])
+        index_documents(
+            SearchDocument("scenario", s.id, event.owner_id, event.character_id, s.title, s.description)
+            for s in written
+        )
+        touch_events([event.id])
+
+    return result
@@ -1,14 +1,25 @@
 from django.urls import path
+from core.async_views import read_view
 from .views import (
     EventListCreateView,
     EventDetailView,
+    EventPlayView,
+    EventSimulateView,
+    EventTreeView,
+    EventValidateTreeView,
     ScenarioListCreateView,
+    ScenarioTreeBulkView,
     ScenarioDetailView,
 )
 
 urlpatterns = [
-    path("characters/<int:character_id>/", EventListCreateView.as_view(), name="event-list"),
-    path("characters/<int:character_id>/<int:pk>/", EventDetailView.as_view(), name="event-detail"),
+    path("characters/<int:character_id>/", read_view(EventListCreateView), name="event-list"),
+    path("characters/<int:character_id>/<int:pk>/", read_view(EventDetailView), name="event-detail"),
+    path("characters/<int:character_id>/<int:pk>/play/", EventPlayView.as_view(), name="event-play"),
+    path("characters/<int:character_id>/<int:pk>/simulate/", EventSimulateView.as_view(), name="event-simulate"),
+    path("characters/<int:character_id>/<int:pk>/tree/", EventTreeView.as_view(), name="event-tree"),
+    path("characters/<int:character_id>/<int:pk>/validate-tree/", EventValidateTreeView.as_view(), name="event-validate-tree"),
     path("characters/<int:character_id>/<int:event_id>/scenarios/", ScenarioListCreateView.as_view(), name="event-scenario-list"),
+    path("characters/<int:character_id>/<int:event_id>/scenarios/bulk/", ScenarioTreeBulkView.as_view(), name="event-scenario-bulk"),
     path("scenarios/<int:pk>/", ScenarioDetailView.as_view(), name="scenario-detail"),
 ]
\ No newline at end of file
@@ -1,21 +1,51 @@
 from rest_framework import generics, permissions
+from rest_framework.response import Response
+from rest_framework import status
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 
+from core.conditional import ConditionalGetMixin
+from core.pagination import KeysetPagination
+from core.response_cache import CachedResponseMixin
+from .engine import ScenarioTree, play_event
 from .models import Event, Scenario
-from .serializers import EventSerializer, ScenarioSerializer
+from .serializers import (
+    SCENARIOS_PREFETCH, EventSerializer, ScenarioSerializer, PlayResultSerializer,
+    SimulationQuerySerializer, OutcomeDistributionSerializer, TreeQuerySerializer,
+    TreeReportSerializer, ScenarioTreeUpsertSerializer,
+)
+from .simulation import simulate
+from .upsert import TreeUpsertError, upsert_tree
+from .tree import CHECK_FIELDS, NODE_FIELDS, ancestors, check_tree, nest, subtree
 from characters.models import Character
 
 
 # ---------- EVENT VIEWS ----------
 
 
-class EventListCreateView(generics.ListCreateAPIView):
+def event_tree_queryset():
+    """
+    Events with owner joined and all their scenarios loaded in a single
+    extra query; `EventSerializer` builds `children` from that in memory.
+    """
+    return (
+        Event.objects
+        .select_related("owner")
+        .prefetch_related(SCENARIOS_PREFETCH)
+    )
+
+
+class EventListCreateView(CachedResponseMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET  /api/events/characters/<character_id>/
     POST /api/events/characters/<character_id>/
     """
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("id",)
+    etag_timestamp_field = "last_modified"
+    response_cache_namespace = "events"
 
     def get_queryset(self):
         user = self.request.user
@@ -25,7 +55,7 @@ class EventListCreateView(generics.ListCreateAPIView):
             return Event.objects.none()
 
         return (
-            Event.objects
+            event_tree_queryset()
             .filter(owner=user, character_id=character_id)
             .order_by("id")
         )
@@ -46,7 +76,7 @@ class EventListCreateView(generics.ListCreateAPIView):
         )
 
 
-class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EventDetailView(CachedResponseMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET    /api/events/characters/<character_id>/<id>/
     PUT    /api/events/characters/<character_id>/<id>/
@@ -55,6 +85,8 @@ class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    etag_timestamp_field = "last_modified"
+    response_cache_namespace = "events"
 
     def get_queryset(self):
         user = self.request.user
@@ -63,15 +95,169 @@ class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
         if not user.is_authenticated:
             return Event.objects.none()
 
-        return Event.objects.filter(
+        return event_tree_queryset().filter(
             owner=user,
             character_id=character_id,
         )
 
 
+class EventPlayView(generics.GenericAPIView):
+    """
+    POST /api/events/characters/<character_id>/<id>/play/
+
+    Rolls the event server-side and returns the trigger result plus the
+    chosen scenario path, so clients don't need the whole tree to play.
+    """
+    serializer_class = PlayResultSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Event.objects.filter(
+            owner=self.request.user,
+            character_id=self.kwargs.get("character_id"),
+        )
+
+    def post(self, request, *args, **kwargs):
+        event = self.get_object()
+        tree = ScenarioTree.for_event(event)
+        result = play_event(event, tree=tree)
+
+        # Only the scenarios on the chosen path are loaded in full
+        by_id = Scenario.objects.in_bulk(result.path)
+        steps = [by_id[pk] for pk in result.path if pk in by_id]
+
+        serializer = self.get_serializer({
+            "triggered": result.triggered,
+            "roll": result.roll,
+            "chance": result.chance,
+            "reason": result.reason,
+            "steps": steps,
+        })
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class EventSimulateView(generics.GenericAPIView):
+    """
+    GET /api/events/characters/<character_id>/<id>/simulate/?runs=<n>&seed=<s>
+
+    Runs `runs` plays (at most `simulation.MAX_RUNS`) of the event in
+    vectorized batches and returns the sampled outcome distribution next to
+    the exact one.
+    """
+    serializer_class = OutcomeDistributionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Event.objects.filter(
+            owner=self.request.user,
+            character_id=self.kwargs.get("character_id"),
+        )
+
+    def get(self, request, *args, **kwargs):
+        params = SimulationQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        event = self.get_object()
+        tree = ScenarioTree.for_event(event)
+        dist = simulate(
+            tree,
+            chance=event.chance_to_trigger,
+            runs=params.validated_data["runs"],
+            seed=params.validated_data.get("seed"),
+        )
+
+        titles = dict(
+            Scenario.objects.filter(pk__in=dist.exact.keys()).values_list("id", "title")
+        )
+        outcomes = sorted(
+            (
+                {
+                    "scenario": pk,
+                    "title": titles.get(pk, ""),
+                    "exact": dist.exact[pk],
+                    "sampled": dist.sampled[pk],
+                }
+                for pk in dist.exact
+            ),
+            key=lambda o: -o["exact"],
+        )
+
+        serializer = self.get_serializer({**vars(dist), "outcomes": outcomes})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class EventTreeView(CachedResponseMixin, ConditionalGetMixin, generics.RetrieveAPIView):
+    """
+    GET /api/events/characters/<character_id>/<id>/tree/?root=<scenario_id>
+
+    The event's scenarios already nested, or only the subtree under `root`
+    (plus its ancestor chain), read with one query on the materialized paths.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    etag_timestamp_field = "last_modified"
+    response_cache_namespace = "events"
+
+    def get_queryset(self):
+        return Event.objects.filter(
+            owner=self.request.user,
+            character_id=self.kwargs.get("character_id"),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        params = TreeQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        root_id = params.validated_data.get("root")
+
+        event = self.get_object()
+        chain = []
+        if root_id is None:
+            rows = Scenario.objects.filter(event=event)
+        else:
+            root = get_object_or_404(Scenario.objects.only("id", "event_id", "path"), pk=root_id, event=event)
+            rows = subtree(root)
+            chain = list(ancestors(root).values("id", "title", "depth"))
+
+        tree = nest(rows.order_by("depth", "id").values(*NODE_FIELDS))
+        return Response(
+            {"event": event.id, "root": root_id, "ancestors": chain, "tree": tree},
+            status=status.HTTP_200_OK,
+        )
+
+
+class EventValidateTreeView(generics.GenericAPIView):
+    """
+    GET /api/events/characters/<character_id>/<id>/validate-tree/
+
+    Orphans, parent cycles, zero-weight siblings and non-terminal leaves of
+    the event's scenario tree, found in one pass over its rows.
+    """
+    serializer_class = TreeReportSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Event.objects.filter(
+            owner=self.request.user,
+            character_id=self.kwargs.get("character_id"),
+        )
+
+    def get(self, request, *args, **kwargs):
+        event = self.get_object()
+        report = check_tree(Scenario.objects.filter(event=event).order_by("id").values_list(*CHECK_FIELDS))
+        serializer = self.get_serializer({**vars(report), "valid": report.valid})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
 # ---------- SCENARIO VIEWS ----------
 
 
+# `ChildScenarioSerializer` only needs id/title
+CHILDREN_PREFETCH = Prefetch(
+    "children",
+    queryset=Scenario.objects.only("id", "title", "parent_id").order_by("id"),
+    to_attr="child_list",
+)
+
+
 class ScenarioListCreateView(generics.ListCreateAPIView):
     """
     GET  /api/events/characters/<character_id>/<event_id>/scenarios/
@@ -79,6 +265,8 @@ class ScenarioListCreateView(generics.ListCreateAPIView):
     """
     serializer_class = ScenarioSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("id",)
 
     def get_queryset(self):
         user = self.request.user
@@ -89,10 +277,14 @@ class ScenarioListCreateView(generics.ListCreateAPIView):
             return Scenario.objects.none()
 
         return Scenario.objects.filter(
-            event__id=event_id,
+            owner=user,
+            event_id=event_id,
             event__character_id=character_id,
-            event__owner=user,
-        ).order_by("id")
+        ).prefetch_related(CHILDREN_PREFETCH).order_by("id")
+
+    def get_serializer_context(self):
+        # Lets ScenarioSerializer reject parents from other events
+        return {**super().get_serializer_context(), "event_id": self.kwargs.get("event_id")}
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -109,6 +301,38 @@ class ScenarioListCreateView(generics.ListCreateAPIView):
         serializer.save(event=event)
 
 
+class ScenarioTreeBulkView(generics.GenericAPIView):
+    """
+    POST /api/events/characters/<character_id>/<event_id>/scenarios/bulk/
+
+    Creates, updates and deletes many scenarios of one event in a single
+    transaction, from a nested `tree` or a `create` / `update` / `delete`
+    diff. New scenarios reference parents by `tmp_id`; the response maps
+    each `tmp_id` to the id it was given.
+    """
+    serializer_class = ScenarioTreeUpsertSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_url_kwarg = "event_id"
+
+    def get_queryset(self):
+        return Event.objects.filter(
+            owner=self.request.user,
+            character_id=self.kwargs.get("character_id"),
+        )
+
+    def post(self, request, *args, **kwargs):
+        event = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            result = upsert_tree(event, data["create"], data["update"], data["delete"], replace=data["replace"])
+        except TreeUpsertError as exc:
+            return Response({"errors": exc.errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(vars(result), status=status.HTTP_200_OK)
+
+
 class ScenarioDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     GET    /api/events/scenarios/<id>/
@@ -125,4 +349,4 @@ class ScenarioDetailView(generics.RetrieveUpdateDestroyAPIView):
         if not user.is_authenticated:
             return Scenario.objects.none()
 
-        return Scenario.objects.filter(event__owner=user)
\ No newline at end of file
+        return Scenario.objects.filter(owner=user).prefetch_related(CHILDREN_PREFETCH)
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Gunicorn settings, picked up automatically from this directory.
+
+DJANGO_SERVER_MODE selects the worker type:
+
+- wsgi (default): sync workers on core.wsgi
+- asgi: uvicorn workers on core.asgi, with async read views enabled
+  (core.async_views), so one worker multiplexes many slow clients
+
+Worker count and threads come from WEB_CONCURRENCY / GUNICORN_THREADS.
+
+The startup banner is printed once by the master (`when_ready`); workers
+boot with it off and each logs its own warm-up duration instead
+(`post_worker_init`, core/startup.py).
+"""
+import importlib
+import multiprocessing
+import os
+
+server_mode = os.getenv("DJANGO_SERVER_MODE", "wsgi").lower()
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", min(4, multiprocessing.cpu_count() * 2 + 1)))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+
+if server_mode == "asgi":
+    wsgi_app = "core.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+    # Read by core.settings in every worker
+    os.environ.setdefault("DJANGO_ASYNC_VIEWS", "true")
+else:
+    wsgi_app = "core.wsgi:application"
+
+# Inherited by every worker; the master prints the banner itself below
+os.environ.setdefault("DJANGO_STARTUP_BANNER", "off")
+
+
+def when_ready(server):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    from core.startup import print_startup_banner
+
+    print_startup_banner(importlib.import_module(os.environ["DJANGO_SETTINGS_MODULE"]), mode="full")
+
+
+def post_worker_init(worker):
+    # After the app is loaded, before the worker accepts connections
+    from core.startup import warm_up, warmup_enabled, warmup_line
+
+    if not warmup_enabled():
+        return
+    # The internal request only speaks WSGI
+    report = warm_up(worker.wsgi if server_mode == "wsgi" else None)
+    log = worker.log.warning if report.errors else worker.log.info
+    log(warmup_line(importlib.import_module(os.environ["DJANGO_SETTINGS_MODULE"]), report))
+
+
+def worker_exit(server, worker):
+    # Close pooled database connections instead of dropping them
+    from django.db import connections
+
+    for conn in connections.all(initialized_only=True):
+        if conn.alias in getattr(type(conn), "_connection_pools", {}):
+            conn.close_pool()
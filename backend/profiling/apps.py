@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class ProfilingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'profiling'
+
+    def ready(self):
+        from .recorder import is_enabled, install_serializer_timer
+        if is_enabled():
+            install_serializer_timer()
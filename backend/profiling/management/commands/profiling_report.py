@@ -0,0 +1,37 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from profiling.recorder import FIELDS, load_dumps, summarize
+
+
+class Command(BaseCommand):
+    help = "Slow-endpoint report merged from every worker's profiling dump."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default=None, help="Dump directory (default: PROFILING_DUMP_DIR).")
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--json", action="store_true", help="Print raw JSON instead of a table.")
+
+    def handle(self, *args, **options):
+        dump_dir = options["dir"] or getattr(settings, "PROFILING_DUMP_DIR", None)
+        if not dump_dir:
+            raise CommandError("No dump directory: set PROFILING_DUMP_DIR or pass --dir.")
+
+        rows = summarize(load_dumps(dump_dir))[:options["limit"]]
+        if options["json"]:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        if not rows:
+            self.stdout.write("No samples recorded.")
+            return
+
+        header = f"{'url name':<32} {'count':>7}" + "".join(f" {name + ' p50/p95/p99':>28}" for name in FIELDS)
+        self.stdout.write(header)
+        for row in rows:
+            line = f"{row['url_name']:<32} {row['count']:>7}"
+            for name in FIELDS:
+                stats = row[name]
+                line += f" {stats['p50']:>9}/{stats['p95']}/{stats['p99']}".rjust(29)
+            self.stdout.write(line)
@@ -0,0 +1,56 @@
+from contextlib import ExitStack
+import random
+import time
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .recorder import Sample, current_sample, get_recorder, is_enabled
+
+
+class ProfilingMiddleware:
+    """
+    Records wall time, query count, DB time and serializer time for a
+    `PROFILING_SAMPLE_RATE` fraction of requests. With a rate of 0 Django
+    drops the middleware at startup, so it costs nothing.
+    """
+
+    def __init__(self, get_response):
+        if not is_enabled():
+            raise MiddlewareNotUsed
+        from django.conf import settings
+
+        self.get_response = get_response
+        self.rate = settings.PROFILING_SAMPLE_RATE
+        self.recorder = get_recorder()
+
+    def __call__(self, request):
+        if self.rate < 1 and random.random() >= self.rate:
+            return self.get_response(request)
+
+        sample = Sample(url_name="", method=request.method, status=0)
+
+        def db_timer(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                sample.queries += 1
+                sample.db_ms += (time.perf_counter() - start) * 1000
+
+        token = current_sample.set(sample)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(db_timer))
+                response = self.get_response(request)
+        finally:
+            current_sample.reset(token)
+
+        sample.wall_ms = (time.perf_counter() - start) * 1000
+        sample.status = response.status_code
+        match = getattr(request, "resolver_match", None)
+        sample.url_name = (match.view_name if match else None) or "<unresolved>"
+        self.recorder.record(sample)
+        return response
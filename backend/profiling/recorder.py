@@ -0,0 +1,148 @@
+"""
+In-process request profiling.
+
+Samples go into a `deque(maxlen=N)` ring buffer: `append` is atomic under
+the GIL, so recording never takes a lock and old samples fall off the end.
+Each worker can also dump its buffer to `PROFILING_DUMP_DIR/<pid>.json`
+every `PROFILING_DUMP_INTERVAL` seconds so `manage.py profiling_report`
+can merge all workers.
+"""
+from __future__ import annotations
+
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+import json
+import os
+from pathlib import Path
+import time
+
+from django.conf import settings
+
+
+FIELDS = ("wall_ms", "queries", "db_ms", "serializer_ms")
+
+
+@dataclass
+class Sample:
+    url_name: str
+    method: str
+    status: int
+    wall_ms: float = 0.0
+    queries: int = 0
+    db_ms: float = 0.0
+    serializer_ms: float = 0.0
+    at: float = field(default_factory=time.time)
+
+
+# The sample of the request being handled by this thread/task, if sampled
+current_sample: ContextVar[Sample | None] = ContextVar("profiling_sample", default=None)
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "PROFILING_SAMPLE_RATE", 0) > 0
+
+
+class Recorder:
+    def __init__(self, maxsize: int, dump_dir: str | None = None, dump_interval: float = 30.0):
+        self.samples: deque[Sample] = deque(maxlen=maxsize)
+        self.dump_dir = dump_dir
+        self.dump_interval = dump_interval
+        self._next_dump = time.monotonic() + dump_interval
+
+    def record(self, sample: Sample) -> None:
+        self.samples.append(sample)
+        if self.dump_dir and time.monotonic() >= self._next_dump:
+            self._next_dump = time.monotonic() + self.dump_interval
+            self.dump()
+
+    def snapshot(self) -> list[Sample]:
+        return list(self.samples)
+
+    def clear(self) -> None:
+        self.samples.clear()
+
+    def dump(self) -> None:
+        path = Path(self.dump_dir)
+        path.mkdir(parents=True, exist_ok=True)
+        tmp = path / f".{os.getpid()}.json.tmp"
+        tmp.write_text(json.dumps([asdict(s) for s in self.snapshot()]))
+        tmp.replace(path / f"{os.getpid()}.json")
+
+
+_recorder: Recorder | None = None
+
+
+def get_recorder() -> Recorder:
+    global _recorder
+    if _recorder is None:
+        _recorder = Recorder(
+            maxsize=getattr(settings, "PROFILING_BUFFER_SIZE", 10_000),
+            dump_dir=getattr(settings, "PROFILING_DUMP_DIR", None),
+            dump_interval=getattr(settings, "PROFILING_DUMP_INTERVAL", 30.0),
+        )
+    return _recorder
+
+
+def load_dumps(dump_dir: str) -> list[Sample]:
+    samples = []
+    for path in sorted(Path(dump_dir).glob("*.json")):
+        try:
+            samples.extend(Sample(**row) for row in json.loads(path.read_text()))
+        except (OSError, ValueError, TypeError):
+            continue
+    return samples
+
+
+def _percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+    return round(ordered[rank], 3)
+
+
+def summarize(samples: list[Sample]) -> list[dict]:
+    """Per-URL-name p50/p95/p99 for every metric, slowest p95 first."""
+    groups: dict[str, list[Sample]] = {}
+    for sample in samples:
+        groups.setdefault(sample.url_name, []).append(sample)
+
+    rows = []
+    for url_name, group in groups.items():
+        row = {"url_name": url_name, "count": len(group)}
+        for name in FIELDS:
+            ordered = sorted(getattr(s, name) for s in group)
+            row[name] = {f"p{p}": _percentile(ordered, p) for p in (50, 95, 99)}
+        rows.append(row)
+    rows.sort(key=lambda r: r["wall_ms"]["p95"], reverse=True)
+    return rows
+
+
+def install_serializer_timer() -> None:
+    """
+    Wrap `BaseSerializer.data` so time spent building representations is
+    attributed to the current sample. Unsampled requests pay one ContextVar
+    lookup; nested `.data` calls are only counted once.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data
+    if getattr(original, "_profiled", False):
+        return
+
+    depth: ContextVar[int] = ContextVar("profiling_serializer_depth", default=0)
+
+    def timed_data(self):
+        sample = current_sample.get()
+        if sample is None or depth.get():
+            return original.fget(self)
+        token = depth.set(1)
+        start = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            sample.serializer_ms += (time.perf_counter() - start) * 1000
+            depth.reset(token)
+
+    prop = property(timed_data)
+    prop.fget._profiled = True
+    BaseSerializer.data = prop
@@ -0,0 +1,94 @@
+import json
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from characters.models import Character, Meta
+from . import recorder
+from .middleware import ProfilingMiddleware
+from .recorder import Recorder, Sample, install_serializer_timer, summarize
+
+
+PROFILED_MIDDLEWARE = ["profiling.middleware.ProfilingMiddleware"]
+
+
+@override_settings(PROFILING_SAMPLE_RATE=1.0)
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.staff = User.objects.create_user("staff", password="pass12345", is_staff=True)
+        Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.client = APIClient()
+        recorder._recorder = Recorder(maxsize=3)
+        install_serializer_timer()
+
+    def tearDown(self):
+        recorder._recorder = None
+
+    def _profiled_get(self, user, url):
+        self.client.force_authenticate(user)
+        with self.modify_settings(MIDDLEWARE={"prepend": PROFILED_MIDDLEWARE}):
+            return self.client.get(url)
+
+    def test_records_queries_db_and_serializer_time(self):
+        self._profiled_get(self.user, reverse("character-list-create"))
+
+        [sample] = recorder.get_recorder().snapshot()
+        self.assertEqual(sample.url_name, "character-list-create")
+        self.assertEqual(sample.status, 200)
+        self.assertGreater(sample.queries, 0)
+        self.assertGreater(sample.db_ms, 0)
+        self.assertGreater(sample.serializer_ms, 0)
+        self.assertGreaterEqual(sample.wall_ms, sample.db_ms)
+
+    def test_ring_buffer_keeps_latest_samples(self):
+        for _ in range(5):
+            self._profiled_get(self.user, reverse("character-list-create"))
+        self.assertEqual(len(recorder.get_recorder().snapshot()), 3)
+
+    def test_report_is_staff_only(self):
+        self._profiled_get(self.user, reverse("character-list-create"))
+
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(reverse("profiling-report")).status_code, 403)
+
+        self.client.force_authenticate(self.staff)
+        body = self.client.get(reverse("profiling-report")).json()
+        self.assertTrue(body["enabled"])
+        self.assertEqual(body["endpoints"][0]["url_name"], "character-list-create")
+        self.assertIn("p99", body["endpoints"][0]["wall_ms"])
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_disabled_middleware_is_dropped(self):
+        from django.core.exceptions import MiddlewareNotUsed
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(lambda request: None)
+
+
+class ProfilingReportCommandTests(TestCase):
+    def test_merges_worker_dumps(self):
+        with tempfile.TemporaryDirectory() as dump_dir:
+            for pid, wall in ((101, 10), (102, 20)):
+                worker = Recorder(maxsize=10, dump_dir=dump_dir)
+                worker.record(Sample("event-list", "GET", 200, wall_ms=wall))
+                with mock.patch("profiling.recorder.os.getpid", return_value=pid):
+                    worker.dump()
+
+            out = StringIO()
+            call_command("profiling_report", dir=dump_dir, json=True, stdout=out)
+
+        [row] = json.loads(out.getvalue())
+        self.assertEqual(row["count"], 2)
+        self.assertEqual(row["wall_ms"]["p50"], 10)
+        self.assertEqual(row["wall_ms"]["p99"], 20)
+
+    def test_percentiles(self):
+        samples = [Sample("x", "GET", 200, wall_ms=float(ms)) for ms in range(1, 101)]
+        [row] = summarize(samples)
+        self.assertEqual(row["wall_ms"], {"p50": 50.0, "p95": 95.0, "p99": 99.0})
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import ProfilingReportView
+
+urlpatterns = [
+    path("", ProfilingReportView.as_view(), name="profiling-report"),
+]
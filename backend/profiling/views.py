@@ -0,0 +1,26 @@
+import os
+
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .recorder import get_recorder, is_enabled, summarize
+
+
+class ProfilingReportView(APIView):
+    """
+    GET /api/profiling/ -> per-URL p50/p95/p99 for this worker (staff only)
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        samples = get_recorder().snapshot() if is_enabled() else []
+        return Response(
+            {
+                "enabled": is_enabled(),
+                "pid": os.getpid(),
+                "samples": len(samples),
+                "endpoints": summarize(samples),
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,233 @@
+"""
+Vendor-specific access to the `search_index` table.
+
+- SQLite: FTS5 virtual table, ranked with bm25(). Rows are addressed by a
+  rowid derived from (kind, object_id), so upserts/deletes are rowid
+  lookups rather than scans.
+- PostgreSQL: weighted `tsvector` generated column + GIN index, ranked with
+  ts_rank(); headlines are only computed for the returned page.
+- Anything else: no index, `icontains` over the source tables.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+
+
+KINDS = {"story": 1, "event": 2, "scenario": 3}
+KIND_NAMES = {code: name for name, code in KINDS.items()}
+MAX_TOKENS = 16
+SNIPPET_MARK = "**"
+
+
+@dataclass
+class SearchDocument:
+    kind: str
+    object_id: int
+    owner_id: int | None
+    character_id: int | None
+    title: str
+    body: str
+
+
+@dataclass
+class SearchHit:
+    kind: str
+    object_id: int
+    character_id: int | None
+    title: str
+    snippet: str
+    rank: float
+
+
+def tokenize(query: str) -> list[str]:
+    """Word tokens only, so user input can't inject match-syntax operators."""
+    return re.findall(r"\w+", (query or "").lower())[:MAX_TOKENS]
+
+
+class BaseBackend:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def upsert(self, documents: list[SearchDocument]) -> None:
+        pass
+
+    def delete(self, kind: str, object_ids: list[int]) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def search(self, owner_id: int, query: str, kinds: list[str], limit: int, offset: int) -> list[SearchHit]:
+        raise NotImplementedError
+
+
+class SQLiteBackend(BaseBackend):
+    @staticmethod
+    def _rowid(kind: str, object_id: int) -> int:
+        return object_id * 8 + KINDS[kind]
+
+    def upsert(self, documents):
+        if not documents:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                "DELETE FROM search_index WHERE rowid = %s",
+                [(self._rowid(d.kind, d.object_id),) for d in documents],
+            )
+            cursor.executemany(
+                "INSERT INTO search_index (rowid, title, body, kind, object_id, owner_id, character_id) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                [
+                    (self._rowid(d.kind, d.object_id), d.title or "", d.body or "",
+                     KINDS[d.kind], d.object_id, d.owner_id, d.character_id)
+                    for d in documents
+                ],
+            )
+
+    def delete(self, kind, object_ids):
+        if not object_ids:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                "DELETE FROM search_index WHERE rowid = %s",
+                [(self._rowid(kind, pk),) for pk in object_ids],
+            )
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("DELETE FROM search_index")
+
+    def search(self, owner_id, query, kinds, limit, offset):
+        tokens = tokenize(query)
+        if not tokens or not kinds:
+            return []
+        # Every token must match, the last one may be a prefix (search-as-you-type).
+        # Only title/body are indexed columns, the rest are UNINDEXED.
+        match = " ".join(f'"{t}"' for t in tokens[:-1]) + f' "{tokens[-1]}"*'
+        kind_codes = [KINDS[k] for k in kinds]
+
+        sql = (
+            "SELECT kind, object_id, character_id, title, "
+            "snippet(search_index, 1, %s, %s, '…', 16), "
+            "bm25(search_index, 10.0, 1.0) AS rank "
+            "FROM search_index "
+            "WHERE search_index MATCH %s AND owner_id = %s "
+            f"AND kind IN ({', '.join(['%s'] * len(kind_codes))}) "
+            "ORDER BY rank LIMIT %s OFFSET %s"
+        )
+        params = [SNIPPET_MARK, SNIPPET_MARK, match, owner_id, *kind_codes, limit, offset]
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        # bm25() is "lower is better"; flip it so callers always sort descending
+        return [
+            SearchHit(KIND_NAMES[kind], object_id, character_id, title, snippet, -rank)
+            for kind, object_id, character_id, title, snippet, rank in rows
+        ]
+
+
+class PostgresBackend(BaseBackend):
+    def upsert(self, documents):
+        if not documents:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO search_index (kind, object_id, owner_id, character_id, title, body) "
+                "VALUES (%s, %s, %s, %s, %s, %s) "
+                "ON CONFLICT (kind, object_id) DO UPDATE SET "
+                "owner_id = EXCLUDED.owner_id, character_id = EXCLUDED.character_id, "
+                "title = EXCLUDED.title, body = EXCLUDED.body",
+                [
+                    (KINDS[d.kind], d.object_id, d.owner_id, d.character_id, d.title or "", d.body or "")
+                    for d in documents
+                ],
+            )
+
+    def delete(self, kind, object_ids):
+        if not object_ids:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "DELETE FROM search_index WHERE kind = %s AND object_id = ANY(%s)",
+                [KINDS[kind], list(object_ids)],
+            )
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("TRUNCATE search_index")
+
+    def search(self, owner_id, query, kinds, limit, offset):
+        tokens = tokenize(query)
+        if not tokens or not kinds:
+            return []
+        tsquery = " & ".join(tokens[:-1] + [f"{tokens[-1]}:*"])
+        headline_options = f"StartSel={SNIPPET_MARK},StopSel={SNIPPET_MARK},MaxWords=24,MinWords=8,MaxFragments=1"
+
+        sql = (
+            "SELECT page.kind, page.object_id, page.character_id, page.title, "
+            "ts_headline('simple', page.body, page.query, %s), page.rank "
+            "FROM ("
+            "  SELECT s.kind, s.object_id, s.character_id, s.title, s.body, q.query, "
+            "         ts_rank(s.document, q.query) AS rank "
+            "  FROM search_index s, to_tsquery('simple', %s) AS q(query) "
+            "  WHERE s.document @@ q.query AND s.owner_id = %s AND s.kind = ANY(%s) "
+            "  ORDER BY rank DESC LIMIT %s OFFSET %s"
+            ") AS page ORDER BY page.rank DESC"
+        )
+        params = [headline_options, tsquery, owner_id, [KINDS[k] for k in kinds], limit, offset]
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return [
+            SearchHit(KIND_NAMES[kind], object_id, character_id, title, snippet, rank)
+            for kind, object_id, character_id, title, snippet, rank in rows
+        ]
+
+
+class FallbackBackend(BaseBackend):
+    """No index on this backend: substring match over the source tables."""
+
+    def search(self, owner_id, query, kinds, limit, offset):
+        from events.models import Event, Scenario
+        from stories.models import Story
+
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        def matching(fields):
+            q = Q()
+            for token in tokens:
+                q &= Q(*(Q(**{f"{f}__icontains": token}) for f in fields), _connector=Q.OR)
+            return q
+
+        sources = {
+            "story": Story.objects.filter(matching(["title", "description", "markdown"]), owner_id=owner_id)
+                .values_list("id", "character_id", "title", "description"),
+            "event": Event.objects.filter(matching(["title", "description"]), owner_id=owner_id)
+                .values_list("id", "character_id", "title", "description"),
+            "scenario": Scenario.objects.filter(matching(["title", "description"]), owner_id=owner_id)
+                .values_list("id", "event__character_id", "title", "description"),
+        }
+        hits = []
+        for kind in kinds:
+            for pk, character_id, title, description in sources[kind].order_by("-id")[:offset + limit]:
+                hits.append(SearchHit(kind, pk, character_id, title, (description or "")[:160], 0.0))
+        return hits[offset:offset + limit]
+
+
+BACKENDS = {
+    "sqlite": SQLiteBackend,
+    "postgresql": PostgresBackend,
+}
+
+
+def get_backend(using: str | None = None) -> BaseBackend:
+    # The index lives next to the primary's rows. Not resolved through
+    # router.db_for_write: that marks the request as a write (core.replicas).
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    return BACKENDS.get(connection.vendor, FallbackBackend)(connection)
@@ -0,0 +1,131 @@
+"""
+Keeping `search_index` in sync with stories, events and scenarios.
+
+Single saves/deletes are handled by the signal receivers in
+`search.signals`. Code paths that bypass signals (`bulk_create`,
+`QuerySet.update`) call `index_documents` or `reindex` themselves, and
+queryset deletes run inside `batched_removals()`.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator
+
+from events.models import Event, Scenario
+from stories.models import Story
+from .backends import KINDS, SearchDocument, get_backend
+
+
+REINDEX_CHUNK_SIZE = 1000
+
+# kind -> object ids collected by an enclosing `batched_removals()`
+_pending_removals: ContextVar[dict[str, set] | None] = ContextVar("search_pending_removals", default=None)
+
+
+def _join(*parts) -> str:
+    return "\n\n".join(p for p in parts if p)
+
+
+def story_document(story: Story) -> SearchDocument:
+    return SearchDocument(
+        kind="story",
+        object_id=story.pk,
+        owner_id=story.owner_id,
+        character_id=story.character_id,
+        title=story.title,
+        body=_join(story.description, story.markdown),
+    )
+
+
+def event_document(event: Event) -> SearchDocument:
+    return SearchDocument(
+        kind="event",
+        object_id=event.pk,
+        owner_id=event.owner_id,
+        character_id=event.character_id,
+        title=event.title,
+        body=event.description,
+    )
+
+
+def scenario_document(scenario: Scenario) -> SearchDocument:
+    event = scenario.event
+    return SearchDocument(
+        kind="scenario",
+        object_id=scenario.pk,
+        owner_id=event.owner_id,
+        character_id=event.character_id,
+        title=scenario.title,
+        body=scenario.description,
+    )
+
+
+def index_documents(documents: Iterable[SearchDocument]) -> None:
+    get_backend().upsert(list(documents))
+
+
+def remove_documents(kind: str, object_ids: Iterable[int]) -> None:
+    pending = _pending_removals.get()
+    if pending is not None:
+        pending[kind].update(object_ids)
+        return
+    get_backend().delete(kind, list(object_ids))
+
+
+@contextmanager
+def batched_removals():
+    """
+    Collect the `remove_documents` calls made in the block (one per row for
+    `post_delete` on a queryset delete) into one delete per kind at the end.
+    """
+    if _pending_removals.get() is not None:
+        yield
+        return
+    removals = defaultdict(set)
+    token = _pending_removals.set(removals)
+    try:
+        yield
+    finally:
+        _pending_removals.reset(token)
+    for kind, object_ids in removals.items():
+        get_backend().delete(kind, sorted(object_ids))
+
+
+def _rows(kind: str, ids: Iterable[int] | None = None) -> Iterator[SearchDocument]:
+    """Documents for `kind` straight from `.values()` rows (one joined query)."""
+    if kind == "story":
+        qs = Story.objects.values_list("id", "owner_id", "character_id", "title", "description", "markdown")
+        build = lambda r: SearchDocument("story", r[0], r[1], r[2], r[3], _join(r[4], r[5]))
+    elif kind == "event":
+        qs = Event.objects.values_list("id", "owner_id", "character_id", "title", "description")
+        build = lambda r: SearchDocument("event", *r)
+    else:
+        qs = Scenario.objects.values_list("id", "owner_id", "event__character_id", "title", "description")
+        build = lambda r: SearchDocument("scenario", *r)
+
+    if ids is not None:
+        qs = qs.filter(pk__in=list(ids))
+    for row in qs.order_by("id").iterator(chunk_size=REINDEX_CHUNK_SIZE):
+        yield build(row)
+
+
+def reindex(kind: str, ids: Iterable[int] | None = None) -> int:
+    """(Re)index the given objects of `kind`, or all of them. Returns the count."""
+    backend = get_backend()
+    batch: list[SearchDocument] = []
+    total = 0
+    for document in _rows(kind, ids):
+        batch.append(document)
+        if len(batch) >= REINDEX_CHUNK_SIZE:
+            backend.upsert(batch)
+            total += len(batch)
+            batch = []
+    backend.upsert(batch)
+    return total + len(batch)
+
+
+def rebuild() -> dict[str, int]:
+    get_backend().clear()
+    return {kind: reindex(kind) for kind in KINDS}
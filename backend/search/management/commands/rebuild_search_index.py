@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from search.indexing import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for stories, events and scenarios."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counts = rebuild()
+        summary = ", ".join(f"{kind}={count}" for kind, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Search index rebuilt: {summary}"))
@@ -0,0 +1,64 @@
+from django.db import migrations
+
+
+SQLITE_CREATE = """
+CREATE VIRTUAL TABLE search_index USING fts5(
+    title,
+    body,
+    kind UNINDEXED,
+    object_id UNINDEXED,
+    owner_id UNINDEXED,
+    character_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+POSTGRES_CREATE = [
+    """
+    CREATE TABLE search_index (
+        kind smallint NOT NULL,
+        object_id bigint NOT NULL,
+        owner_id integer NULL,
+        character_id bigint NULL,
+        title text NOT NULL DEFAULT '',
+        body text NOT NULL DEFAULT '',
+        document tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', title), 'A') ||
+            setweight(to_tsvector('simple', body), 'B')
+        ) STORED,
+        PRIMARY KEY (kind, object_id)
+    )
+    """,
+    "CREATE INDEX search_index_document_gin ON search_index USING GIN (document)",
+    "CREATE INDEX search_index_owner_idx ON search_index (owner_id)",
+]
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(SQLITE_CREATE)
+    elif vendor == "postgresql":
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+    # Other backends search the source tables directly (search.backends)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ("sqlite", "postgresql"):
+        schema_editor.execute("DROP TABLE IF EXISTS search_index")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('events', '0003_event_event_owner_char_id_idx_and_more'),
+        ('stories', '0003_story_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
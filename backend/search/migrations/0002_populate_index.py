@@ -0,0 +1,58 @@
+from django.db import migrations
+
+
+CHUNK_SIZE = 1000
+
+
+def _documents(apps):
+    from search.backends import SearchDocument
+
+    Story = apps.get_model("stories", "Story")
+    Event = apps.get_model("events", "Event")
+    Scenario = apps.get_model("events", "Scenario")
+
+    rows = Story.objects.values_list("id", "owner_id", "character_id", "title", "description", "markdown")
+    for pk, owner_id, character_id, title, description, markdown in rows.order_by("id").iterator(CHUNK_SIZE):
+        body = "\n\n".join(part for part in (description, markdown) if part)
+        yield SearchDocument("story", pk, owner_id, character_id, title, body)
+
+    rows = Event.objects.values_list("id", "owner_id", "character_id", "title", "description")
+    for row in rows.order_by("id").iterator(CHUNK_SIZE):
+        yield SearchDocument("event", *row)
+
+    rows = Scenario.objects.values_list("id", "event__owner_id", "event__character_id", "title", "description")
+    for row in rows.order_by("id").iterator(CHUNK_SIZE):
+        yield SearchDocument("scenario", *row)
+
+
+def populate_index(apps, schema_editor):
+    # Signals only index rows written after 0001, so index what was there
+    from search.backends import get_backend
+
+    backend = get_backend(schema_editor.connection.alias)
+    batch = []
+    for document in _documents(apps):
+        batch.append(document)
+        if len(batch) >= CHUNK_SIZE:
+            backend.upsert(batch)
+            batch = []
+    backend.upsert(batch)
+
+
+def clear_index(apps, schema_editor):
+    from search.backends import get_backend
+
+    get_backend(schema_editor.connection.alias).clear()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('events', '0006_scenario_path_index_postgresql'),
+        ('stories', '0003_story_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_index, clear_index),
+    ]
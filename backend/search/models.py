@@ -0,0 +1,3 @@
+# The search index is a vendor-specific table (FTS5 virtual table on SQLite,
+# tsvector + GIN on PostgreSQL) created in migrations/0001_initial.py and
+# accessed through search.backends, so there are no ORM models here.
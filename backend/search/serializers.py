@@ -0,0 +1,26 @@
+from rest_framework import serializers
+
+from .backends import KINDS
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200, trim_whitespace=True)
+    kind = serializers.CharField(required=False, help_text="Comma-separated subset of story,event,scenario.")
+    page = serializers.IntegerField(min_value=1, default=1)
+    page_size = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate_kind(self, value):
+        kinds = [k.strip() for k in value.split(",") if k.strip()]
+        unknown = [k for k in kinds if k not in KINDS]
+        if unknown:
+            raise serializers.ValidationError(f"Unknown kind(s): {', '.join(unknown)}.")
+        return kinds
+
+
+class SearchHitSerializer(serializers.Serializer):
+    kind = serializers.CharField(read_only=True)
+    id = serializers.IntegerField(source="object_id", read_only=True)
+    character = serializers.IntegerField(source="character_id", read_only=True, allow_null=True)
+    title = serializers.CharField(read_only=True)
+    snippet = serializers.CharField(read_only=True)
+    rank = serializers.FloatField(read_only=True)
@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from events.models import Event, Scenario
+from stories.models import Story
+from .indexing import (
+    event_document, index_documents, remove_documents, scenario_document, story_document,
+)
+
+
+@receiver(post_save, sender=Story, dispatch_uid="search_index_story")
+def index_story(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_documents([story_document(instance)])
+
+
+@receiver(post_save, sender=Event, dispatch_uid="search_index_event")
+def index_event(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_documents([event_document(instance)])
+
+
+@receiver(post_save, sender=Scenario, dispatch_uid="search_index_scenario")
+def index_scenario(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_documents([scenario_document(instance)])
+
+
+@receiver(post_delete, sender=Story, dispatch_uid="search_unindex_story")
+def unindex_story(sender, instance, **kwargs):
+    remove_documents("story", [instance.pk])
+
+
+@receiver(post_delete, sender=Event, dispatch_uid="search_unindex_event")
+def unindex_event(sender, instance, **kwargs):
+    remove_documents("event", [instance.pk])
+
+
+@receiver(post_delete, sender=Scenario, dispatch_uid="search_unindex_scenario")
+def unindex_scenario(sender, instance, **kwargs):
+    remove_documents("scenario", [instance.pk])
@@ -0,0 +1,83 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from characters.models import Character, Meta
+from events.models import Event, Scenario
+from stories.models import Story
+from .indexing import rebuild
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.character = Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.story = Story.objects.create(
+            character=self.character, owner=self.user, title="Dragon attack",
+            markdown="The village burned while the knights slept.",
+        )
+        self.event = Event.objects.create(
+            title="Harvest festival", description="A dragon may appear.", chance_to_trigger=10,
+            character=self.character, owner=self.user,
+        )
+        self.scenario = Scenario.objects.create(
+            event=self.event, title="Knights arrive", description="Steel glints at dawn.", weight=1,
+        )
+
+    def _search(self, **params):
+        response = self.client.get(reverse("search"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_finds_all_kinds_ranked_title_first(self):
+        results = self._search(q="dragon")["results"]
+
+        self.assertEqual([(r["kind"], r["id"]) for r in results], [("story", self.story.id), ("event", self.event.id)])
+
+    def test_prefix_match_and_kind_filter(self):
+        results = self._search(q="knig", kind="scenario")["results"]
+
+        self.assertEqual([(r["kind"], r["id"]) for r in results], [("scenario", self.scenario.id)])
+        self.assertEqual(results[0]["character"], self.character.id)
+
+    def test_other_owners_are_not_visible(self):
+        other = User.objects.create_user("other", password="pass12345")
+        self.client.force_authenticate(other)
+
+        self.assertEqual(self._search(q="dragon")["results"], [])
+
+    def test_index_follows_updates_deletes_and_patches(self):
+        self.event.title = "Quiet harvest"
+        self.event.description = "Nothing happens."
+        self.event.save()
+        self.assertEqual([r["kind"] for r in self._search(q="dragon")["results"]], ["story"])
+
+        self.story.delete()
+        self.assertEqual(self._search(q="dragon")["results"], [])
+
+        story = Story.objects.create(character=self.character, owner=self.user, title="Log", markdown="")
+        self.client.patch(
+            reverse("story-markdown-patch", kwargs={"pk": story.pk}),
+            {"version": 1, "ops": [{"offset": 0, "insert": "griffin sighted"}]},
+            format="json",
+        )
+        self.assertEqual([r["id"] for r in self._search(q="griffin")["results"]], [story.id])
+
+    def test_pagination_and_rebuild(self):
+        for i in range(3):
+            Story.objects.create(character=self.character, owner=self.user, title=f"Tale {i}", markdown="wyvern")
+        rebuild()
+
+        first = self._search(q="wyvern", page_size=2)
+        second = self._search(q="wyvern", page_size=2, page=2)
+
+        self.assertTrue(first["has_more"])
+        self.assertFalse(second["has_more"])
+        self.assertEqual(len({r["id"] for r in first["results"] + second["results"]}), 3)
+
+    def test_query_syntax_is_not_injected(self):
+        self.assertEqual(self._search(q='("dragon*^ -')["results"][0]["id"], self.story.id)
@@ -0,0 +1,43 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .backends import KINDS, get_backend
+from .serializers import SearchHitSerializer, SearchQuerySerializer
+
+
+class SearchView(APIView):
+    """
+    GET /api/search/?q=<text>&kind=story,event,scenario&page=1&page_size=20
+
+    Ranked full-text search over the current user's stories, events and
+    scenarios.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        data = params.validated_data
+
+        kinds = data.get("kind") or list(KINDS)
+        page, page_size = data["page"], data["page_size"]
+
+        # One extra row tells us whether there is a next page without a COUNT(*)
+        hits = get_backend().search(
+            owner_id=request.user.id,
+            query=data["q"],
+            kinds=kinds,
+            limit=page_size + 1,
+            offset=(page - 1) * page_size,
+        )
+
+        return Response(
+            {
+                "page": page,
+                "page_size": page_size,
+                "has_more": len(hits) > page_size,
+                "results": SearchHitSerializer(hits[:page_size], many=True).data,
+            },
+            status=status.HTTP_200_OK,
+        )
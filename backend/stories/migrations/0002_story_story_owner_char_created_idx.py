@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('characters', '0003_meta_meta_owner_modified_idx'),
+        ('stories', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='story',
+            index=models.Index(fields=['owner', 'character', 'created', 'id'], name='story_owner_char_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stories', '0002_story_story_owner_char_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='story',
+            name='version',
+            field=models.PositiveIntegerField(default=1, help_text='Bumped on every content change; used for optimistic concurrency.'),
+        ),
+    ]
@@ -14,12 +14,17 @@ class Story(models.Model):
     description = models.CharField(max_length=500, blank=True)
 
     markdown = models.TextField(blank=True, null=True)
+    version = models.PositiveIntegerField(default=1, help_text="Bumped on every content change; used for optimistic concurrency.")
 
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["created"]
+        indexes = [
+            # Story list keyset: owner + character filter, cursor on created
+            models.Index(fields=["owner", "character", "created", "id"], name="story_owner_char_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} (character={self.character_id})"
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Offset-based text patches for `Story.markdown`.
+
+A patch is a list of ops `{"offset", "delete", "insert"}` applied in
+order; each offset refers to the text as left by the previous op. Offsets
+and lengths are in UTF-16 code units, as JavaScript indexes strings. Patches
+are tied to `Story.version` and applied with a conditional UPDATE, so a
+concurrent edit makes the write affect zero rows instead of silently
+overwriting it.
+"""
+from __future__ import annotations
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.response_cache import invalidate
+from search.indexing import index_documents, story_document
+from .models import Story
+
+
+MAX_OPS = 1000
+# Offsets are UTF-16 code units, what the browser's string indices count
+ENCODING = "utf-16-le"
+
+
+class PatchError(ValueError):
+    pass
+
+
+class VersionConflict(Exception):
+    def __init__(self, current_version: int):
+        super().__init__(f"Story is at version {current_version}.")
+        self.current_version = current_version
+
+
+def utf16_length(text: str) -> int:
+    return len(text.encode(ENCODING)) // 2
+
+
+def apply_ops(text: str, ops: list[dict]) -> str:
+    """
+    Apply `ops` to `text`. Offsets and lengths count UTF-16 code units,
+    like JavaScript string indices, so a character outside the BMP (most
+    emoji) counts as 2. An op that splits such a character is an error.
+    """
+    # 2 bytes per code unit
+    buf = text.encode(ENCODING)
+    for i, op in enumerate(ops):
+        offset = op["offset"]
+        delete = op.get("delete", 0)
+        insert = op.get("insert", "")
+        length = len(buf) // 2
+        if offset > length or offset + delete > length:
+            raise PatchError(
+                f"Op {i} ({offset=}, {delete=}) is out of range for a text of length {length}."
+            )
+        buf = buf[:offset * 2] + insert.encode(ENCODING) + buf[(offset + delete) * 2:]
+    try:
+        return buf.decode(ENCODING)
+    except UnicodeDecodeError:
+        raise PatchError("Ops split a surrogate pair.") from None
+
+
+def patch_story(story_id: int, owner, version: int, ops: list[dict]) -> Story:
+    """
+    Apply `ops` to the story if it is still at `version`. Returns the story
+    with the new `version`/`updated` (markdown not re-read). Raises
+    `Story.DoesNotExist`, `PatchError` or `VersionConflict`.
+    """
+    with transaction.atomic():
+        story = Story.objects.only(
+            "id", "owner_id", "character_id", "title", "description", "markdown", "version",
+        ).get(pk=story_id, owner=owner)
+        if story.version != version:
+            raise VersionConflict(story.version)
+
+        markdown = apply_ops(story.markdown or "", ops)
+        now = timezone.now()
+        updated = Story.objects.filter(pk=story_id, version=version).update(
+            markdown=markdown,
+            version=version + 1,
+            updated=now,
+        )
+        if not updated:
+            # Someone else won the race between our read and our write
+            current = Story.objects.filter(pk=story_id).values_list("version", flat=True).first()
+            raise VersionConflict(current or version)
+
+        story.markdown = markdown
+        story.version = version + 1
+        story.updated = now
+        # QuerySet.update() sends no post_save, keep the search index and
+        # the response cache in step
+        index_documents([story_document(story)])
+        invalidate("stories", [story.owner_id])
+
+    return story
@@ -0,0 +1,108 @@
+"""
+Server-side markdown rendering for stories.
+
+HTML is cached under `(story.id, story.updated)`, so an edit naturally
+produces a new key and old entries simply age out. Two tiers:
+
+1. an in-process LRU (no serialization, no network hop);
+2. the Django cache framework, shared between workers when `CACHES`
+   points at a shared backend.
+
+The HTML is meant to be injected by clients: raw HTML is escaped, link and
+image URLs are limited to `SAFE_URL_SCHEMES` (plus relative URLs), and
+event-handler attributes (e.g. from `attr_list`) are dropped.
+"""
+from __future__ import annotations
+
+import html
+import re
+import threading
+
+import markdown
+from markdown.treeprocessors import Treeprocessor
+from django.core.cache import cache
+
+from core.lru import LRUCache
+
+
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists"]
+LRU_SIZE = 256
+CACHE_TIMEOUT = 60 * 60 * 24
+# Bumped whenever sanitizing changes, so older cached HTML isn't served
+CACHE_PREFIX = "stories:html:v2"
+SAFE_URL_SCHEMES = frozenset({"http", "https", "mailto"})
+URL_ATTRIBUTES = ("href", "src")
+
+# Browsers ignore ASCII whitespace and control characters inside a scheme
+_IGNORED_IN_URL = re.compile(r"[\x00-\x20\x7f]+")
+_SCHEME = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.\-]*):")
+
+
+_lru = LRUCache(LRU_SIZE)
+_local = threading.local()
+
+
+def is_safe_url(url: str) -> bool:
+    """Relative URLs and `SAFE_URL_SCHEMES`; `javascript:`, `data:` etc. are not."""
+    match = _SCHEME.match(_IGNORED_IN_URL.sub("", html.unescape(url)))
+    return match is None or match.group(1).lower() in SAFE_URL_SCHEMES
+
+
+class SafeURLTreeprocessor(Treeprocessor):
+    """Runs last: strips unsafe URLs and `on*` attributes from the tree."""
+
+    def run(self, root):
+        for element in root.iter():
+            for attr in list(element.attrib):
+                if attr.lower().startswith("on"):
+                    del element.attrib[attr]
+                elif attr in URL_ATTRIBUTES and not is_safe_url(element.attrib[attr]):
+                    del element.attrib[attr]
+
+
+def _renderer() -> markdown.Markdown:
+    """
+    One compiled Markdown instance per thread (instances aren't thread
+    safe). Raw HTML handling is removed so user HTML is escaped, not passed
+    through, and `SafeURLTreeprocessor` cleans the tree after every other
+    processor.
+    """
+    md = getattr(_local, "md", None)
+    if md is None:
+        md = markdown.Markdown(extensions=MARKDOWN_EXTENSIONS, output_format="html")
+        md.preprocessors.deregister("html_block")
+        md.inlinePatterns.deregister("html")
+        md.treeprocessors.register(SafeURLTreeprocessor(md), "safe_urls", 0)
+        _local.md = md
+    return md
+
+
+def render_markdown(text: str | None) -> str:
+    if not text:
+        return ""
+    md = _renderer()
+    try:
+        return md.convert(text)
+    finally:
+        md.reset()
+
+
+def _cache_key(story) -> str:
+    return f"{CACHE_PREFIX}:{story.pk}:{story.updated.timestamp()}"
+
+
+def rendered_html(story) -> str:
+    """Rendered HTML for `story`, rendered at most once per edit."""
+    key = _cache_key(story)
+
+    html = _lru.get(key)
+    if html is not None:
+        return html
+
+    html = cache.get(key)
+    if html is None:
+        html = render_markdown(story.markdown)
+        cache.set(key, html, CACHE_TIMEOUT)
+
+    _lru.set(key, html)
+    return html
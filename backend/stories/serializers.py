@@ -1,10 +1,13 @@
 from rest_framework import serializers
 from .models import Story
+from .patching import MAX_OPS
+from .rendering import rendered_html
 
 
 class StorySerializer(serializers.ModelSerializer):
     character = serializers.PrimaryKeyRelatedField(read_only=True)
     owner = serializers.ReadOnlyField(source="owner.username")
+    rendered_html = serializers.SerializerMethodField()
 
     class Meta:
         model = Story
@@ -15,7 +18,34 @@ class StorySerializer(serializers.ModelSerializer):
             "title",
             "description",
             "markdown",
+            "rendered_html",
+            "version",
             "created",
             "updated",
         ]
-        read_only_fields = ["id", "character", "owner", "created", "updated"]
\ No newline at end of file
+        read_only_fields = ["id", "character", "owner", "version", "created", "updated"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Opt-in: only rendered with ?render=html
+        request = self.context.get("request")
+        if request is None or request.query_params.get("render") != "html":
+            self.fields.pop("rendered_html", None)
+
+    def get_rendered_html(self, obj):
+        return rendered_html(obj)
+
+    def update(self, instance, validated_data):
+        validated_data["version"] = instance.version + 1
+        return super().update(instance, validated_data)
+
+
+class TextOpSerializer(serializers.Serializer):
+    offset = serializers.IntegerField(min_value=0)
+    delete = serializers.IntegerField(min_value=0, default=0)
+    insert = serializers.CharField(allow_blank=True, trim_whitespace=False, default="")
+
+
+class StoryPatchSerializer(serializers.Serializer):
+    version = serializers.IntegerField(min_value=1)
+    ops = TextOpSerializer(many=True, max_length=MAX_OPS)
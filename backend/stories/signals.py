@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.response_cache import invalidate
+from .models import Story
+
+
+@receiver(post_save, sender=Story, dispatch_uid="stories_uncache_on_save")
+@receiver(post_delete, sender=Story, dispatch_uid="stories_uncache_on_delete")
+def uncache_story(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate("stories", [instance.owner_id])
@@ -1,3 +1,188 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from characters.models import Character, Meta
+from core.testing import QueryBudgetMixin
+from .models import Story
+
+
+class StoryQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.character = Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_one_joined_query(self):
+        for i in range(10):
+            Story.objects.create(character=self.character, owner=self.user, title=f"Story {i}")
+
+        url = reverse("character-story-list-create", kwargs={"character_id": self.character.id})
+        # ETag aggregate + one joined list query
+        with self.assertQueryBudget(2):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 10)
+        self.assertEqual(response.json()[0]["owner"], "owner")
+
+
+class StoryRenderingTests(TestCase):
+    def setUp(self):
+        from .rendering import _lru
+        from django.core.cache import cache
+
+        _lru.clear()
+        cache.clear()
+        self.user = User.objects.create_user("owner", password="pass12345")
+        self.character = Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.story = Story.objects.create(
+            character=self.character, owner=self.user, title="Story", markdown="# Title\n\n<script>x</script>",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("story-detail", kwargs={"pk": self.story.pk})
+
+    def test_rendered_html_is_opt_in(self):
+        self.assertNotIn("rendered_html", self.client.get(self.url).json())
+
+        html = self.client.get(self.url, {"render": "html"}).json()["rendered_html"]
+        self.assertIn("<h1>Title</h1>", html)
+        self.assertNotIn("<script>", html)
+
+    def test_rendered_once_per_edit(self):
+        from unittest import mock
+        from . import rendering
+
+        with mock.patch.object(rendering, "render_markdown", wraps=rendering.render_markdown) as render:
+            self.client.get(self.url, {"render": "html"})
+            self.client.get(self.url, {"render": "html"})
+            self.assertEqual(render.call_count, 1)
+
+            self.client.patch(self.url, {"markdown": "*edited*"}, format="json")
+            html = self.client.get(self.url, {"render": "html"}).json()["rendered_html"]
+            self.assertEqual(render.call_count, 2)
+            self.assertIn("<em>edited</em>", html)
+
+    def test_unsafe_link_and_image_urls_are_dropped(self):
+        from .rendering import render_markdown
+
+        for text in [
+            "[x](javascript:alert(1))",
+            "[x](JaVa\tScRiPt:alert(1))",
+            "[x](java&#115;cript:alert(1))",
+            "[x][1]\n\n[1]: vbscript:msgbox(1)",
+            "![i](data:text/html;base64,PHNjcmlwdD4=)",
+            '[x](http://ok.test){: onclick="alert(1)" href="javascript:alert(1)"}',
+        ]:
+            html = render_markdown(text)
+            self.assertNotRegex(html.lower(), r"href|src|onclick", text)
+
+        html = render_markdown("[a](https://ok.test/p) [m](mailto:me@ok.test) [r](/rel?q=1) ![i](pic.png)")
+        for url in ("https://ok.test/p", "mailto:me@ok.test", "/rel?q=1", "pic.png"):
+            self.assertIn(f'="{url}"', html)
+
+
+class StoryMarkdownPatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        character = Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.story = Story.objects.create(character=character, owner=self.user, title="S", markdown="Hello world")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("story-markdown-patch", kwargs={"pk": self.story.pk})
+
+    def test_ops_apply_in_order_and_bump_version(self):
+        ops = [
+            {"offset": 6, "delete": 5, "insert": "there"},
+            {"offset": 11, "insert": "!"},
+        ]
+        response = self.client.patch(self.url, {"version": 1, "ops": ops}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["version"], 2)
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.markdown, "Hello there!")
+
+    def test_offsets_count_utf16_code_units(self):
+        Story.objects.filter(pk=self.story.pk).update(markdown="\U0001F600 Hello world")
+        # JavaScript: "\u{1F600} Hello world".indexOf("world") === 9
+        ops = [{"offset": 9, "delete": 5, "insert": "there \U0001F30D"}]
+
+        response = self.client.patch(self.url, {"version": 1, "ops": ops}, format="json")
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["length"], 17)
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.markdown, "\U0001F600 Hello there \U0001F30D")
+
+    def test_op_splitting_a_surrogate_pair_is_rejected(self):
+        Story.objects.filter(pk=self.story.pk).update(markdown="\U0001F600")
+
+        response = self.client.patch(self.url, {"version": 1, "ops": [{"offset": 1, "insert": "x"}]}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.markdown, "\U0001F600")
+
+    @override_settings(RESPONSE_CACHE_ENABLED=True)
+    def test_patch_invalidates_cached_story(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        detail = reverse("story-detail", kwargs={"pk": self.story.pk})
+        self.client.get(detail)
+
+        self.client.patch(self.url, {"version": 1, "ops": [{"offset": 0, "insert": "> "}]}, format="json")
+
+        self.assertEqual(self.client.get(detail).json()["version"], 2)
+
+    def test_stale_version_is_rejected(self):
+        self.client.patch(self.url, {"version": 1, "ops": [{"offset": 0, "insert": ">"}]}, format="json")
+
+        response = self.client.patch(self.url, {"version": 1, "ops": [{"offset": 0, "insert": "<"}]}, format="json")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["version"], 2)
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.markdown, ">Hello world")
+
+    def test_out_of_range_op_is_rejected(self):
+        response = self.client.patch(self.url, {"version": 1, "ops": [{"offset": 5, "delete": 100}]}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.story.refresh_from_db()
+        self.assertEqual(self.story.version, 1)
+
+    def test_full_update_bumps_version(self):
+        detail = reverse("story-detail", kwargs={"pk": self.story.pk})
+        response = self.client.patch(detail, {"markdown": "Replaced"}, format="json")
+
+        self.assertEqual(response.json()["version"], 2)
+
+
+class StoryConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("owner", password="pass12345")
+        character = Character.objects.create(meta=Meta.objects.create(owner=self.user))
+        self.story = Story.objects.create(character=character, owner=self.user, title="S", markdown="text")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse("story-detail", kwargs={"pk": self.story.pk})
+
+    def test_if_modified_since_and_etag(self):
+        first = self.client.get(self.url)
+        self.assertIn("Last-Modified", first)
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code, 304)
+
+        self.client.patch(self.url, {"title": "Renamed"}, format="json")
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 200)
+
+    def test_etag_depends_on_query_string(self):
+        plain = self.client.get(self.url)["ETag"]
+        rendered = self.client.get(self.url, {"render": "html"})["ETag"]
+        self.assertNotEqual(plain, rendered)
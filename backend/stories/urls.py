@@ -1,7 +1,9 @@
 from django.urls import path
-from .views import StoryListCreateView, StoryDetailView
+from core.async_views import read_view
+from .views import StoryListCreateView, StoryDetailView, StoryMarkdownPatchView
 
 urlpatterns = [
-    path("list/<int:character_id>", StoryListCreateView.as_view(), name="character-story-list-create"),
-    path("<int:pk>/", StoryDetailView.as_view(), name="story-detail"),
+    path("list/<int:character_id>", read_view(StoryListCreateView), name="character-story-list-create"),
+    path("<int:pk>/", read_view(StoryDetailView, sync_params=("render",)), name="story-detail"),
+    path("<int:pk>/markdown/", StoryMarkdownPatchView.as_view(), name="story-markdown-patch"),
 ]
\ No newline at end of file
@@ -1,25 +1,34 @@
 from django.shortcuts import get_object_or_404
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
 
+from core.conditional import ConditionalGetMixin
+from core.pagination import KeysetPagination
+from core.response_cache import CachedResponseMixin
 from .models import Story
-from .serializers import StorySerializer
+from .patching import PatchError, VersionConflict, patch_story, utf16_length
+from .serializers import StorySerializer, StoryPatchSerializer
 from characters.models import Character
 
 
-class StoryListCreateView(generics.ListCreateAPIView):
+class StoryListCreateView(CachedResponseMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     """
     GET  /api/characters/<character_id>/stories/  -> list stories for that character (current user)
     POST /api/characters/<character_id>/stories/  -> create new story for that character
     """
     serializer_class = StorySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("created", "id")
+    etag_timestamp_field = "updated"
+    response_cache_namespace = "stories"
 
     def get_queryset(self):
         character_id = self.kwargs["character_id"]
         return Story.objects.filter(
             character_id=character_id,
             owner=self.request.user,
-        )
+        ).select_related("owner")
 
     def perform_create(self, serializer):
         character_id = self.kwargs["character_id"]
@@ -27,15 +36,52 @@ class StoryListCreateView(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user, character=character)
 
 
-class StoryDetailView(generics.RetrieveUpdateDestroyAPIView):
+class StoryDetailView(CachedResponseMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     GET    /api/stories/<pk>/   -> get one story
     PUT    /api/stories/<pk>/   -> full update
     PATCH  /api/stories/<pk>/   -> partial update
     DELETE /api/stories/<pk>/   -> delete
+
+    Add ?render=html to get `rendered_html`, cached per (id, updated).
     """
     serializer_class = StorySerializer
     permission_classes = [permissions.IsAuthenticated]
+    etag_timestamp_field = "updated"
+    response_cache_namespace = "stories"
 
     def get_queryset(self):
-        return Story.objects.filter(owner=self.request.user)
\ No newline at end of file
+        return Story.objects.filter(owner=self.request.user).select_related("owner")
+
+
+class StoryMarkdownPatchView(generics.GenericAPIView):
+    """
+    PATCH /api/stories/<pk>/markdown/ -> apply text ops to `markdown`
+
+    Body: {"version": <n>, "ops": [{"offset": 0, "delete": 3, "insert": "..."}]}
+    Offsets, `delete` and the returned `length` count UTF-16 code units.
+    409 with the current version if the story changed since <n>.
+    """
+    serializer_class = StoryPatchSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def patch(self, request, pk):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            story = patch_story(pk, request.user, **serializer.validated_data)
+        except Story.DoesNotExist:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        except VersionConflict as exc:
+            return Response(
+                {"detail": "Version conflict.", "version": exc.current_version},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except PatchError as exc:
+            return Response({"ops": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {"id": story.id, "version": story.version, "updated": story.updated, "length": utf16_length(story.markdown)},
+            status=status.HTTP_200_OK,
+        )